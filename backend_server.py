@@ -9,7 +9,7 @@ import logging
 import os
 import sys
 import time
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 from flask import send_from_directory
 
@@ -24,6 +24,11 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from openoperator.agent.result_cache import COALESCED, HIT, CacheOptions, analysis_key, cache_from_env
+from openoperator.telemetry.memory import start_memory_profiling_from_env
+
+start_memory_profiling_from_env()
+
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
@@ -54,6 +59,27 @@ def health_check():
             'error': str(e)
         }), 500
 
+# Prometheus metrics endpoint
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Expose span duration histograms and event counters in the Prometheus text format"""
+    from openoperator.telemetry.service import metrics
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+# Memory diagnostics (only available with OPENOPERATOR_MEMORY_PROFILING set)
+@app.route('/api/debug/memory', methods=['GET'])
+def memory_diagnostics():
+    """Top allocation sites from tracemalloc"""
+    from openoperator.telemetry.memory import memory_snapshot
+    try:
+        limit = int(request.args.get('limit', 20))
+        group_by = request.args.get('group_by', 'lineno')
+        return jsonify(memory_snapshot(limit=limit, group_by=group_by))
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
 # Serve static files from the built frontend
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -76,27 +102,28 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize agent lazily to avoid import errors during build
-agent_app = None
 config = {"configurable": {"temperature": 0.1}, "recursion_limit": 50}
 
 def get_agent():
     """Lazy initialization of the agent"""
-    global agent_app
-    if agent_app is None:
-        try:
-            from openoperator.agent.graph import graph
-            agent_app = graph.compile()
-        except ImportError as e:
-            logger.error(f"Failed to import agent: {e}")
-            raise
-    return agent_app
+    try:
+        from openoperator.agent.runner import get_agent as compile_agent
+        return compile_agent()
+    except ImportError as e:
+        logger.error(f"Failed to import agent: {e}")
+        raise
+
+# Identical (url, query) requests share results for OPENOPERATOR_ANALYSIS_CACHE_TTL seconds and are coalesced while running
+analysis_cache = cache_from_env()
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_website():
     """Analyze a website with the given query"""
+    run_id = None
     try:
         # Get the agent (lazy initialization)
-        agent = get_agent()
+        get_agent()
+        from openoperator.agent.runner import model_config, new_run_id, run_analysis
         
         data = request.get_json()
         
@@ -109,49 +136,119 @@ def analyze_website():
         if not url or not query:
             return jsonify({'error': 'Both URL and query are required'}), 400
         
-        logger.info(f"Analyzing URL: {url} with query: {query}")
+        options = CacheOptions.from_request(data.get('cache'), request.headers.get('Cache-Control', ''))
         
-        # Run the agent asynchronously
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            result = loop.run_until_complete(
-                agent.ainvoke({"url": url, "query": query}, config=config)
-            )
-            
-            final_output = result.get("final_output", "No output available.")
-            
-            # Handle different output formats
-            if isinstance(final_output, dict):
-                response = {
-                    'ops_summary': final_output.get('ops_summary', 'Analysis completed'),
-                    'answer': final_output.get('answer', 'No answer provided'),
-                    'sources': final_output.get('sources', [url]),
-                    'quotes': final_output.get('quotes', [])
-                }
-            else:
-                # Handle string output (error cases)
-                response = {
-                    'ops_summary': 'Analysis completed with basic output',
-                    'answer': str(final_output),
-                    'sources': [url],
-                    'quotes': []
-                }
-            
-            logger.info("Analysis completed successfully")
-            return jsonify(response)
+        def run():
+            # With checkpointing enabled, a failed run can be continued via /api/analyze/resume using this id.
+            # It is only set by the request that runs the agent: requests coalesced with a failed run have
+            # no checkpoint of their own to resume
+            nonlocal run_id
+            run_id = new_run_id()
+            logger.info(f"Analyzing URL: {url} with query: {query}")
             
-        finally:
-            loop.close()
+            # Run the agent asynchronously
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                return loop.run_until_complete(run_analysis(url, query, config, run_id=run_id))
+            finally:
+                loop.close()
+        
+        analysis, status, age = analysis_cache.get_or_run(
+            analysis_key(url, query, model_config(config)),
+            run,
+            options,
+            cacheable=lambda result: result.completed,
+        )
+        
+        response = {**analysis.response, 'cached': status in (HIT, COALESCED), 'cache_age': round(age, 3)}
+        if status == HIT:
+            # The timings are those of the run that produced the cached result, not of this request
+            response.pop('timings', None)
+        logger.info(f"Analysis completed successfully (cache: {status})")
+        http_response = jsonify(response)
+        http_response.headers['X-Cache'] = status
+        return http_response
             
     except Exception as e:
         logger.error(f"Error during analysis: {str(e)}")
-        return jsonify({
+        error = {
             'error': f'Analysis failed: {str(e)}',
         'details': 'Please check if the URL is accessible and try again.',
         'suggestion': 'Try with a simpler URL like https://example.com first'
-        }), 500
+        }
+        if run_id is not None:
+            from openoperator.agent.checkpoint import checkpointing_enabled
+            if checkpointing_enabled():
+                error['run_id'] = run_id
+        return jsonify(error), 500
+
+@app.route('/api/analyze/resume', methods=['POST'])
+def resume_analysis_run():
+    """Continue a checkpointed run from its last completed step"""
+    from openoperator.agent.runner import resume_analysis
+    
+    data = request.get_json(silent=True) or {}
+    run_id = data.get('run_id')
+    if not run_id:
+        return jsonify({'error': 'run_id is required'}), 400
+    
+    logger.info(f"Resuming run {run_id}")
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        analysis = loop.run_until_complete(resume_analysis(run_id, config))
+        return jsonify(analysis.response)
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 400
+    except KeyError:
+        return jsonify({'error': f'Unknown run: {run_id}'}), 404
+    except Exception as e:
+        logger.error(f"Error while resuming run {run_id}: {str(e)}")
+        return jsonify({'error': f'Resume failed: {str(e)}', 'run_id': run_id}), 500
+    finally:
+        loop.close()
+
+@app.route('/api/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Analyze many (url, query) jobs on a shared browser, streaming one JSON line per finished job"""
+    from openoperator.agent.batch import (
+        DEFAULT_CONCURRENCY,
+        DEFAULT_PER_DOMAIN,
+        DEFAULT_RATE,
+        parse_jobs,
+        parse_jsonl,
+        stream_batch,
+    )
+    
+    try:
+        # Either {"jobs": [...], "concurrency": n, "per_domain": n, "rate": r} or a JSONL body with options in the query string
+        data = request.get_json(silent=True)
+        if isinstance(data, dict):
+            jobs = parse_jobs(data.get('jobs') or [])
+            concurrency = int(data.get('concurrency', DEFAULT_CONCURRENCY))
+            per_domain = int(data.get('per_domain', DEFAULT_PER_DOMAIN))
+            rate = float(data.get('rate', DEFAULT_RATE))
+        else:
+            jobs = parse_jsonl(request.get_data(as_text=True).splitlines())
+            concurrency = int(request.args.get('concurrency', DEFAULT_CONCURRENCY))
+            per_domain = int(request.args.get('per_domain', DEFAULT_PER_DOMAIN))
+            rate = float(request.args.get('rate', DEFAULT_RATE))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not jobs:
+        return jsonify({'error': 'No jobs provided'}), 400
+    if concurrency < 1 or per_domain < 1:
+        return jsonify({'error': 'concurrency and per_domain must be at least 1'}), 400
+    
+    logger.info(f"Starting batch of {len(jobs)} jobs (concurrency {concurrency}, per domain {per_domain})")
+    
+    def generate():
+        for record in stream_batch(jobs, concurrency=concurrency, per_domain=per_domain, rate=rate, config=config):
+            yield json.dumps(record) + '\n'
+    
+    return Response(generate(), mimetype='application/x-ndjson')
 
 @app.route('/', methods=['GET'])
 def root():
@@ -162,7 +259,10 @@ def root():
         'description': 'AI-powered web automation and information extraction',
         'endpoints': {
             'analyze': '/api/analyze (POST)',
+            'analyze_batch': '/api/analyze/batch (POST, JSON or JSONL in, JSONL out)',
+            'analyze_resume': '/api/analyze/resume (POST, requires OPENOPERATOR_CHECKPOINT_DB)',
             'health': '/api/health (GET)',
+            'metrics': '/metrics (GET)',
             'frontend': '/ (GET)'
         },
         'status': 'ready'
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of the DOM capture pipeline (buildDomTree.js + DomService), against the CDP DOMSnapshot
+backend (SnapshotDomService) and the accessibility tree backend (AccessibilityDomService).
+
+Synthetic pages are generated in a headless Chromium for every combination of element count, tree
+depth, number of shadow roots and number of iframes. Each stage is timed separately (median over
+--repeat runs):
+
+    js_ms        buildDomTree.js execution inside the page (performance.now)
+    bytes        UTF-8 size of the serialized tree that is transferred to Python
+    evaluate_ms  wall time of page.evaluate: JS + serialization + transfer + deserialization
+    parse_ms     DomService._parse_node
+    map_ms       DomService._create_selector_map
+    string_ms    DOMElementNode.clickable_elements_to_string
+    total_ms     DomService.get_clickable_elements end to end
+    snapshot_ms  SnapshotDomService.get_clickable_elements end to end
+    ax_ms        AccessibilityDomService.get_clickable_elements end to end
+
+The number of highlighted elements is reported for every backend: the JS and snapshot backends should
+agree, the accessibility backend lists the semantically interactive elements only.
+
+    python benchmarks/dom_capture.py
+    python benchmarks/dom_capture.py --nodes 1000 100000 --depth 6 24 --shadow-roots 0 50 --iframes 0 4
+"""
+
+import argparse
+import asyncio
+import html
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+from importlib import resources
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Fills #app with `nodes` elements in a tree of the given depth; the first `shadowRoots` containers
+# below the top level render their children into an open shadow root
+GENERATE_JS = """
+({ nodes, depth, shadowRoots }) => {
+	const fanout = Math.max(2, Math.ceil(Math.pow(nodes, 1 / depth)));
+	let created = 0;
+	let shadows = 0;
+
+	function leaf(i) {
+		let element;
+		switch (i % 6) {
+			case 0: element = document.createElement('a'); element.href = `#n${i}`; element.textContent = `link ${i}`; break;
+			case 1: element = document.createElement('button'); element.textContent = `button ${i}`; break;
+			case 2: element = document.createElement('input'); element.name = `field${i}`; break;
+			default: element = document.createElement('span'); element.textContent = `text ${i}`;
+		}
+		return element;
+	}
+
+	function grow(parent, level) {
+		for (let i = 0; i < fanout && created < nodes; i++) {
+			if (level >= depth - 1) {
+				parent.appendChild(leaf(created++));
+				continue;
+			}
+			const container = document.createElement(level % 2 ? 'section' : 'div');
+			created++;
+			parent.appendChild(container);
+			let target = container;
+			if (level > 0 && shadows < shadowRoots) {
+				target = container.attachShadow({ mode: 'open' });
+				shadows++;
+			}
+			grow(target, level + 1);
+		}
+	}
+
+	grow(document.getElementById('app'), 0);
+	return created;
+}
+"""
+
+
+def profile_js(build_dom_tree_js: str) -> str:
+	"""Wrap buildDomTree.js so that it reports its own run time and output size instead of the tree."""
+	return f"""
+	(args) => {{
+		const build = {build_dom_tree_js.strip().rstrip(';')};
+		const start = performance.now();
+		const tree = build(args);
+		const jsMs = performance.now() - start;
+		return {{ jsMs, bytes: new TextEncoder().encode(JSON.stringify(tree)).length }};
+	}}
+	"""
+
+
+def page_html(iframes: int, frame_nodes: int) -> str:
+	frame_body = ''.join(
+		f'<li><a href="#f{i}">frame link {i}</a> <button>frame button {i}</button></li>' for i in range(frame_nodes // 3)
+	)
+	frame_document = f'<!DOCTYPE html><html><body><ul>{frame_body}</ul></body></html>'
+	frames = ''.join(
+		f'<iframe srcdoc="{html.escape(frame_document, quote=True)}" width="400" height="300"></iframe>' for _ in range(iframes)
+	)
+	return f'<!DOCTYPE html><html><head><title>DOM benchmark</title></head><body><main id="app"></main>{frames}</body></html>'
+
+
+async def measure_case(page, case: dict, repeat: int, viewport_expansion: int, highlight: bool) -> dict:
+	from openoperator.browser.context import REMOVE_HIGHLIGHTS_JS
+	from openoperator.browser.dom.accessibility import AccessibilityDomService
+	from openoperator.browser.dom.service import DomService
+	from openoperator.browser.dom.snapshot import SnapshotDomService
+
+	await page.set_content(page_html(case['iframes'], case['frame_nodes']), wait_until='load')
+	created = await page.evaluate(
+		GENERATE_JS, {'nodes': case['nodes'], 'depth': case['depth'], 'shadowRoots': case['shadow_roots']}
+	)
+
+	service = DomService(page)
+	snapshot_service = SnapshotDomService(page)
+	ax_service = AccessibilityDomService(page)
+	profiler = profile_js(resources.read_text('openoperator.browser.dom', 'buildDomTree.js'))
+	args = {'doHighlightElements': highlight, 'focusHighlightIndex': -1, 'viewportExpansion': viewport_expansion}
+	samples: dict[str, list[float]] = {}
+
+	def sample(name: str, value: float) -> None:
+		samples.setdefault(name, []).append(value)
+
+	for _ in range(repeat):
+		profile = await page.evaluate(profiler, args)
+		sample('js_ms', profile['jsMs'])
+		sample('bytes', profile['bytes'])
+		await page.evaluate(REMOVE_HIGHLIGHTS_JS)
+
+		start = time.perf_counter()
+		raw = await service._evaluate_dom_tree(highlight, -1, viewport_expansion)
+		sample('evaluate_ms', (time.perf_counter() - start) * 1000)
+		await page.evaluate(REMOVE_HIGHLIGHTS_JS)
+
+		start = time.perf_counter()
+		tree = service._parse_node(raw)
+		sample('parse_ms', (time.perf_counter() - start) * 1000)
+
+		start = time.perf_counter()
+		selector_map = service._create_selector_map(tree)
+		sample('map_ms', (time.perf_counter() - start) * 1000)
+
+		start = time.perf_counter()
+		tree.clickable_elements_to_string()
+		sample('string_ms', (time.perf_counter() - start) * 1000)
+
+		start = time.perf_counter()
+		await service.get_clickable_elements(highlight, -1, viewport_expansion)
+		sample('total_ms', (time.perf_counter() - start) * 1000)
+		await page.evaluate(REMOVE_HIGHLIGHTS_JS)
+
+		start = time.perf_counter()
+		snapshot_state = await snapshot_service.get_clickable_elements(highlight, -1, viewport_expansion)
+		sample('snapshot_ms', (time.perf_counter() - start) * 1000)
+		await page.evaluate(REMOVE_HIGHLIGHTS_JS)
+
+		start = time.perf_counter()
+		ax_state = await ax_service.get_clickable_elements(highlight, -1, viewport_expansion)
+		sample('ax_ms', (time.perf_counter() - start) * 1000)
+		await page.evaluate(REMOVE_HIGHLIGHTS_JS)
+
+	return {
+		**case,
+		'created': created,
+		'highlighted': len(selector_map),
+		'snapshot_highlighted': len(snapshot_state.selector_map),
+		'ax_highlighted': len(ax_state.selector_map),
+		**{name: round(statistics.median(values), 2) for name, values in samples.items()},
+	}
+
+
+async def run(cases: list[dict], repeat: int, viewport_expansion: int, highlight: bool) -> list[dict]:
+	from playwright.async_api import async_playwright
+
+	results = []
+	async with async_playwright() as playwright:
+		browser = await playwright.chromium.launch(headless=True)
+		page = await browser.new_page(viewport={'width': 1280, 'height': 1100})
+		for case in cases:
+			result = await measure_case(page, case, repeat, viewport_expansion, highlight)
+			results.append(result)
+			print(
+				f'nodes {case["nodes"]:>7} depth {case["depth"]:>3} shadow {case["shadow_roots"]:>3} '
+				f'iframes {case["iframes"]:>2} | '
+				f'js {result["js_ms"]:8.1f}  eval {result["evaluate_ms"]:8.1f}  parse {result["parse_ms"]:8.1f}  '
+				f'map {result["map_ms"]:6.1f}  string {result["string_ms"]:7.1f}  total {result["total_ms"]:8.1f}  '
+				f'snapshot {result["snapshot_ms"]:8.1f}  ax {result["ax_ms"]:8.1f} ms | {result["bytes"] / 1024:8.0f} KiB  '
+				f'{result["highlighted"]:>6} / {result["snapshot_highlighted"]:>6} / {result["ax_highlighted"]:>6} '
+				'highlighted (js / snapshot / ax)',
+				flush=True,
+			)
+		await browser.close()
+	return results
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--nodes', type=int, nargs='+', default=[1_000, 10_000, 100_000], help='Elements in the main document')
+	parser.add_argument('--depth', type=int, nargs='+', default=[12], help='Depth of the generated element tree')
+	parser.add_argument('--shadow-roots', type=int, nargs='+', default=[0, 25], help='Containers rendered into shadow roots')
+	parser.add_argument('--iframes', type=int, nargs='+', default=[0, 4], help='Same-origin iframes on the page')
+	parser.add_argument('--frame-nodes', type=int, default=600, help='Elements inside every iframe')
+	parser.add_argument('--viewport-expansion', type=int, default=500, help='Passed to buildDomTree.js (-1 = whole page)')
+	parser.add_argument('--no-highlight', dest='highlight', action='store_false', help='Measure without drawing highlights')
+	parser.add_argument('--repeat', type=int, default=3, help='Runs per case; medians are reported')
+	parser.add_argument('--output', help='Write the results as JSON to this file')
+	args = parser.parse_args()
+
+	cases = [
+		{'nodes': nodes, 'depth': depth, 'shadow_roots': shadow_roots, 'iframes': iframes, 'frame_nodes': args.frame_nodes}
+		for nodes, depth, shadow_roots, iframes in itertools.product(args.nodes, args.depth, args.shadow_roots, args.iframes)
+	]
+	results = asyncio.run(run(cases, args.repeat, args.viewport_expansion, args.highlight))
+
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(results, f, indent=2)
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Local fixture site for the offline benchmarks.
+
+Pages are generated on request, sized through query parameters, so the corpus needs no files on disk:
+
+    /table.html?rows=5000&cols=8       huge table with a link per row
+    /shadow.html?depth=30&width=10     nested open shadow roots with buttons at every level
+    /iframes.html?count=10&rows=200    page embedding same-origin iframes
+    /infinite.html?batch=50            infinite scroll plus a "Load more" button
+    /report.pdf?pages=3                minimal multi-page PDF, served as an attachment
+    /archive.tar.gz                    tar.gz with a PDF inside, served as an attachment
+"""
+
+import io
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+def _page(title: str, body: str, script: str = '') -> str:
+	script = f'<script>{script}</script>' if script else ''
+	return f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head><body>{body}{script}</body></html>'
+
+
+def table_page(rows: int = 5000, cols: int = 8) -> str:
+	header = ''.join(f'<th>Column {col}</th>' for col in range(cols))
+	body = ''.join(
+		f'<tr><td><a href="/table.html?rows=1#row-{row}">Row {row}</a></td>'
+		+ ''.join(f'<td>value {row}.{col}</td>' for col in range(1, cols))
+		+ '</tr>'
+		for row in range(rows)
+	)
+	return _page('Huge table', f'<h1>Quarterly figures</h1><table><thead><tr>{header}</tr></thead><tbody>{body}</tbody></table>')
+
+
+def shadow_page(depth: int = 30, width: int = 10) -> str:
+	script = f"""
+	let host = document.getElementById('root');
+	for (let level = 0; level < {depth}; level++) {{
+		const root = host.attachShadow({{ mode: 'open' }});
+		for (let i = 0; i < {width}; i++) {{
+			const button = document.createElement('button');
+			button.id = `l${{level}}-b${{i}}`;
+			button.textContent = `Level ${{level}} button ${{i}}`;
+			root.appendChild(button);
+		}}
+		const next = document.createElement('div');
+		root.appendChild(next);
+		host = next;
+	}}
+	"""
+	return _page('Deep shadow DOM', '<h1>Shadow components</h1><div id="root"></div>', script)
+
+
+def iframes_page(count: int = 10, rows: int = 200) -> str:
+	frames = ''.join(
+		f'<iframe src="/table.html?rows={rows}&cols=4" width="600" height="300" title="Frame {index}"></iframe>'
+		for index in range(count)
+	)
+	return _page('Iframes', f'<h1>Embedded reports</h1>{frames}')
+
+
+def infinite_page(batch: int = 50) -> str:
+	script = f"""
+	let loaded = 0;
+	function loadMore() {{
+		const list = document.getElementById('feed');
+		for (let i = 0; i < {batch}; i++, loaded++) {{
+			const item = document.createElement('li');
+			item.innerHTML = `<a href="#item-${{loaded}}">Item ${{loaded}}</a> <span>details for item ${{loaded}}</span>`;
+			list.appendChild(item);
+		}}
+	}}
+	document.getElementById('load-more').addEventListener('click', loadMore);
+	window.addEventListener('scroll', () => {{
+		if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 200) loadMore();
+	}});
+	loadMore();
+	"""
+	return _page('Infinite feed', '<h1>Feed</h1><ul id="feed"></ul><button id="load-more">Load more</button>', script)
+
+
+def index_page() -> str:
+	links = ''.join(
+		f'<li><a href="{path}">{path}</a></li>'
+		for path in ('/table.html', '/shadow.html', '/iframes.html', '/infinite.html', '/report.pdf', '/archive.tar.gz')
+	)
+	return _page('Benchmark fixtures', f'<h1>Fixtures</h1><ul>{links}</ul>')
+
+
+def minimal_pdf(pages: int = 3) -> bytes:
+	"""A small but well-formed PDF with one line of text per page."""
+	objects = [b'<< /Type /Catalog /Pages 2 0 R >>']
+	kids = ' '.join(f'{3 + 2 * page} 0 R' for page in range(pages))
+	objects.append(f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>'.encode())
+	font_ref = 3 + 2 * pages
+	for page in range(pages):
+		content = f'BT /F1 24 Tf 72 720 Td (Benchmark report page {page + 1}) Tj ET'.encode()
+		objects.append(
+			f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * page} 0 R '
+			f'/Resources << /Font << /F1 {font_ref} 0 R >> >> >>'.encode()
+		)
+		objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+	objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+	output = io.BytesIO()
+	output.write(b'%PDF-1.4\n')
+	offsets = []
+	for number, body in enumerate(objects, start=1):
+		offsets.append(output.tell())
+		output.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+	xref = output.tell()
+	output.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+	for offset in offsets:
+		output.write(b'%010d 00000 n \n' % offset)
+	output.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref))
+	return output.getvalue()
+
+
+def tar_gz_archive() -> bytes:
+	output = io.BytesIO()
+	with tarfile.open(fileobj=output, mode='w:gz') as archive:
+		for name, data in (('archive/report.pdf', minimal_pdf(2)), ('archive/README.txt', b'Benchmark archive\n')):
+			info = tarfile.TarInfo(name)
+			info.size = len(data)
+			archive.addfile(info, io.BytesIO(data))
+	return output.getvalue()
+
+
+def _int(params: dict[str, list[str]], name: str, default: int) -> int:
+	return int(params.get(name, [default])[0])
+
+
+# path: (content type, attachment filename or None, builder taking the parsed query)
+ROUTES: dict[str, tuple[str, Optional[str], Callable[[dict[str, list[str]]], object]]] = {
+	'/': ('text/html', None, lambda params: index_page()),
+	'/table.html': ('text/html', None, lambda params: table_page(_int(params, 'rows', 5000), _int(params, 'cols', 8))),
+	'/shadow.html': ('text/html', None, lambda params: shadow_page(_int(params, 'depth', 30), _int(params, 'width', 10))),
+	'/iframes.html': ('text/html', None, lambda params: iframes_page(_int(params, 'count', 10), _int(params, 'rows', 200))),
+	'/infinite.html': ('text/html', None, lambda params: infinite_page(_int(params, 'batch', 50))),
+	'/report.pdf': ('application/pdf', 'report.pdf', lambda params: minimal_pdf(_int(params, 'pages', 3))),
+	'/archive.tar.gz': ('application/gzip', 'archive.tar.gz', lambda params: tar_gz_archive()),
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+	def _respond(self, include_body: bool) -> None:
+		parsed = urlparse(self.path)
+		route = ROUTES.get(parsed.path)
+		if route is None:
+			self.send_error(404)
+			return
+		content_type, attachment, build = route
+		body = build(parse_qs(parsed.query))
+		data = body.encode() if isinstance(body, str) else body
+		self.send_response(200)
+		self.send_header('Content-Type', f'{content_type}; charset=utf-8' if content_type == 'text/html' else content_type)
+		self.send_header('Content-Length', str(len(data)))
+		if attachment:
+			self.send_header('Content-Disposition', f'attachment; filename="{attachment}"')
+		self.end_headers()
+		if include_body:
+			self.wfile.write(data)
+
+	def do_GET(self):
+		self._respond(include_body=True)
+
+	def do_HEAD(self):
+		self._respond(include_body=False)
+
+	def log_message(self, format, *args):
+		pass
+
+
+class FixtureServer:
+	"""Serves the fixture site from a background thread on an ephemeral localhost port."""
+
+	def __init__(self, host: str = '127.0.0.1', port: int = 0):
+		self._server = ThreadingHTTPServer((host, port), FixtureHandler)
+		self._thread = threading.Thread(target=self._server.serve_forever, name='fixture-server', daemon=True)
+
+	@property
+	def base_url(self) -> str:
+		host, port = self._server.server_address[:2]
+		return f'http://{host}:{port}'
+
+	def url(self, path: str) -> str:
+		return self.base_url + path
+
+	def __enter__(self) -> 'FixtureServer':
+		self._thread.start()
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self._server.shutdown()
+		self._server.server_close()
+
+
+if __name__ == '__main__':
+	with FixtureServer(port=8765) as server:
+		print(f'Serving fixtures at {server.base_url}/ (Ctrl+C to stop)')
+		try:
+			threading.Event().wait()
+		except KeyboardInterrupt:
+			pass
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Import-time budget check for the openoperator package.
+
+Each target is imported in a fresh interpreter several times; the best time is compared against
+its budget, and the modules that must stay lazy are checked to be absent after the import.
+Exits non-zero when a budget is exceeded, so it can gate CI or a deploy.
+
+    python benchmarks/import_time.py
+    OPENOPERATOR_IMPORT_BUDGET=0.3 python benchmarks/import_time.py --repeat 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that importing the package must not load eagerly
+HEAVY_MODULES = ['fitz', 'PIL', 'numpy', 'playwright', 'langgraph', 'langchain', 'langchain_core', 'requests']
+
+TARGETS = {
+	# target module: (budget env var, default budget in seconds, modules that must stay unloaded)
+	'openoperator': ('OPENOPERATOR_IMPORT_BUDGET', 0.5, HEAVY_MODULES),
+	'openoperator.agent.graph': ('OPENOPERATOR_GRAPH_IMPORT_BUDGET', 4.0, ['fitz', 'PIL', 'numpy', 'playwright']),
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, heavy: list[str]) -> dict:
+	result = subprocess.run(
+		[sys.executable, '-c', PROBE.format(module=module, heavy=heavy)],
+		cwd=PROJECT_ROOT,
+		capture_output=True,
+		text=True,
+		check=True,
+	)
+	# logging setup may print to stdout; the measurement is the last line
+	return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per target (best time is used)')
+	parser.add_argument('targets', nargs='*', default=list(TARGETS), help='Modules to measure')
+	args = parser.parse_args()
+
+	failed = False
+	for module in args.targets:
+		budget_env, default_budget, heavy = TARGETS.get(module, ('', float('inf'), []))
+		budget = float(os.getenv(budget_env, default_budget)) if budget_env else default_budget
+		try:
+			runs = [measure(module, heavy) for _ in range(args.repeat)]
+		except subprocess.CalledProcessError as e:
+			print(f'FAIL {module}: import raised\n{e.stderr}')
+			failed = True
+			continue
+
+		best = min(run['seconds'] for run in runs)
+		loaded = runs[-1]['loaded']
+		ok = best <= budget and not loaded
+		failed |= not ok
+		status = 'ok  ' if ok else 'FAIL'
+		print(f'{status} {module}: best {best * 1000:.1f} ms over {args.repeat} runs (budget {budget * 1000:.0f} ms)')
+		if loaded:
+			print(f'     eagerly imported: {", ".join(loaded)}')
+
+	return 1 if failed else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
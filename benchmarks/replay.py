@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Record a real agent run once, then re-execute it offline as often as needed.
+
+`record` runs the agent with the configured LLM against a live page. The browser context saves all
+network traffic to a HAR and the agent's tool calls next to it. `replay` serves every request from that HAR
+(Playwright route_from_har) and drives the graph with a ScriptedChatModel replaying the recorded tool calls.
+Replays need neither network access nor an LLM, so DOM, screenshot and graph changes can be compared on
+real-world pages without network or model variance.
+
+    python benchmarks/replay.py record https://example.com "What is this page about?" recordings/example
+    python benchmarks/replay.py replay recordings/example --repeat 5 --output example.json
+
+A recording directory holds session.har, session.actions.json and run.json (url and query of the run).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+HAR_NAME = 'session.har'
+RUN_NAME = 'run.json'
+
+
+async def run_once(
+	url: str,
+	query: str,
+	llm=None,
+	record_har_path: str | None = None,
+	replay_har_path: str | None = None,
+) -> dict:
+	from openoperator.agent.graph import AgentWithBrowser
+	from openoperator.browser.browser import BrowserConfig
+	from openoperator.browser.context import BrowserContextConfig
+	from openoperator.telemetry.callbacks import TimingCallbackHandler
+	from openoperator.telemetry.service import start_run
+
+	graph = AgentWithBrowser.compile()
+	with tempfile.TemporaryDirectory() as downloads_path, start_run() as run:
+		configurable = {
+			'browser_config': BrowserConfig(headless=True),
+			'browser_context_config': BrowserContextConfig(
+				browser_window_size={'width': 1280, 'height': 1100},
+				highlight_elements=True,
+				downloads_path=downloads_path,
+				record_har_path=record_har_path,
+				replay_har_path=replay_har_path,
+			),
+		}
+		if llm is not None:
+			configurable['llm'] = llm
+		config = {'configurable': configurable, 'recursion_limit': 100, 'callbacks': [TimingCallbackHandler(run)]}
+		start = time.perf_counter()
+		result = await graph.ainvoke({'url': url, 'query': query}, config)
+		total = time.perf_counter() - start
+		report = run.report()
+
+	steps = [span['seconds'] for span in report['spans'] if span['kind'] == 'tool']
+	final_output = result.get('final_output')
+	return {
+		'success': isinstance(final_output, dict),
+		'answer': final_output.get('answer') if isinstance(final_output, dict) else final_output,
+		'total_seconds': round(total, 4),
+		'step_seconds': [round(seconds, 4) for seconds in steps],
+		'dom_capture_seconds': report['summary'].get('browser:dom_capture', {}).get('total_seconds', 0.0),
+		'screenshot_bytes': report['values'].get('screenshot_bytes', {}).get('total', 0),
+	}
+
+
+async def record(url: str, query: str, directory: str) -> dict:
+	os.makedirs(directory, exist_ok=True)
+	result = await run_once(url, query, record_har_path=os.path.join(directory, HAR_NAME))
+	with open(os.path.join(directory, RUN_NAME), 'w') as f:
+		json.dump({'url': url, 'query': query, 'answer': result['answer']}, f, indent=2)
+	return result
+
+
+async def replay(directory: str, repeat: int) -> dict:
+	from openoperator.agent.scripted_llm import ScriptedChatModel
+
+	with open(os.path.join(directory, RUN_NAME)) as f:
+		recorded = json.load(f)
+	har_path = os.path.join(directory, HAR_NAME)
+	runs = []
+	for _ in range(repeat):
+		llm = ScriptedChatModel.from_recording(har_path)
+		runs.append(await run_once(recorded['url'], recorded['query'], llm=llm, replay_har_path=har_path))
+	return {
+		'recording': directory,
+		'matches_recording': all(run['answer'] == recorded['answer'] for run in runs),
+		'total_seconds_median': statistics.median(run['total_seconds'] for run in runs),
+		'dom_capture_seconds_median': statistics.median(run['dom_capture_seconds'] for run in runs),
+		'runs': runs,
+	}
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	commands = parser.add_subparsers(dest='command', required=True)
+	record_parser = commands.add_parser('record', help='Run the agent live and record the session')
+	record_parser.add_argument('url')
+	record_parser.add_argument('query')
+	record_parser.add_argument('directory', help='Recording directory to create')
+	replay_parser = commands.add_parser('replay', help='Re-execute a recorded session offline')
+	replay_parser.add_argument('directory', help='Recording directory written by record')
+	replay_parser.add_argument('--repeat', type=int, default=3, help='Number of replays')
+	replay_parser.add_argument('--output', help='Write the results as JSON to this file')
+	args = parser.parse_args()
+
+	if args.command == 'record':
+		result = asyncio.run(record(args.url, args.query, args.directory))
+		print(
+			f'{"ok  " if result["success"] else "FAIL"} recorded {len(result["step_seconds"])} steps '
+			f'in {result["total_seconds"]:.2f} s to {args.directory}'
+		)
+		return 0 if result['success'] else 1
+
+	result = asyncio.run(replay(args.directory, args.repeat))
+	for run in result['runs']:
+		print(
+			f'{"ok  " if run["success"] else "FAIL"} total {run["total_seconds"]:7.2f} s  '
+			f'steps {len(run["step_seconds"])}  dom {run["dom_capture_seconds"]:.2f} s  '
+			f'screenshots {run["screenshot_bytes"] / 1024:.0f} KiB'
+		)
+	answers = 'match' if result['matches_recording'] else 'differ from'
+	print(f'median {result["total_seconds_median"]:.2f} s, answers {answers} the recording')
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump(result, f, indent=2)
+	return 0 if result['matches_recording'] and all(run['success'] for run in result['runs']) else 1
+
+
+if __name__ == '__main__':
+	sys.exit(main())
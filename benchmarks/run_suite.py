@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the agent graph.
+
+Serves the local fixture site (see benchmarks/fixtures.py) and drives the compiled graph against it
+with a scripted chat model, so runs are deterministic and need neither internet access nor an LLM.
+Every scenario runs in a fresh interpreter to keep peak RSS figures independent, and reports:
+
+    total_seconds        end-to-end task time
+    step_seconds         latency of every tool step (browser action + state capture)
+    dom_capture_seconds  total / max time spent in DOM capture
+    screenshot_bytes     total / max size of the captured screenshots
+    peak_rss_mb          peak RSS of the Python process
+    peak_browser_rss_mb  peak RSS of the largest browser process
+
+    python benchmarks/run_suite.py --output baseline.json
+    python benchmarks/run_suite.py --baseline baseline.json --tolerance 0.25 table pdf_download
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.fixtures import FixtureServer  # noqa: E402
+
+# Metrics compared against a baseline; all of them are "lower is better"
+COMPARED_METRICS = [
+	'total_seconds',
+	'step_seconds_max',
+	'dom_capture_seconds',
+	'screenshot_bytes',
+	'peak_rss_mb',
+	'peak_browser_rss_mb',
+]
+
+
+def find_index(marker: str) -> Callable:
+	"""Scripted step clicking the element whose line in the latest browser screen contains `marker`."""
+	from openoperator.agent.scripted_llm import browser_call, message_texts
+
+	def step(messages):
+		for text in reversed(message_texts(messages)):
+			for line in text.splitlines():
+				if marker in line and (match := re.search(r'\d+', line)):
+					return browser_call('click_element', index=int(match.group()))
+		return {'name': 'raise_error', 'args': {'error_message': f'No element matching {marker!r}'}}
+
+	return step
+
+
+def open_download(suffix: str, timeout: float = 10.0) -> Callable:
+	"""Scripted step opening the first announced download ending with `suffix`, waiting for it if needed."""
+	from openoperator.agent.scripted_llm import message_texts, think_call
+
+	deadline = None
+
+	def step(messages):
+		nonlocal deadline
+		for text in message_texts(messages):
+			for path in re.findall(r'path: (\S+?)\.?\s', text + ' '):
+				if path.endswith(suffix):
+					return {'name': 'open_file', 'args': {'file_path': path}}
+		deadline = deadline or time.monotonic() + timeout
+		if time.monotonic() > deadline:
+			return {'name': 'raise_error', 'args': {'error_message': f'No {suffix} download announced'}}
+		# Downloads are saved in the background; thinking does not advance the script, so this step is retried
+		time.sleep(0.25)
+		return think_call(f'waiting for a {suffix} download')
+
+	return step
+
+
+@dataclass
+class Scenario:
+	path: str
+	query: str
+	steps: Callable[[str], list]
+
+
+def _go(base_url: str, path: str) -> dict:
+	from openoperator.agent.scripted_llm import browser_call
+
+	return browser_call('go_to_url', url=base_url + path)
+
+
+def _submit(answer: str) -> dict:
+	from openoperator.agent.scripted_llm import submit_call
+
+	return submit_call(answer)
+
+
+SCENARIOS = {
+	'table': Scenario(
+		'/table.html?rows=5000',
+		'Find the value in row 4000',
+		lambda base: [_go(base, '/table.html?rows=5000'), _submit('value 4000.1')],
+	),
+	'shadow_dom': Scenario(
+		'/shadow.html?depth=30',
+		'Press the first button of level 20',
+		lambda base: [_go(base, '/shadow.html?depth=30'), find_index('id="l20-b0"'), _submit('pressed')],
+	),
+	'iframes': Scenario(
+		'/iframes.html?count=10',
+		'Summarize the embedded reports',
+		lambda base: [_go(base, '/iframes.html?count=10'), _submit('ten reports')],
+	),
+	'infinite_scroll': Scenario(
+		'/infinite.html',
+		'Load three pages of the feed',
+		lambda base: [
+			_go(base, '/infinite.html'),
+			find_index('id="load-more"'),
+			find_index('id="load-more"'),
+			_submit('150 items'),
+		],
+	),
+	'pdf_download': Scenario(
+		'/report.pdf',
+		'Read the report',
+		lambda base: [_go(base, '/report.pdf'), open_download('.pdf'), _submit('three pages')],
+	),
+	'targz_download': Scenario(
+		'/archive.tar.gz',
+		'Read the report inside the archive',
+		lambda base: [_go(base, '/archive.tar.gz'), open_download('.pdf'), _submit('two pages')],
+	),
+}
+
+
+async def run_scenario(name: str, base_url: str) -> dict:
+	from openoperator.agent.graph import AgentWithBrowser
+	from openoperator.agent.scripted_llm import ScriptedChatModel
+	from openoperator.browser.browser import BrowserConfig
+	from openoperator.browser.context import BrowserContextConfig
+	from openoperator.telemetry.callbacks import TimingCallbackHandler
+	from openoperator.telemetry.service import start_run
+
+	scenario = SCENARIOS[name]
+	graph = AgentWithBrowser.compile()
+	with tempfile.TemporaryDirectory() as downloads_path, start_run() as run:
+		config = {
+			'configurable': {
+				'llm': ScriptedChatModel(steps=scenario.steps(base_url)),
+				'browser_config': BrowserConfig(headless=True),
+				'browser_context_config': BrowserContextConfig(
+					browser_window_size={'width': 1280, 'height': 1100},
+					highlight_elements=True,
+					downloads_path=downloads_path,
+				),
+			},
+			'recursion_limit': 100,
+			'callbacks': [TimingCallbackHandler(run)],
+		}
+		start = time.perf_counter()
+		result = await graph.ainvoke({'url': base_url + scenario.path, 'query': scenario.query}, config)
+		total = time.perf_counter() - start
+		report = run.report()
+
+	steps = [span['seconds'] for span in report['spans'] if span['kind'] == 'tool']
+	dom_capture = report['summary'].get('browser:dom_capture', {})
+	screenshots = report['values'].get('screenshot_bytes', {})
+	# ru_maxrss is in kilobytes on Linux; browser processes are reaped by now and counted as children
+	return {
+		'scenario': name,
+		'success': isinstance(result.get('final_output'), dict),
+		'total_seconds': round(total, 4),
+		'step_seconds': [round(seconds, 4) for seconds in steps],
+		'step_seconds_max': round(max(steps, default=0.0), 4),
+		'dom_capture_seconds': dom_capture.get('total_seconds', 0.0),
+		'dom_capture_max_seconds': dom_capture.get('max_seconds', 0.0),
+		'screenshot_bytes': screenshots.get('total', 0),
+		'screenshot_max_bytes': screenshots.get('max', 0),
+		'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+		'peak_browser_rss_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+	}
+
+
+def run_isolated(name: str, base_url: str) -> dict:
+	result = subprocess.run(
+		[sys.executable, os.path.abspath(__file__), '--worker', name, '--base-url', base_url],
+		cwd=PROJECT_ROOT,
+		capture_output=True,
+		text=True,
+	)
+	if result.returncode != 0:
+		return {'scenario': name, 'success': False, 'error': result.stderr.strip().splitlines()[-1:]}
+	# logging may print to stdout; the measurement is the last line
+	return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results: list[dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+	regressions = []
+	for result in results:
+		previous = baseline.get(result['scenario'])
+		if not previous:
+			continue
+		for metric in COMPARED_METRICS:
+			before, after = previous.get(metric), result.get(metric)
+			if before and after is not None and after > before * (1 + tolerance):
+				regressions.append(f'{result["scenario"]}.{metric}: {before} -> {after} (+{(after / before - 1) * 100:.0f}%)')
+	return regressions
+
+
+def main() -> int:
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('scenarios', nargs='*', default=list(SCENARIOS), help='Scenarios to run')
+	parser.add_argument('--output', help='Write the results as JSON to this file')
+	parser.add_argument('--baseline', help='Fail when a metric regresses against this results file')
+	parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression against the baseline')
+	parser.add_argument('--worker', help=argparse.SUPPRESS)
+	parser.add_argument('--base-url', help=argparse.SUPPRESS)
+	args = parser.parse_args()
+
+	if args.worker:
+		print(json.dumps(asyncio.run(run_scenario(args.worker, args.base_url))))
+		return 0
+
+	with FixtureServer() as server:
+		results = [run_isolated(name, server.base_url) for name in args.scenarios]
+
+	for result in results:
+		if 'error' in result:
+			print(f'FAIL {result["scenario"]}: {" ".join(result["error"])}')
+			continue
+		status = 'ok  ' if result['success'] else 'FAIL'
+		print(
+			f'{status} {result["scenario"]:<16} total {result["total_seconds"]:7.2f} s  '
+			f'steps {len(result["step_seconds"])} (max {result["step_seconds_max"]:.2f} s)  '
+			f'dom {result["dom_capture_seconds"]:.2f} s  '
+			f'screenshots {result["screenshot_bytes"] / 1024:.0f} KiB  '
+			f'rss {result["peak_rss_mb"]:.0f} MiB / browser {result["peak_browser_rss_mb"]:.0f} MiB'
+		)
+
+	if args.output:
+		with open(args.output, 'w') as f:
+			json.dump({result['scenario']: result for result in results}, f, indent=2)
+
+	failed = any(not result.get('success') for result in results)
+	if args.baseline:
+		with open(args.baseline) as f:
+			regressions = compare(results, json.load(f), args.tolerance)
+		for regression in regressions:
+			print(f'REGRESSION {regression}')
+		failed |= bool(regressions)
+	return 1 if failed else 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
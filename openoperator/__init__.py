@@ -1,29 +1,71 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from openoperator.logging_config import setup_logging
 
 setup_logging()
 
-from openoperator.browser.browser import Browser as Browser
-from openoperator.browser.browser import BrowserConfig as BrowserConfig
-from openoperator.browser.dom.service import DomService as DomService
-from openoperator.tools.browser_tools import (
-    SearchGoogle,
-    GoToUrl,
-    GoBack,
-    ClickElement,
-    InputText,
-    SwitchTab,
-    OpenTab,
-    ScrollDown,
-    ScrollUp,
-    SendKeys,
-    ScrollToText,
-    GetDropdownOptions,
-    SelectDropdownOption
-)
-
-from openoperator.tools.ops_tools import submit_result, think, raise_error
-
-from openoperator.agent.graph import AgentWithBrowser
+# Public names are resolved on first access so that `import openoperator` does not pull in
+# Playwright, LangGraph or the LLM provider SDKs
+_LAZY_IMPORTS = {
+	'Browser': 'openoperator.browser.browser',
+	'BrowserConfig': 'openoperator.browser.browser',
+	'DomService': 'openoperator.browser.dom.service',
+	'SearchGoogle': 'openoperator.tools.browser_tools',
+	'GoToUrl': 'openoperator.tools.browser_tools',
+	'GoBack': 'openoperator.tools.browser_tools',
+	'ClickElement': 'openoperator.tools.browser_tools',
+	'InputText': 'openoperator.tools.browser_tools',
+	'SwitchTab': 'openoperator.tools.browser_tools',
+	'OpenTab': 'openoperator.tools.browser_tools',
+	'ScrollDown': 'openoperator.tools.browser_tools',
+	'ScrollUp': 'openoperator.tools.browser_tools',
+	'SendKeys': 'openoperator.tools.browser_tools',
+	'ScrollToText': 'openoperator.tools.browser_tools',
+	'GetDropdownOptions': 'openoperator.tools.browser_tools',
+	'ExpandElements': 'openoperator.tools.browser_tools',
+	'SelectDropdownOption': 'openoperator.tools.browser_tools',
+	'submit_result': 'openoperator.tools.ops_tools',
+	'think': 'openoperator.tools.ops_tools',
+	'raise_error': 'openoperator.tools.ops_tools',
+	'AgentWithBrowser': 'openoperator.agent.graph',
+}
+
+if TYPE_CHECKING:
+	from openoperator.agent.graph import AgentWithBrowser
+	from openoperator.browser.browser import Browser, BrowserConfig
+	from openoperator.browser.dom.service import DomService
+	from openoperator.tools.browser_tools import (
+		ClickElement,
+		ExpandElements,
+		GetDropdownOptions,
+		GoBack,
+		GoToUrl,
+		InputText,
+		OpenTab,
+		ScrollDown,
+		ScrollToText,
+		ScrollUp,
+		SearchGoogle,
+		SelectDropdownOption,
+		SendKeys,
+		SwitchTab,
+	)
+	from openoperator.tools.ops_tools import raise_error, submit_result, think
+
+
+def __getattr__(name: str):
+	module = _LAZY_IMPORTS.get(name)
+	if module is None:
+		raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+	value = getattr(import_module(module), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
 
 __all__ = [
 	'Browser',
@@ -42,6 +84,7 @@ __all__ = [
 	'ScrollToText',
 	'GetDropdownOptions',
 	'SelectDropdownOption',
+	'ExpandElements',
 	'submit_result',
 	'think',
 	'raise_error',
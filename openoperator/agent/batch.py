@@ -0,0 +1,177 @@
+"""Batch analysis of many (url, query) jobs.
+
+All jobs share one browser; every run gets its own browser context in it. Concurrency is bounded
+globally and per domain, and results are produced as soon as each job completes.
+
+    python -m openoperator.agent.batch jobs.jsonl --concurrency 8 --per-domain 2 > results.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_PER_DOMAIN = 2
+DEFAULT_RATE = 1.0
+
+
+@dataclass
+class BatchJob:
+    url: str
+    query: str
+    id: Optional[str] = None
+
+    @property
+    def domain(self) -> str:
+        return (urlsplit(self.url).hostname or "").lower()
+
+
+def parse_jobs(items: Iterable[Any]) -> List[BatchJob]:
+    """Validate job objects ({"url", "query", optional "id"}); ids default to the position in the batch."""
+    jobs = []
+    for position, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get("url") or not item.get("query"):
+            raise ValueError(f"Job {position}: both url and query are required")
+        job_id = item.get("id")
+        jobs.append(BatchJob(url=item["url"], query=item["query"], id=str(job_id if job_id is not None else position)))
+    return jobs
+
+
+def parse_jsonl(lines: Iterable[str]) -> List[BatchJob]:
+    """Parse JSONL job lines, skipping blank lines."""
+    items = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            items.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {number}: invalid JSON ({e.msg})")
+    return parse_jobs(items)
+
+
+async def run_batch(
+    jobs: List[BatchJob],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_domain: int = DEFAULT_PER_DOMAIN,
+    rate: float = DEFAULT_RATE,
+    config: Optional[Dict[str, Any]] = None,
+    browser_config: Any = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run all jobs on a shared browser and yield one result record per job, in completion order.
+
+    Besides the per-domain limit on runs, navigations to a domain are limited to `per_domain` in
+    flight and `rate` per second across all runs, queued fairly between runs.
+    """
+    from openoperator.agent.runner import DEFAULT_CONFIG, run_analysis
+    from openoperator.browser.browser import Browser, BrowserConfig
+    from openoperator.browser.scheduler import SchedulerConfig
+
+    scheduler = SchedulerConfig(max_pages_per_domain=per_domain, requests_per_second=rate, burst=per_domain)
+    browser = Browser(browser_config or BrowserConfig(headless=True, scheduler=scheduler))
+    config = config or DEFAULT_CONFIG
+    run_config = {**config, "configurable": {**config.get("configurable", {}), "browser": browser}}
+
+    slots = asyncio.Semaphore(concurrency)
+    domain_slots: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(per_domain))
+    results: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    async def run_job(job: BatchJob) -> None:
+        record: Dict[str, Any] = {"id": job.id, "url": job.url, "query": job.query}
+        # Wait for the domain first, so jobs queued behind a busy domain do not hold global slots
+        async with domain_slots[job.domain], slots:
+            start = time.perf_counter()
+            try:
+                analysis = await run_analysis(job.url, job.query, run_config)
+                record.update(status="completed" if analysis.completed else "failed", **analysis.response)
+            except Exception as e:
+                logger.error(f"Batch job {job.id} failed: {e}")
+                record.update(status="error", error=str(e))
+            record["seconds"] = round(time.perf_counter() - start, 3)
+        await results.put(record)
+
+    tasks = [asyncio.create_task(run_job(job)) for job in jobs]
+    try:
+        for _ in range(len(tasks)):
+            yield await results.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await browser.close()
+
+
+def stream_batch(jobs: List[BatchJob], **kwargs: Any) -> Iterator[Dict[str, Any]]:
+    """Synchronous view of run_batch for WSGI handlers: the batch runs on an event loop in a background thread.
+
+    Closing the iterator early (e.g. the client disconnected) cancels the remaining jobs.
+    """
+    records: "queue.Queue[Any]" = queue.Queue()
+    done = object()
+    loop = asyncio.new_event_loop()
+
+    async def produce() -> None:
+        try:
+            async for record in run_batch(jobs, **kwargs):
+                records.put(record)
+        except BaseException as e:
+            records.put(e)
+        finally:
+            records.put(done)
+
+    task = loop.create_task(produce())
+    thread = threading.Thread(target=loop.run_until_complete, args=(task,), name="batch-analysis", daemon=True)
+    thread.start()
+    try:
+        while (item := records.get()) is not done:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join()
+        loop.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Analyze a JSONL file of {url, query[, id]} jobs; results are printed as JSONL.")
+    parser.add_argument("jobs", help="JSONL file with one job per line, or - for stdin")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Jobs running at the same time")
+    parser.add_argument("--per-domain", type=int, default=DEFAULT_PER_DOMAIN, help="Jobs running at the same time per domain")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help="Navigations per second per domain (0 = unlimited)")
+    parser.add_argument("--output", help="Write results to this file instead of stdout")
+    args = parser.parse_args()
+
+    if args.jobs == "-":
+        jobs = parse_jsonl(sys.stdin)
+    else:
+        with open(args.jobs) as f:
+            jobs = parse_jsonl(f)
+
+    async def run() -> None:
+        output = open(args.output, "w") if args.output else sys.stdout
+        try:
+            async for record in run_batch(jobs, concurrency=args.concurrency, per_domain=args.per_domain, rate=args.rate):
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
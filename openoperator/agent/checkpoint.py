@@ -0,0 +1,150 @@
+"""Checkpoint persistence for agent runs.
+
+With OPENOPERATOR_CHECKPOINT_DB set to a file path, every step of a run is checkpointed to SQLite
+(langgraph-checkpoint-sqlite), so a run that failed or timed out can be resumed from its last step
+instead of starting over. The message history, action records and downloads are persisted; the
+browser objects are not serializable and are stored as markers instead. On load they become fresh,
+lazily started browser objects that re-open the last visited URL when first used.
+"""
+
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import asdict, fields
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from openoperator.browser.browser import Browser, BrowserConfig
+from openoperator.browser.context import BrowserContext, BrowserContextConfig
+from openoperator.browser.dom.history_tree_processor.view import DOMHistoryElement
+from openoperator.browser.downloads import DownloadedItem, DownloadsRegistry
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DB_ENV = "OPENOPERATOR_CHECKPOINT_DB"
+MARKER = "__openoperator__"
+
+
+def checkpointing_enabled() -> bool:
+    return bool(os.getenv(CHECKPOINT_DB_ENV, "").strip())
+
+
+def _detach(value: Any) -> Any:
+    """Replace browser objects by serializable markers; containers are only copied when something changed."""
+    if isinstance(value, BrowserContext):
+        session = value.session
+        return {
+            MARKER: "browser_context",
+            "url": session.current_page.url if session is not None else value.restore_url,
+            "task_query": value.task_query,
+            # each channel is loaded on its own, so the context cannot rely on the state's browser marker
+            "headless": value.browser.config.headless,
+            "config": asdict(value.config),
+            "downloads": [{"path": item.fullpath, "accessed": item._accessed} for item in value.downloads.items],
+            # the actions so far, so a resumed run still records a complete macro
+            "actions": [
+                {**action, "element": action["element"] and action["element"].to_dict()} for action in value.recorded_actions
+            ],
+        }
+    if isinstance(value, Browser):
+        return {MARKER: "browser", "headless": value.config.headless}
+    if isinstance(value, dict):
+        items = {key: _detach(item) for key, item in value.items()}
+        changed = any(items[key] is not item for key, item in value.items())
+        return items if changed else value
+    if isinstance(value, (list, tuple)):
+        items = [_detach(item) for item in value]
+        if all(new is old for new, old in zip(items, value)):
+            return value
+        if isinstance(value, list):
+            return items
+        # named tuples take their fields positionally
+        return type(value)(*items) if hasattr(value, "_fields") else type(value)(items)
+    return value
+
+
+def _restore_downloads(records: list) -> DownloadsRegistry:
+    registry = DownloadsRegistry()
+    for record in records:
+        path = record["path"]
+        # extracted files are registered again by their archive
+        if os.path.exists(path) and not any(item.fullpath == path for item in registry.items):
+            DownloadedItem(path, registry)
+    accessed = {record["path"] for record in records if record["accessed"]}
+    for item in registry.items:
+        item._accessed = item.fullpath in accessed
+        item._notification_sent = True
+    return registry
+
+
+def _attach(value: Any, restored: Dict[str, Any]) -> Any:
+    """Turn markers back into (not yet started) browser objects. `restored` shares one Browser per loaded value.
+
+    The checkpointer loads every channel and pending write separately, so a restored context usually has
+    a Browser of its own rather than the one in state["browser"]; shutdown closes both.
+    """
+    if isinstance(value, dict):
+        kind = value.get(MARKER)
+        if kind == "browser":
+            if "browser" not in restored:
+                restored["browser"] = Browser(BrowserConfig(headless=value["headless"]))
+            return restored["browser"]
+        if kind == "browser_context":
+            if "browser" not in restored:
+                restored["browser"] = Browser(BrowserConfig(headless=value.get("headless", False)))
+            known = {field.name for field in fields(BrowserContextConfig)}
+            config = BrowserContextConfig(**{key: item for key, item in value["config"].items() if key in known})
+            context = BrowserContext(restored["browser"], config, downloads=_restore_downloads(value["downloads"]))
+            context.restore_url = value["url"]
+            context.task_query = value.get("task_query", "")
+            context.recorded_actions = [
+                {**action, "element": action["element"] and DOMHistoryElement(**action["element"])}
+                for action in value.get("actions", [])
+            ]
+            return context
+        return {key: _attach(item, restored) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_attach(item, restored) for item in value]
+    return value
+
+
+class BrowserStateSerializer(JsonPlusSerializer):
+    """JsonPlusSerializer that stores Browser and BrowserContext objects as re-hydratable markers."""
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        return super().dumps_typed(_detach(obj))
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        return _attach(super().loads_typed(data), {})
+
+
+@lru_cache(maxsize=None)
+def _memory_saver() -> BaseCheckpointSaver:
+    from langgraph.checkpoint.memory import MemorySaver
+    return MemorySaver(serde=BrowserStateSerializer())
+
+
+@asynccontextmanager
+async def open_checkpointer(path: Optional[str] = None) -> AsyncIterator[Optional[BaseCheckpointSaver]]:
+    """Checkpointer for the current event loop, or None when checkpointing is disabled.
+
+    Falls back to a process-local in-memory saver when langgraph-checkpoint-sqlite is not installed.
+    """
+    path = path or os.getenv(CHECKPOINT_DB_ENV, "").strip()
+    if not path:
+        yield None
+        return
+    try:
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+    except ImportError:
+        logger.warning("langgraph-checkpoint-sqlite is not installed, checkpoints are kept in memory only")
+        yield _memory_saver()
+        return
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    async with aiosqlite.connect(path) as connection:
+        yield AsyncSqliteSaver(connection, serde=BrowserStateSerializer())
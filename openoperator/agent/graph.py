@@ -21,7 +21,8 @@ from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 from langgraph.types import Command
 
-from openoperator.agent.llm_clients import llm
+from openoperator.agent.llm_clients import get_llm
+from openoperator.agent.macros import Macro, next_macro_message
 from openoperator.agent.prompts.search_agent import REACT_PROMPT
 from openoperator.agent.prompts.templates import (
     CONCLUSIONS_TEMPLATE, 
@@ -29,9 +30,9 @@ from openoperator.agent.prompts.templates import (
     PUNISHMENT_MESSAGE_TEMPLATE,
     USER_INPUT_TEMPLATE
 )
-from openoperator.browser.browser import Browser
+from openoperator.browser.browser import Browser, BrowserConfig
 from openoperator.browser.context import BrowserContext, BrowserContextConfig
-from openoperator.tools.browser_tools import ClickElement, GoBack, GoToUrl, InputText
+from openoperator.tools.browser_tools import ClickElement, ExpandElements, GoBack, GoToUrl, InputText
 from openoperator.tools.ops_tools import open_file, raise_error, submit_result, think
 from openoperator.tools.pollinations.vision_tool import PollinationsVisionTool
 from openoperator.tools.pollinations.text_tool import PollinationsTextTool
@@ -62,6 +63,7 @@ tools = [GoToUrl(),
          ClickElement(), 
          InputText(), 
          GoBack(), 
+         ExpandElements(), 
          submit_result, 
          think, 
          raise_error, 
@@ -74,15 +76,20 @@ tool_node = ToolNode(tools)
 # nodes
 
 @graph.add_node
-def build_browser(state: OverallState
+def build_browser(state: OverallState,
+                  config: RunnableConfig
                   ) -> Command[Literal["agent"]]:
     
-    config = BrowserContextConfig(
+    # configurable "browser_config" / "browser_context_config" override the defaults (e.g. headless benchmark runs);
+    # a configurable "browser" is shared between runs, each run only opens its own context in it
+    configurable = config.get("configurable", {})
+    context_config = configurable.get("browser_context_config") or BrowserContextConfig(
         browser_window_size={"width": 1280, "height": 1100},
         highlight_elements=True
     )
-    browser = Browser()
-    context = BrowserContext(browser, config)
+    browser = configurable.get("browser") or Browser(configurable.get("browser_config") or BrowserConfig())
+    context = BrowserContext(browser, context_config)
+    context.task_query = state['query']
     message = HumanMessagePromptTemplate.from_template(USER_INPUT_TEMPLATE)
     message = message.format(query=state['query'], 
                              url=state['url'])
@@ -124,6 +131,8 @@ def agent(state: OverallState,
 
     available_files = state["browser_context"].downloads.state
     system = SystemMessagePromptTemplate.from_template(REACT_PROMPT)
+    # a configurable "llm" replaces the environment-configured model (e.g. a scripted model in benchmarks)
+    llm = config.get("configurable", {}).get("llm") or get_llm()
     model = llm.with_config(config=config
               ).bind_tools(tools)
     history = state.get('messages') or []
@@ -154,8 +163,12 @@ def agent(state: OverallState,
         return Command(goto="shutdown", 
                        update={"final_output": "Browser setup error: Playwright browsers are not installed. Please run 'playwright install' to install the required browsers, then try again."})
     
-    response = (chat | model).invoke({"history": history, 
-                                      "files": available_files})
+    # a configurable "macro" replays the steps of an earlier run of the task until the LLM has to take over
+    macro = config.get("configurable", {}).get("macro")
+    response = next_macro_message(macro, history, state["browser_context"]) if macro is not None else None
+    if response is None:
+        response = (chat | model).invoke({"history": history, 
+                                          "files": available_files})
     
     logger.debug(f"Agent response type: {type(response)}")
     logger.debug(f"Agent response tool_calls: {getattr(response, 'tool_calls', None)}")
@@ -176,6 +189,8 @@ def agent(state: OverallState,
         
         else:
             logger.debug(f"Regular tool call: {tool_call.get('name')}")
+            # kept by recording contexts, so the run can be replayed with ScriptedChatModel.from_recording
+            state["browser_context"].record_action(tool_call["name"], tool_call["args"]) # type: ignore
             return Command(goto="tools", 
                            update={"messages": [response]})
         
@@ -193,8 +208,9 @@ def toolmessage_processor(state: AgentState
     prev_screen = [message for message in state['messages'] 
                    if message.additional_kwargs.get("label", "") == "browser_screen"]
     
-    if artifacts := last_message.artifact: # type: ignore
-        screenshot = artifacts.get("screenshot")
+    artifacts = last_message.artifact or {} # type: ignore
+    # Tools that do not change the page (expand_elements) return no screenshot
+    if screenshot := artifacts.get("screenshot"):
         action_record = artifacts.get("action_record")
 
         new_screen = [HumanMessage(content=screenshot, 
@@ -211,11 +227,26 @@ def toolmessage_processor(state: AgentState
     return Command(goto="agent_preprocessing")
 
 @graph.add_node
-async def shutdown(state: OverallState) -> Command[Literal[END]]: # type: ignore
+async def shutdown(state: OverallState,
+                   config: RunnableConfig
+                   ) -> Command[Literal[END]]: # type: ignore
     browser = state["browser"]
     context = state["browser_context"]
+    # a configurable "macro_store" keeps the actions of completed runs for replay
+    macro_store = config.get("configurable", {}).get("macro_store")
+    if macro_store is not None and isinstance(state.get("final_output"), dict):
+        try:
+            macro_store.save(Macro.from_actions(state["url"], state["query"], context.recorded_actions))
+        except Exception as e:
+            logger.warning(f"Failed to save macro: {e}")
     await context.close()
-    await browser.close()
+    # a shared browser outlives the run and is closed by its owner; a context restored from a
+    # checkpoint runs on a browser of its own (see openoperator.agent.checkpoint)
+    shared_browser = config.get("configurable", {}).get("browser")
+    if browser is not shared_browser:
+        await browser.close()
+    if context.browser is not browser and context.browser is not shared_browser:
+        await context.browser.close()
     return Command(goto=END)
 
 graph.set_entry_point("build_browser")
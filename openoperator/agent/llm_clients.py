@@ -1,21 +1,30 @@
 import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from langchain_core.language_models.chat_models import BaseChatModel
 
-from openoperator.agent.pollinations_llm import PollinationsChatModel
-
-import tracemalloc
-tracemalloc.start()
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
 
 load_dotenv()
 
-def get_llm() -> BaseChatModel:
-    """Get the configured LLM based on environment variables."""
-    model_provider = os.getenv("MODEL_PROVIDER", "").lower()
-    model = os.getenv("MODEL", "openai")
-    
+def get_llm(model_provider: str | None = None, model: str | None = None) -> "BaseChatModel":
+    """Get the configured LLM, falling back to the MODEL_PROVIDER and MODEL environment variables.
+
+    Models are constructed on first use and cached per (provider, model) pair. Provider
+    SDKs are imported at that point too, so importing this module stays cheap.
+    """
+    if model_provider is None:
+        model_provider = os.getenv("MODEL_PROVIDER", "")
+    if model is None:
+        model = os.getenv("MODEL", "openai")
+    return _create_llm(model_provider.lower(), model)
+
+@lru_cache(maxsize=None)
+def _create_llm(model_provider: str, model: str) -> "BaseChatModel":
     if model_provider == "pollinations":
+        from openoperator.agent.pollinations_llm import PollinationsChatModel
         return PollinationsChatModel(
             model_name=model,
             temperature=0.5,
@@ -34,10 +43,13 @@ def get_llm() -> BaseChatModel:
             max_retries=2
         )
 
-# Initialize the LLM
-llm = get_llm()
+def __getattr__(name: str):
+    # `llm` used to be built at import time; keep it importable, but construct it lazily
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # embeddings = init_embeddings(
 #     provider="azure_openai",
 #     model="text-embedding-3-large",
-# )
\ No newline at end of file
+# )
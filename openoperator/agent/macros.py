@@ -0,0 +1,171 @@
+"""Macros: replay the actions of an earlier successful run without asking the LLM.
+
+When a run completes, its tool calls are stored with the elements they targeted (as
+DOMHistoryElements). The next run of the same task replays them step by step: element targets are
+re-identified in the fresh page with HistoryTreeProcessor, so a changed element index does not matter.
+The LLM takes over for good at the first step that cannot be replayed, i.e. an element that cannot be
+matched, a download that did not happen, or a step that needs judgement such as submitting the answer.
+A scheduled task whose pages did not change thus needs a single LLM call, for the final answer.
+
+Enabled by setting OPENOPERATOR_MACRO_DIR to a directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage
+
+from openoperator.agent.result_cache import normalize_query, normalize_url
+from openoperator.browser.context import BrowserContext
+from openoperator.browser.dom.history_tree_processor.service import HistoryTreeProcessor
+from openoperator.browser.dom.history_tree_processor.view import DOMHistoryElement
+
+logger = logging.getLogger(__name__)
+
+MACRO_DIR_ENV = "OPENOPERATOR_MACRO_DIR"
+# Marks the AI messages produced by a macro, so a run knows whether the LLM has taken over
+MACRO_STEP_KEY = "macro_step"
+
+# Steps that only depend on the page, not on judgement; the rest are left to the LLM
+REPLAYABLE_TOOLS = frozenset({
+    "go_to_url", "go_back", "click_element", "input_text", "search_google", "switch_tab", "open_tab",
+    "scroll_down", "scroll_up", "send_keys", "scroll_to_text", "select_dropdown_option", "open_file",
+})
+
+
+@dataclass
+class MacroStep:
+    name: str
+    args: Dict[str, Any]
+    # The element the step targeted, for steps with an element index
+    element: Optional[DOMHistoryElement] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "args": self.args, "element": self.element.to_dict() if self.element else None}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MacroStep":
+        element = DOMHistoryElement(**data["element"]) if data.get("element") else None
+        return cls(name=data["name"], args=data["args"], element=element)
+
+
+@dataclass
+class Macro:
+    url: str
+    query: str
+    steps: List[MacroStep] = field(default_factory=list)
+    recorded_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_actions(cls, url: str, query: str, actions: Sequence[Dict[str, Any]]) -> "Macro":
+        """Macro from BrowserContext.recorded_actions."""
+        steps = [MacroStep(name=action["name"], args=action["args"], element=action.get("element")) for action in actions]
+        return cls(url=url, query=query, steps=steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "query": self.query,
+            "recorded_at": self.recorded_at,
+            "steps": [step.to_dict() for step in self.steps],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Macro":
+        return cls(
+            url=data["url"],
+            query=data["query"],
+            steps=[MacroStep.from_dict(step) for step in data["steps"]],
+            recorded_at=data.get("recorded_at", 0.0),
+        )
+
+
+def macro_key(url: str, query: str) -> str:
+    canonical = json.dumps({"url": normalize_url(url), "query": normalize_query(query)}, sort_keys=True)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class MacroStore:
+    """Macros on disk, one JSON file per task (normalized url and query)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, url: str, query: str) -> str:
+        return os.path.join(self.directory, f"{macro_key(url, query)}.json")
+
+    def load(self, url: str, query: str) -> Optional[Macro]:
+        try:
+            with open(self._path(url, query)) as f:
+                return Macro.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable macro for {url}: {e}")
+            return None
+
+    def save(self, macro: Macro) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(macro.url, macro.query)
+        temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(macro.to_dict(), f, indent=2)
+        os.replace(temporary, path)
+        logger.info(f"Saved macro with {len(macro.steps)} steps for {macro.url}")
+
+
+def store_from_env() -> Optional[MacroStore]:
+    directory = os.getenv(MACRO_DIR_ENV, "").strip()
+    return MacroStore(directory) if directory else None
+
+
+def _resolve_args(step: MacroStep, context: BrowserContext) -> Optional[Dict[str, Any]]:
+    """Arguments of the step for the current page, or None when the step cannot be replayed here."""
+    args = dict(step.args)
+    if step.element is not None:
+        if context.session is None:
+            return None
+        node = HistoryTreeProcessor.find_history_element_in_tree(step.element, context.session.cached_state.element_tree)
+        if node is None or node.highlight_index is None:
+            return None
+        args["index"] = node.highlight_index
+    if step.name == "open_file":
+        # Downloads get a fresh path in every run; match them by file name
+        name = os.path.basename(args.get("file_path", ""))
+        item = next((item for item in context.downloads.items if item.name == name), None)
+        if item is None:
+            return None
+        args["file_path"] = item.fullpath
+    return args
+
+
+def next_macro_message(macro: Macro, history: Sequence[BaseMessage], context: BrowserContext) -> Optional[AIMessage]:
+    """The tool call for the next macro step, or None when the LLM has to (or already did) take over."""
+    calls = [message for message in history if isinstance(message, AIMessage) and message.tool_calls]
+    if any(MACRO_STEP_KEY not in message.additional_kwargs for message in calls):
+        return None
+    position = len(calls)
+    if position >= len(macro.steps):
+        return None
+
+    step = macro.steps[position]
+    if step.name not in REPLAYABLE_TOOLS:
+        logger.info(f"Macro step {position} ({step.name}) is left to the LLM")
+        return None
+    args = _resolve_args(step, context)
+    if args is None:
+        logger.info(f"Macro step {position} ({step.name}) could not be matched on the page, handing over to the LLM")
+        return None
+
+    logger.info(f"Replaying macro step {position}: {step.name}")
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": step.name, "args": args, "id": f"call_{uuid.uuid4().hex[:24]}"}],
+        additional_kwargs={MACRO_STEP_KEY: position},
+    )
@@ -3,7 +3,6 @@ import logging
 import os
 from typing import Any, Dict, Iterator, List, Optional, Type, Sequence
 
-import requests
 from langchain_core.callbacks import CallbackManagerForLLMRun
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
@@ -12,6 +11,8 @@ from langchain_core.tools import BaseTool
 from langchain_core.utils.function_calling import convert_to_openai_tool
 from pydantic import Field
 
+from openoperator.agent.response_cache import ResponseCache, cache_key, get_default_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +27,7 @@ class PollinationsChatModel(BaseChatModel):
     api_key: Optional[str] = Field(default=None, description="Optional Pollinations API key")
     referrer: Optional[str] = Field(default=None, description="Optional referrer for authentication")
     bound_tools: List[Dict[str, Any]] = Field(default_factory=list, description="Tools bound to this model")
+    response_cache: Optional[ResponseCache] = Field(default=None, exclude=True, description="Optional cache of raw API responses")
     
     def __init__(self, **kwargs):
         # Auto-load from environment if not provided
@@ -33,6 +35,8 @@ class PollinationsChatModel(BaseChatModel):
             kwargs['api_key'] = os.getenv('POLLINATIONS_API_KEY')
         if 'referrer' not in kwargs:
             kwargs['referrer'] = os.getenv('POLLINATIONS_REFERRER')
+        if 'response_cache' not in kwargs:
+            kwargs['response_cache'] = get_default_cache()
         super().__init__(**kwargs)
     
     @property
@@ -75,6 +79,7 @@ class PollinationsChatModel(BaseChatModel):
             api_key=self.api_key,
             referrer=self.referrer,
             bound_tools=formatted_tools,
+            response_cache=self.response_cache,
             **kwargs
         )
     
@@ -103,6 +108,7 @@ class PollinationsChatModel(BaseChatModel):
         **kwargs: Any,
     ) -> ChatResult:
         """Generate a response using Pollinations API."""
+        import requests
         
         # Convert messages to Pollinations format
         pollinations_messages = self._convert_messages_to_pollinations_format(messages)
@@ -134,20 +140,27 @@ class PollinationsChatModel(BaseChatModel):
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
         
+        key = cache_key(self.base_url, payload) if self.response_cache is not None else None
+        cached = self.response_cache.get(key) if key is not None else None
+        
         try:
-            logger.debug(f"Making request to Pollinations API with payload: {json.dumps(payload, indent=2)}")
-            
-            response = requests.post(
-                self.base_url,
-                headers=headers,
-                json=payload,
-                timeout=self.timeout,
-                allow_redirects=True
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            logger.debug(f"Received response: {json.dumps(result, indent=2)}")
+            if cached is not None:
+                logger.debug("Serving Pollinations response from cache")
+                result = cached
+            else:
+                logger.debug(f"Making request to Pollinations API with payload: {json.dumps(payload, indent=2)}")
+                
+                response = requests.post(
+                    self.base_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.timeout,
+                    allow_redirects=True
+                )
+                response.raise_for_status()
+                
+                result = response.json()
+                logger.debug(f"Received response: {json.dumps(result, indent=2)}")
             
             # Extract content from response
             if "choices" in result and len(result["choices"]) > 0:
@@ -189,6 +202,10 @@ class PollinationsChatModel(BaseChatModel):
                         content = "I apologize, but I didn't receive a proper response. Let me try again."
                     message = AIMessage(content=content)
                 
+                # Only well-formed responses are cached
+                if key is not None and cached is None:
+                    self.response_cache.set(key, result)
+                
                 generation = ChatGeneration(message=message)
                 return ChatResult(generations=[generation])
             else:
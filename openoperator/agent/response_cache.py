@@ -0,0 +1,137 @@
+"""Content-addressed cache for raw LLM API responses.
+
+Entries are keyed by a hash of the endpoint and the normalized request payload (model, messages,
+bound tools and sampling parameters). Credentials are left out of the key and inline images are
+hashed rather than inlined, so keys stay small and identical screenshots hit the same entry.
+Lookups go through an in-memory LRU first and an optional SQLite file second; both honour the TTL.
+
+The cache is opt-in: set OPENOPERATOR_LLM_CACHE to a file path (or to "memory" for a process-local
+cache) and optionally OPENOPERATOR_LLM_CACHE_TTL to the entry lifetime in seconds. Replays are only
+exact for deterministic requests, so it is meant for temperature 0 runs and regression pipelines.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from openoperator.telemetry.service import metrics
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENV = "OPENOPERATOR_LLM_CACHE"
+LLM_CACHE_TTL_ENV = "OPENOPERATOR_LLM_CACHE_TTL"
+DEFAULT_TTL = 24 * 60 * 60
+
+# Request fields that authenticate rather than describe the request
+EXCLUDED_PAYLOAD_KEYS = ("referrer",)
+
+
+def _normalize(value: Any) -> Any:
+    """Replace data: URLs by their digest so keys do not embed (or depend on the encoding of) images."""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, str) and value.startswith("data:"):
+        return "sha256:" + hashlib.sha256(value.encode()).hexdigest()
+    return value
+
+
+def cache_key(endpoint: str, payload: Dict[str, Any]) -> str:
+    """Stable key of a request: sha256 over the endpoint and the normalized payload."""
+    request = {key: value for key, value in payload.items() if key not in EXCLUDED_PAYLOAD_KEYS}
+    canonical = json.dumps({"endpoint": endpoint, "request": _normalize(request)}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseCache:
+    """In-memory LRU in front of an optional SQLite store, with a time-to-live per entry."""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = DEFAULT_TTL, max_entries: int = 256):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _remember(self, key: str, created: float, response: Dict[str, Any]) -> None:
+        self._memory[key] = (created, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT created, response FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key, *entry)
+            if entry is not None and self._expired(entry[0]):
+                self._delete(key)
+                entry = None
+            if entry is not None:
+                self._memory.move_to_end(key)
+
+        metrics.increment(
+            "openoperator_llm_cache_requests_total",
+            labels={"result": "hit" if entry is not None else "miss"},
+            description="LLM response cache lookups",
+        )
+        return entry[1] if entry is not None else None
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, response)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(response), created),
+                )
+                self._db.commit()
+
+    def _delete(self, key: str) -> None:
+        self._memory.pop(key, None)
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+
+@lru_cache(maxsize=None)
+def get_default_cache() -> Optional[ResponseCache]:
+    """The process-wide cache configured through the environment, or None when caching is off."""
+    location = os.getenv(LLM_CACHE_ENV, "").strip()
+    if not location or location.lower() in ("0", "false", "no", "off"):
+        return None
+    ttl = float(os.getenv(LLM_CACHE_TTL_ENV, DEFAULT_TTL))
+    path = None if location.lower() == "memory" else location
+    logger.info(f"LLM response cache enabled ({path or 'in memory'}, ttl {ttl:.0f}s)")
+    # A TTL of 0 or less keeps entries until they are evicted
+    return ResponseCache(path=path, ttl=ttl if ttl > 0 else None)
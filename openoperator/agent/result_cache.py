@@ -0,0 +1,182 @@
+"""Analysis-level result cache with single-flight coalescing.
+
+Results are keyed by the normalized URL, the normalized query and the model configuration. While a
+run for a key is in flight, identical requests wait for that run instead of starting their own.
+Only completed analyses are stored; failures are shared with the requests that were waiting on
+them but never cached.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_TTL_ENV = "OPENOPERATOR_ANALYSIS_CACHE_TTL"
+DEFAULT_TTL = 300.0
+
+T = TypeVar("T")
+
+# Cache statuses, reported to clients in the X-Cache header
+HIT = "HIT"
+MISS = "MISS"
+COALESCED = "COALESCED"
+BYPASS = "BYPASS"
+
+
+def normalize_url(url: str) -> str:
+    """Lower-case scheme and host, drop default ports and sort the query.
+
+    The path and the fragment are kept: hash-routed single page apps show different pages per fragment.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        # an invalid port is left for the browser to reject, the URL is then only compared as given
+        host = parts.netloc.lower()
+    else:
+        host = (parts.hostname or "").lower()
+        if port and (scheme, port) not in (("http", 80), ("https", 443)):
+            host = f"{host}:{port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, parts.fragment))
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split()).casefold()
+
+
+def analysis_key(url: str, query: str, model_config: Dict[str, Any]) -> str:
+    canonical = json.dumps(
+        {"url": normalize_url(url), "query": normalize_query(query), "model": model_config},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class CacheOptions:
+    """Per-request cache controls.
+
+    Attributes:
+        max_age: Oldest acceptable cached result in seconds (capped by the cache TTL)
+        refresh: Ignore a stored result and run again (the new result replaces it)
+        store: Whether the result of a run may be stored
+        bypass: Skip the cache entirely, including coalescing with in-flight runs
+    """
+
+    max_age: Optional[float] = None
+    refresh: bool = False
+    store: bool = True
+    bypass: bool = False
+
+    @classmethod
+    def from_request(cls, body: Any, cache_control: str = "") -> "CacheOptions":
+        """Read the `cache` field of a request body (an object, or false to bypass) and a Cache-Control header."""
+        options = cls()
+        directives = {}
+        for directive in cache_control.split(","):
+            name, _, value = directive.strip().partition("=")
+            if name:
+                directives[name.lower()] = value
+        if "no-cache" in directives:
+            options.refresh = True
+        if "no-store" in directives:
+            options.store = False
+        if directives.get("max-age", "").isdigit():
+            options.max_age = float(directives["max-age"])
+
+        if body is False:
+            options.bypass = True
+        elif isinstance(body, dict):
+            if body.get("max_age") is not None:
+                options.max_age = float(body["max_age"])
+            options.refresh = bool(body.get("refresh", options.refresh))
+            options.store = bool(body.get("store", options.store))
+            options.bypass = bool(body.get("bypass", options.bypass))
+        return options
+
+
+class AnalysisCache(Generic[T]):
+    """Thread-safe TTL cache whose misses are computed once per key, however many callers ask."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_run(
+        self,
+        key: str,
+        run: Callable[[], T],
+        options: Optional[CacheOptions] = None,
+        cacheable: Callable[[T], bool] = lambda result: True,
+    ) -> Tuple[T, str, float]:
+        """Return (result, cache status, age of the result in seconds), running `run` only when needed."""
+        options = options or CacheOptions()
+        if options.bypass:
+            return run(), BYPASS, 0.0
+
+        max_age = self.ttl if options.max_age is None else min(self.ttl, options.max_age)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not options.refresh:
+                age = time.time() - entry[0]
+                if age <= max_age:
+                    self._entries.move_to_end(key)
+                    return entry[1], HIT, age
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            logger.debug(f"Waiting for in-flight analysis {key[:12]}")
+            return future.result(), COALESCED, 0.0
+
+        try:
+            result = run()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if options.store and self.ttl > 0 and cacheable(result):
+                with self._lock:
+                    self._entries[key] = (time.time(), result)
+                    self._entries.move_to_end(key)
+                    self._evict()
+            future.set_result(result)
+            return result, MISS, 0.0
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _evict(self) -> None:
+        now = time.time()
+        for key in [key for key, (created, _) in self._entries.items() if now - created > self.ttl]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def cache_from_env() -> AnalysisCache:
+    """A cache using OPENOPERATOR_ANALYSIS_CACHE_TTL (seconds, 0 disables storing but keeps coalescing)."""
+    return AnalysisCache(ttl=float(os.getenv(ANALYSIS_CACHE_TTL_ENV, DEFAULT_TTL)))
@@ -0,0 +1,126 @@
+import os
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+DEFAULT_CONFIG = {"configurable": {"temperature": 0.1}, "recursion_limit": 50}
+
+_agent = None
+
+
+def get_agent():
+    """The compiled agent graph, compiled on first use."""
+    global _agent
+    if _agent is None:
+        from openoperator.agent.graph import graph
+        _agent = graph.compile()
+    return _agent
+
+
+@dataclass
+class AnalysisResult:
+    response: Dict[str, Any]
+    # True when the agent submitted a structured answer, False for errors reported as plain text
+    completed: bool
+
+
+def format_response(final_output: Any, url: str) -> AnalysisResult:
+    """Shape the graph's final output into the API response."""
+    if isinstance(final_output, dict):
+        response = {
+            "ops_summary": final_output.get("ops_summary", "Analysis completed"),
+            "answer": final_output.get("answer", "No answer provided"),
+            "sources": final_output.get("sources", [url]),
+            "quotes": final_output.get("quotes", [])
+        }
+        return AnalysisResult(response=response, completed=True)
+    # Handle string output (error cases)
+    response = {
+        "ops_summary": "Analysis completed with basic output",
+        "answer": str(final_output),
+        "sources": [url],
+        "quotes": []
+    }
+    return AnalysisResult(response=response, completed=False)
+
+
+def model_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """The parts of the configuration that change the answer, used to key cached results."""
+    configurable = (config or DEFAULT_CONFIG).get("configurable", {})
+    return {
+        "provider": os.getenv("MODEL_PROVIDER", ""),
+        "model": os.getenv("MODEL", "openai"),
+        "temperature": configurable.get("temperature"),
+    }
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+
+async def run_analysis(url: str,
+                       query: str,
+                       config: Optional[Dict[str, Any]] = None,
+                       run_id: Optional[str] = None
+                       ) -> AnalysisResult:
+    """Run the agent once on `url` for `query`; the response includes the run's timing report.
+
+    When checkpointing is enabled the run is checkpointed under `run_id` (returned in the response),
+    so it can be continued with resume_analysis if it fails.
+    """
+    return await _invoke({"url": url, "query": query}, config, run_id or new_run_id())
+
+
+async def resume_analysis(run_id: str, config: Optional[Dict[str, Any]] = None) -> AnalysisResult:
+    """Continue a checkpointed run from its last completed step. Raises KeyError for unknown runs."""
+    from openoperator.agent.checkpoint import checkpointing_enabled
+
+    if not checkpointing_enabled():
+        raise RuntimeError("Checkpointing is disabled, set OPENOPERATOR_CHECKPOINT_DB to resume runs")
+    return await _invoke(None, config, run_id)
+
+
+async def _invoke(input: Optional[Dict[str, Any]],
+                  config: Optional[Dict[str, Any]],
+                  run_id: str
+                  ) -> AnalysisResult:
+    from openoperator.agent.checkpoint import open_checkpointer
+    from openoperator.agent.graph import graph
+    from openoperator.agent.macros import store_from_env
+    from openoperator.telemetry.callbacks import TimingCallbackHandler
+    from openoperator.telemetry.service import start_run
+
+    config = config or DEFAULT_CONFIG
+    async with open_checkpointer() as checkpointer:
+        if checkpointer is None:
+            agent = get_agent()
+        else:
+            agent = graph.compile(checkpointer=checkpointer)
+            config = {**config, "configurable": {**config.get("configurable", {}), "thread_id": run_id}}
+
+        if input is None:
+            snapshot = await agent.aget_state(config)
+            if not snapshot.values:
+                raise KeyError(run_id)
+            url = snapshot.values.get("url", "")
+            query = snapshot.values.get("query", "")
+        else:
+            url, query = input["url"], input["query"]
+
+        macro_store = store_from_env()
+        if macro_store is not None:
+            macro = macro_store.load(url, query)
+            config = {
+                **config,
+                "configurable": {**config.get("configurable", {}), "macro_store": macro_store, "macro": macro},
+            }
+
+        with start_run() as run:
+            run_config = {**config, "callbacks": [*config.get("callbacks", []), TimingCallbackHandler(run)]}
+            result = await agent.ainvoke(input, config=run_config)
+
+    analysis = format_response(result.get("final_output", "No output available."), url)
+    analysis.response["timings"] = run.report()
+    if checkpointer is not None:
+        analysis.response["run_id"] = run_id
+    return analysis
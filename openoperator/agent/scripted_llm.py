@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import BaseTool
+from pydantic import Field
+
+logger = logging.getLogger(__name__)
+
+# A scripted step is either a tool call ({"name": ..., "args": {...}}) or a callable that
+# receives the prompt messages and returns one, e.g. to pick an element index from the last screen.
+ScriptStep = Union[Dict[str, Any], Callable[[List[BaseMessage]], Dict[str, Any]]]
+
+BROWSER_TOOL_DEFAULTS = {
+    "browser_state_description": "scripted step",
+    "relevant_data": "",
+    "reasoning": "scripted step",
+}
+
+
+def browser_call(name: str, **args: Any) -> Dict[str, Any]:
+    """Tool call for a browser tool, with the bookkeeping arguments every browser tool requires."""
+    return {"name": name, "args": {**BROWSER_TOOL_DEFAULTS, **args}}
+
+
+def submit_call(answer: str, sources: Optional[List[str]] = None) -> Dict[str, Any]:
+    return {
+        "name": "submit_result",
+        "args": {"ops_summary": "scripted run", "answer": answer, "sources": sources or [], "quotes": []},
+    }
+
+
+def think_call(note: str) -> Dict[str, Any]:
+    """A `think` call. It does not advance the script, so a callable step returning it is retried on the next step."""
+    return {
+        "name": "think",
+        "args": {"current_situation": note, "analysis": note, "next_steps": note, "tools_to_call": ""},
+    }
+
+
+def message_texts(messages: Sequence[BaseMessage]) -> List[str]:
+    """Plain text of every message, including the text parts of multimodal contents."""
+    texts = []
+    for message in messages:
+        if isinstance(message.content, str):
+            texts.append(message.content)
+        else:
+            texts.extend(part.get("text", "") if isinstance(part, dict) else str(part) for part in message.content)
+    return texts
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic chat model that replays a fixed script of tool calls.
+
+    The graph asks the model for one tool call per agent step; the step to replay is derived from the
+    number of tool-calling AI messages already in the prompt, so the model itself is stateless and a
+    single instance can drive concurrent runs. Once the script is exhausted the model raises an error
+    through the `raise_error` tool, which ends the run.
+    """
+
+    steps: List[Any] = Field(default_factory=list, description="Scripted tool calls or callables returning one")
+    model_name: str = Field(default="scripted", description="Model name reported in traces")
+
+    @classmethod
+    def from_recording(cls, path: str) -> "ScriptedChatModel":
+        """Model replaying the tool calls of a recorded session (a HAR recorded by BrowserContext or its actions file)."""
+        from openoperator.browser.context import recorded_actions_path
+
+        if path.endswith(".har"):
+            path = recorded_actions_path(path)
+        with open(path) as f:
+            recording = json.load(f)
+        steps = [{"name": action["name"], "args": action["args"]} for action in recording["actions"]]
+        return cls(steps=steps, model_name=f"recording:{os.path.basename(path)}")
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Sequence[BaseTool], **kwargs: Any) -> "ScriptedChatModel":
+        # The script already names the tools; there is nothing to bind
+        return self
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        position = sum(1 for message in messages if isinstance(message, AIMessage) and message.tool_calls)
+        if position < len(self.steps):
+            step = self.steps[position]
+            call = step(messages) if callable(step) else step
+        else:
+            logger.warning(f"Scripted model exhausted after {len(self.steps)} steps")
+            call = {"name": "raise_error", "args": {"error_message": "Script exhausted"}}
+
+        message = AIMessage(
+            content="",
+            tool_calls=[{"name": call["name"], "args": call.get("args", {}), "id": f"call_{uuid.uuid4().hex[:24]}"}],
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
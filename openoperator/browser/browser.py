@@ -2,18 +2,21 @@
 Playwright browser on steroids.
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 from dataclasses import dataclass, field
-
-from playwright._impl._api_structures import ProxySettings
-from playwright.async_api import Browser as PlaywrightBrowser
-from playwright.async_api import (
-	Playwright,
-	async_playwright,
-)
+from typing import TYPE_CHECKING
 
 from openoperator.browser.context import BrowserContext, BrowserContextConfig
+from openoperator.browser.http_cache import HttpCacheConfig, http_cache_from_env, shared_http_cache
+from openoperator.browser.scheduler import DomainScheduler, SchedulerConfig
+
+if TYPE_CHECKING:
+	from playwright._impl._api_structures import ProxySettings
+	from playwright.async_api import Browser as PlaywrightBrowser
+	from playwright.async_api import Playwright
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +45,14 @@ class BrowserConfig:
 		chrome_instance_path: None
 			Path to a Chrome instance to use to connect to your normal browser
 			e.g. '/Applications/Google\ Chrome.app/Contents/MacOS/Google\ Chrome'
+
+		scheduler: None
+			Per-domain navigation limits shared by all contexts of the browser (see SchedulerConfig).
+			None disables scheduling
+
+		http_cache: from OPENOPERATOR_HTTP_CACHE_DIR
+			Disk-backed cache for stylesheets, scripts, fonts and images shared by all contexts of the
+			process (see HttpCacheConfig). None disables it
 	"""
 
 	headless: bool = False
@@ -53,6 +64,8 @@ class BrowserConfig:
 
 	proxy: ProxySettings | None = field(default=None)
 	new_context_config: BrowserContextConfig = field(default_factory=BrowserContextConfig)
+	scheduler: SchedulerConfig | None = None
+	http_cache: HttpCacheConfig | None = field(default_factory=http_cache_from_env)
 
 
 class Browser:
@@ -71,6 +84,10 @@ class Browser:
 		self.config = config
 		self.playwright: Playwright | None = None
 		self.playwright_browser: PlaywrightBrowser | None = None
+		self.scheduler = DomainScheduler(config.scheduler) if config.scheduler else None
+		self.http_cache = shared_http_cache(config.http_cache) if config.http_cache else None
+		# Contexts of concurrent runs may ask for the browser at the same time; only one may launch it
+		self._init_lock = asyncio.Lock()
 
 		self.disable_security_args = []
 		if self.config.disable_security:
@@ -89,12 +106,17 @@ class Browser:
 	async def get_playwright_browser(self) -> PlaywrightBrowser:
 		"""Get a browser context"""
 		if self.playwright_browser is None:
-			return await self._init()
+			async with self._init_lock:
+				if self.playwright_browser is None:
+					return await self._init()
 
 		return self.playwright_browser
 
 	async def _init(self):
 		"""Initialize the browser session"""
+		# Playwright is only imported once a browser is actually needed
+		from playwright.async_api import async_playwright
+
 		playwright = await async_playwright().start()
 		browser = await self._setup_browser(playwright)
 
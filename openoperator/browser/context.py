@@ -2,6 +2,8 @@
 Playwright browser on steroids.
 """
 
+from __future__ import annotations
+
 import asyncio
 import base64
 import json
@@ -10,29 +12,71 @@ import os
 import re
 import time
 import uuid
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Optional, TypedDict
-
-from playwright.async_api import Browser as PlaywrightBrowser
-from playwright.async_api import (
-	BrowserContext as PlaywrightBrowserContext,
-	Download,
-	ElementHandle,
-	FrameLocator,
-	Page,
-)
-
-from openoperator.browser.views import BrowserError, BrowserState, TabInfo
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Literal, Optional, TypedDict, TypeVar
+
+from openoperator.browser.views import BrowserError, BrowserState, PageProbe, TabInfo
+from openoperator.browser.dom.history_tree_processor.service import HistoryTreeProcessor
+from openoperator.browser.dom.accessibility import AccessibilityDomService
 from openoperator.browser.dom.service import DomService
+from openoperator.browser.dom.snapshot import SnapshotDomService
 from openoperator.browser.dom.views import DOMElementNode, SelectorMap
-from openoperator.utils import time_execution_sync
+from openoperator.telemetry.service import capture, record_span, record_value
+from openoperator.telemetry.views import BrowserNavigationEvent
+from openoperator.utils import time_execution_async
 from openoperator.browser.downloads import DownloadsRegistry, DownloadedItem
+from openoperator.browser.storage_state import StorageStatePersister, StorageStateStore
 
 if TYPE_CHECKING:
+	from playwright.async_api import Browser as PlaywrightBrowser
+	from playwright.async_api import (
+		BrowserContext as PlaywrightBrowserContext,
+		ElementHandle,
+		Frame,
+		Page,
+	)
+
 	from openoperator.browser.browser import Browser
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+REMOVE_HIGHLIGHTS_JS = """
+try {
+	// Clear the highlight layer; the empty layer stays in the page and is reused by the next capture
+	const container = document.getElementById('playwright-highlight-container');
+	if (container) {
+		container.replaceChildren();
+	}
+} catch (e) {
+	console.error('Failed to remove highlights:', e);
+}
+"""
+
+# Removes highlights and reads everything the state needs from the page in one round trip
+PAGE_PROBE_JS = f"""
+() => {{
+	{REMOVE_HIGHLIGHTS_JS}
+	const scrollY = window.scrollY;
+	return {{
+		title: document.title,
+		scrollY: scrollY,
+		viewportHeight: window.innerHeight,
+		totalHeight: document.documentElement.scrollHeight,
+	}};
+}}
+"""
+
+
+# DomService implementation per BrowserContextConfig.dom_capture_backend
+DOM_CAPTURE_BACKENDS: dict[str, type[DomService]] = {
+	'js': DomService,
+	'snapshot': SnapshotDomService,
+	'accessibility': AccessibilityDomService,
+}
+
 
 class BrowserContextWindowSize(TypedDict):
 	width: int
@@ -48,6 +92,20 @@ class BrowserContextConfig:
 		cookies_file: None
 			Path to cookies file for persistence
 
+		storage_state_path: None
+			Path to a Playwright storage state file (cookies and local storage) that is loaded when the context is
+			created and saved back while it is used. Takes precedence over cookies_file
+
+		identity: None
+			Name of a logged-in identity in storage_state_dir whose storage state the context loads and saves,
+			so pooled contexts can each use a different account. Takes precedence over storage_state_path
+
+		storage_state_dir: '.auth'
+			Directory of the storage state files of identities (see StorageStateStore)
+
+		storage_save_delay: 2.0
+			Seconds by which saves of the storage state are debounced; the state is always saved on close
+
 	        disable_security: False
 	                Disable browser security features
 
@@ -87,14 +145,41 @@ class BrowserContextConfig:
 		highlight_elements: True
 			Highlight elements in the DOM on the screen
 
+		dom_capture_backend: 'js'
+			How the page's elements are captured: 'js' walks the DOM with buildDomTree.js, 'snapshot' reads a CDP
+			DOMSnapshot in one call and decides visibility and interactivity in Python (see
+			openoperator.browser.dom.snapshot), 'accessibility' lists the interactive nodes of the accessibility
+			tree only, for faster captures and smaller prompts on app-like pages (see
+			openoperator.browser.dom.accessibility). The CDP backends are Chromium only.
+
 		viewport_expansion: 500
 			Viewport expansion in pixels. This amount will increase the number of elements which are included in the state what the LLM will see. If set to -1, all elements will be included (this leads to high token usage). If set to 0, only the elements which are visible in the viewport will be included.
 
 		downloads_path: str
 			Path to save downloaded files. Defaults to 'downloads' in the current directory.
+
+		prompt_token_budget: 3000
+			Approximate number of tokens the list of interactive elements may take in a tool result. The elements
+			most relevant to the task (see openoperator.browser.dom.ranking) are listed first, the rest can be
+			listed with the expand_elements tool. 0 lists all elements.
+
+		record_har_path: None
+			Record all network traffic of the context to this HAR file (written when the context closes), and the
+			agent's actions next to it (see recorded_actions_path). Not available when attaching to an existing context.
+
+		replay_har_path: None
+			Serve every request from this HAR file instead of the network, for offline, deterministic re-runs of a
+			recorded session. Navigations are not rate limited by the browser's scheduler while replaying.
+
+		replay_not_found: 'abort'
+			What happens to requests missing from the replayed HAR: 'abort' fails them, 'fallback' sends them to the network.
 	"""
 
 	cookies_file: str | None = None
+	storage_state_path: str | None = None
+	identity: str | None = None
+	storage_state_dir: str = '.auth'
+	storage_save_delay: float = 2.0
 	minimum_wait_page_load_time: float = 0.5
 	wait_for_network_idle_page_load_time: float = 1
 	maximum_wait_page_load_time: float = 5
@@ -113,8 +198,19 @@ class BrowserContextConfig:
 	)
 
 	highlight_elements: bool = True
+	dom_capture_backend: Literal['js', 'snapshot', 'accessibility'] = 'js'
 	viewport_expansion: int = 500
 	downloads_path: str = 'downloads'
+	prompt_token_budget: int = 3000
+
+	record_har_path: str | None = None
+	replay_har_path: str | None = None
+	replay_not_found: Literal['abort', 'fallback'] = 'abort'
+
+
+def recorded_actions_path(har_path: str) -> str:
+	"""File the actions of a recorded session are written to, next to its HAR: session.har -> session.actions.json."""
+	return os.path.splitext(har_path)[0] + '.actions.json'
 
 
 @dataclass
@@ -129,18 +225,32 @@ class BrowserContext:
 		self,
 		browser: 'Browser',
 		config: BrowserContextConfig = BrowserContextConfig(),
-		downloads: DownloadsRegistry = DownloadsRegistry()
+		downloads: Optional[DownloadsRegistry] = None
 	):
 		self.context_id = str(uuid.uuid4())
 		logger.debug(f'Initializing new browser context with id: {self.context_id}')
 
 		self.config = config
 		self.browser = browser
-		self.downloads = downloads
+		self.downloads = downloads if downloads is not None else DownloadsRegistry()
 
 		# Initialize these as None - they'll be set up when needed
 		self.session: BrowserSession | None = None
 
+		# Page to open when the session starts, e.g. for a context restored from a checkpoint
+		self.restore_url: str | None = None
+
+		# Durations of the phases of the last state capture, in seconds
+		self.state_timings: dict[str, float] = {}
+
+		self._storage = self._create_storage_persister()
+
+		# Tool calls of the agent and their target elements (see record_action)
+		self.recorded_actions: list[dict[str, Any]] = []
+
+		# The user's query, which the elements listed to the LLM are ranked against
+		self.task_query: str = ''
+
 	async def __aenter__(self):
 		"""Async context manager entry"""
 		await self._initialize_session()
@@ -160,6 +270,7 @@ class BrowserContext:
 				return
 
 			await self.save_cookies()
+			self._save_recorded_actions()
 
 			if self.config.trace_path:
 				try:
@@ -174,6 +285,46 @@ class BrowserContext:
 		finally:
 			self.session = None
 
+	def _create_storage_persister(self) -> StorageStatePersister | None:
+		if self.config.identity:
+			path = StorageStateStore(self.config.storage_state_dir).path(self.config.identity)
+			return StorageStatePersister(path, save_delay=self.config.storage_save_delay)
+		if self.config.storage_state_path:
+			return StorageStatePersister(self.config.storage_state_path, save_delay=self.config.storage_save_delay)
+		if self.config.cookies_file:
+			return StorageStatePersister(self.config.cookies_file, cookies_only=True, save_delay=self.config.storage_save_delay)
+		return None
+
+	def record_action(self, name: str, args: dict[str, Any]):
+		"""
+		Remember a tool call of the agent, with the element it targets as it appeared in the last state.
+
+		Used for macros (openoperator.agent.macros) and saved next to the HAR when recording.
+		"""
+		element = None
+		url = None
+		if self.session is not None:
+			url = self.session.current_page.url
+			node = self.session.cached_state.selector_map.get(args.get('index')) if 'index' in args else None
+			if node is not None:
+				element = HistoryTreeProcessor.convert_dom_element_to_history_element(node)
+		self.recorded_actions.append({'name': name, 'args': args, 'url': url, 'element': element})
+
+	def _save_recorded_actions(self):
+		if not self.config.record_har_path:
+			return
+		path = recorded_actions_path(self.config.record_har_path)
+		try:
+			os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+			with open(path, 'w') as f:
+				actions = [
+					{**action, 'element': action['element'] and action['element'].to_dict()} for action in self.recorded_actions
+				]
+				json.dump({'har': os.path.basename(self.config.record_har_path), 'actions': actions}, f, indent=2)
+			logger.info(f'Recorded {len(self.recorded_actions)} actions to {path}')
+		except Exception as e:
+			logger.warning(f'Failed to save recorded actions: {e}')
+
 	def __del__(self):
 		"""Cleanup when object is destroyed"""
 		if self.session is not None:
@@ -220,6 +371,15 @@ class BrowserContext:
 			current_page=page,
 			cached_state=initial_state,
 		)
+
+		if self.restore_url:
+			url, self.restore_url = self.restore_url, None
+			logger.info(f'Restoring page {url}')
+			try:
+				await self.navigate_to(url)
+			except Exception as e:
+				logger.warning(f'Failed to restore page {url}: {e}')
+
 		return self.session
 
 	def _add_new_page_listener(self, context: PlaywrightBrowserContext):
@@ -227,17 +387,24 @@ class BrowserContext:
 			await page.wait_for_load_state()
 			logger.debug(f'New page opened: {page.url}')
 
-			# Add PDF route handler
+			# Add PDF route handler. Only documents can be PDFs to download; everything else falls back to
+			# the context routes (shared HTTP cache, HAR replay) or the network
 			async def handle_route(route):
-				response = await route.fetch()
+				if route.request.resource_type != 'document':
+					await route.fallback()
+					return
+				# Redirects are left to the browser, so that the page URL and relative links follow them
+				response = await route.fetch(max_redirects=0)
 				if 'content-type' in response.headers and response.headers['content-type'].lower() == 'application/pdf':
 					headers = {**response.headers, 'Content-Disposition': 'attachment'}
 					await route.fulfill(response=response, headers=headers)
 				else:
-					await route.continue_()
+					await route.fallback()
 
-			# Set up route handler for PDFs
-			await page.route("**/*", handle_route)
+			# Set up route handler for PDFs. Page routes take precedence over the context's HAR route,
+			# so it is left out while replaying and the recorded responses are served as they are
+			if not self.config.replay_har_path:
+				await page.route("**/*", handle_route)
 			
 			async def handle_download_event(download):
 				try:
@@ -304,12 +471,19 @@ class BrowserContext:
 		return session.current_page
 
 	async def _create_context(self, browser: PlaywrightBrowser):
-		"""Creates a new browser context with anti-detection measures and loads cookies if available."""
+		"""Creates a new browser context with anti-detection measures and loads the saved storage state if available."""
+		storage_state = await self._storage.load() if self._storage is not None else None
+
 		if self.browser.config.cdp_url and len(browser.contexts) > 0:
 			context = browser.contexts[0]
+			# An existing context was not created with the saved state; only its cookies can be added
+			if storage_state:
+				await context.add_cookies(storage_state.get('cookies', []))
 		elif self.browser.config.chrome_instance_path and len(browser.contexts) > 0:
 			# Connect to existing Chrome instance instead of creating new one
 			context = browser.contexts[0]
+			if storage_state:
+				await context.add_cookies(storage_state.get('cookies', []))
 		else:
 			# Create downloads directory if it doesn't exist
 			os.makedirs(self.config.downloads_path, exist_ok=True)
@@ -324,18 +498,21 @@ class BrowserContext:
 				ignore_https_errors=self.config.disable_security,
 				record_video_dir=self.config.save_recording_path,
 				locale=self.config.locale,
-				accept_downloads=True  # Enable download handling
+				accept_downloads=True,  # Enable download handling
+				storage_state=storage_state,
+				record_har_path=self.config.record_har_path,
+				# Embedded bodies keep the recording a single self-contained file
+				record_har_content='embed' if self.config.record_har_path else None,
 			)
 
 		if self.config.trace_path:
 			await context.tracing.start(screenshots=True, snapshots=True, sources=True)
 
-		# Load cookies if they exist
-		if self.config.cookies_file and os.path.exists(self.config.cookies_file):
-			with open(self.config.cookies_file, 'r') as f:
-				cookies = json.load(f)
-				logger.info(f'Loaded {len(cookies)} cookies from {self.config.cookies_file}')
-				await context.add_cookies(cookies)
+		if self.config.replay_har_path:
+			logger.info(f'Replaying network traffic from {self.config.replay_har_path}')
+			await context.route_from_har(self.config.replay_har_path, not_found=self.config.replay_not_found)
+		elif self.browser.http_cache is not None:
+			await self.browser.http_cache.attach(context)
 
 		# Expose anti-detection scripts
 		await context.add_init_script(
@@ -545,6 +722,7 @@ class BrowserContext:
 
 		logger.debug(f'Network stabilized for {self.config.wait_for_network_idle_page_load_time} seconds')
 
+	@time_execution_async('--network_wait', kind='browser')
 	async def _wait_for_page_and_frames_load(self, timeout_overwrite: float | None = None):
 		"""
 		Ensures page is fully loaded before continuing.
@@ -572,11 +750,27 @@ class BrowserContext:
 		if remaining > 0:
 			await asyncio.sleep(remaining)
 
+	@asynccontextmanager
+	async def _navigation_slot(self, url: str) -> AsyncIterator[None]:
+		"""Wait for the browser's per-domain scheduler, if any, before navigating to `url`."""
+		scheduler = self.browser.scheduler
+		if scheduler is None or self.config.replay_har_path:
+			yield
+			return
+		async with scheduler.slot(url, job_id=self.context_id):
+			yield
+
 	async def navigate_to(self, url: str):
 		"""Navigate to a URL"""
 		page = await self.get_current_page()
-		await page.goto(url)
-		await page.wait_for_load_state()
+		try:
+			async with self._navigation_slot(url):
+				await page.goto(url)
+				await page.wait_for_load_state()
+		except Exception as e:
+			capture(BrowserNavigationEvent(url=url, success=False, error=str(e)))
+			raise
+		capture(BrowserNavigationEvent(url=url, success=True))
 
 	async def refresh_page(self):
 		"""Refresh the current page"""
@@ -618,28 +812,34 @@ class BrowserContext:
 		page = await self.get_current_page()
 		return await page.evaluate(script)
 
-	@time_execution_sync('--get_state')  # This decorator might need to be updated to handle async
+	@time_execution_async('--get_state', kind='browser')
 	async def get_state(self, use_vision: bool = True) -> BrowserState:
 		"""Get the current state of the browser"""
 		await self._wait_for_page_and_frames_load()
 		session = await self.get_session()
 		session.cached_state = await self._update_state(use_vision=use_vision)
 
-		# Save cookies if a file is specified
-		if self.config.cookies_file:
-			asyncio.create_task(self.save_cookies())
+		# Persist cookies and local storage; saves are debounced and skipped when nothing changed
+		if self._storage is not None:
+			self._storage.schedule_save(session.context)
 
 		return session.cached_state
 
 	async def _update_state(self, use_vision: bool = True, focus_element: int = -1) -> BrowserState:
-		"""Update and return state."""
+		"""
+		Update and return state.
+
+		Capture is pipelined: the page probe runs first, then the DOM capture and tab titles run
+		concurrently, then the screenshot. Per-phase durations are kept in `state_timings`.
+		"""
+		start_time = time.perf_counter()
+		self.state_timings = {}
 		session = await self.get_session()
 
-		# Check if current page is still valid, if not switch to another available page
+		# The probe doubles as a liveness check: if it fails, switch to another available page
 		try:
 			page = await self.get_current_page()
-			# Test if page is still accessible
-			await page.evaluate('1')
+			probe = await self._timed_phase('probe', self._probe_page(page))
 		except Exception as e:
 			logger.debug(f'Current page is no longer accessible: {str(e)}')
 			# Get all available pages
@@ -647,34 +847,45 @@ class BrowserContext:
 			if pages:
 				session.current_page = pages[-1]
 				page = session.current_page
-				logger.debug(f'Switched to page: {await page.title()}')
+				probe = await self._timed_phase('probe', self._probe_page(page))
+				logger.debug(f'Switched to page: {probe.title}')
 			else:
 				raise BrowserError('Browser closed: no valid pages available')
 
 		try:
-			await self.remove_highlights()
-			dom_service = DomService(page)
-			content = await dom_service.get_clickable_elements(
-				focus_element=focus_element,
-				viewport_expansion=self.config.viewport_expansion,
-				highlight_elements=self.config.highlight_elements,
+			dom_service = DOM_CAPTURE_BACKENDS[self.config.dom_capture_backend](page)
+			# Tab titles live in other renderers, so they are fetched while the DOM is walked.
+			# The screenshot has to wait for the DOM capture because it draws the highlights.
+			content, tabs = await asyncio.gather(
+				self._timed_phase(
+					'dom_capture',
+					dom_service.get_clickable_elements(
+						focus_element=focus_element,
+						viewport_expansion=self.config.viewport_expansion,
+						highlight_elements=self.config.highlight_elements,
+					),
+				),
+				self._timed_phase('tabs', self.get_tabs_info(current_title=probe.title)),
 			)
 
 			screenshot_b64 = None
 			if use_vision:
-				screenshot_b64 = await self.take_screenshot()
-			pixels_above, pixels_below = await self.get_scroll_info(page)
+				screenshot_b64 = await self._timed_phase('screenshot', self.take_screenshot())
 			self.current_state = BrowserState(
 				element_tree=content.element_tree,
 				selector_map=content.selector_map,
-				url=page.url,
-				title=await page.title(),
-				tabs=await self.get_tabs_info(),
+				url=probe.url,
+				title=probe.title,
+				tabs=tabs,
 				screenshot=screenshot_b64,
-				pixels_above=pixels_above,
-				pixels_below=pixels_below
+				pixels_above=probe.pixels_above,
+				pixels_below=probe.pixels_below,
 			)
 
+			self.state_timings['total'] = time.perf_counter() - start_time
+			logger.debug(
+				'--State captured in ' + ', '.join(f'{phase}: {seconds:.3f}s' for phase, seconds in self.state_timings.items())
+			)
 			return self.current_state
 		except Exception as e:
 			logger.error(f'Failed to update state: {str(e)}')
@@ -683,6 +894,27 @@ class BrowserContext:
 				return self.current_state
 			raise
 
+	async def _timed_phase(self, phase: str, awaitable: Awaitable[T]) -> T:
+		"""Await a state capture phase and record its duration in `state_timings` and as a span."""
+		start_time = time.perf_counter()
+		try:
+			return await awaitable
+		finally:
+			self.state_timings[phase] = time.perf_counter() - start_time
+			record_span(phase, 'browser', start_time, self.state_timings[phase])
+
+	async def _probe_page(self, page: Page) -> PageProbe:
+		"""
+		Removes leftover highlights and collects title and scroll metrics with a single evaluate.
+		"""
+		data = await page.evaluate(PAGE_PROBE_JS)
+		return PageProbe(
+			url=page.url,
+			title=data['title'],
+			pixels_above=data['scrollY'],
+			pixels_below=data['totalHeight'] - (data['scrollY'] + data['viewportHeight']),
+		)
+
 	# region - Browser Actions
 
 	async def take_screenshot(self, full_page: bool = True) -> str:
@@ -696,6 +928,7 @@ class BrowserContext:
 			animations='disabled',
 		)
 
+		record_value('screenshot_bytes', len(screenshot))
 		screenshot_b64 = base64.b64encode(screenshot).decode('utf-8')
 
 		# await self.remove_highlights()
@@ -709,25 +942,7 @@ class BrowserContext:
 		"""
 		try:
 			page = await self.get_current_page()
-			await page.evaluate(
-				"""
-                try {
-                    // Remove the highlight container and all its contents
-                    const container = document.getElementById('playwright-highlight-container');
-                    if (container) {
-                        container.remove();
-                    }
-
-                    // Remove highlight attributes from elements
-                    const highlightedElements = document.querySelectorAll('[browser-user-highlight-id^="playwright-highlight-"]');
-                    highlightedElements.forEach(el => {
-                        el.removeAttribute('browser-user-highlight-id');
-                    });
-                } catch (e) {
-                    console.error('Failed to remove highlights:', e);
-                }
-                """
-			)
+			await page.evaluate(REMOVE_HIGHLIGHTS_JS)
 		except Exception as e:
 			logger.debug(f'Failed to remove highlights (this is usually ok): {str(e)}')
 			# Don't raise the error since this is not critical functionality
@@ -884,37 +1099,43 @@ class BrowserContext:
 			tag_name = element.tag_name or '*'
 			return f"{tag_name}[highlight_index='{element.highlight_index}']"
 
-	async def get_locate_element(self, element: DOMElementNode) -> ElementHandle | None:
-		current_frame = await self.get_current_page()
-
-		# Start with the target element and collect all parents
-		parents: list[DOMElementNode] = []
-		current = element
-		while current.parent is not None:
-			parent = current.parent
-			parents.append(parent)
-			current = parent
-
-		# Reverse the parents list to process from top to bottom
-		parents.reverse()
-
-		# Process all iframe parents in sequence
-		iframes = [item for item in parents if item.tag_name == 'iframe']
-		for parent in iframes:
-			css_selector = self._enhanced_css_selector_for_element(parent)
-			current_frame = current_frame.frame_locator(css_selector)
+	async def get_element_frame(self, element: DOMElementNode) -> Page | Frame:
+		"""
+		The frame holding the element. Frames are resolved through the element's iframe ancestors on first use
+		and cached on the current snapshot by frame id, so tools do not have to search page.frames.
+		"""
+		page = await self.get_current_page()
+		if element.frame_id is None:
+			return page
+
+		frames = self.session.cached_state.frames if self.session is not None else {}
+		frame = frames.get(element.frame_id)
+		if frame is not None and not frame.is_detached():
+			return frame
+
+		owner = element.parent
+		while owner is not None and owner.tag_name != 'iframe':
+			owner = owner.parent
+		if owner is None:
+			return page
+		parent_frame = await self.get_element_frame(owner)
+		handle = await parent_frame.query_selector(self._enhanced_css_selector_for_element(owner))
+		frame = await handle.content_frame() if handle is not None else None
+		if frame is None:
+			raise BrowserError(f'Frame {element.frame_id} of element <{element.tag_name}> not found')
+		frames[element.frame_id] = frame
+		return frame
 
+	async def get_locate_element(self, element: DOMElementNode) -> ElementHandle | None:
 		css_selector = self._enhanced_css_selector_for_element(element)
 
 		try:
-			if isinstance(current_frame, FrameLocator):
-				return await current_frame.locator(css_selector).element_handle()
-			else:
-				# Try to scroll into view if hidden
-				element_handle = await current_frame.query_selector(css_selector)
-				if element_handle:
-					await element_handle.scroll_into_view_if_needed()
-					return element_handle
+			frame = await self.get_element_frame(element)
+			# Try to scroll into view if hidden
+			element_handle = await frame.query_selector(css_selector)
+			if element_handle:
+				await element_handle.scroll_into_view_if_needed()
+			return element_handle
 		except Exception as e:
 			logger.error(f'Failed to locate element: {str(e)}')
 			return None
@@ -970,16 +1191,23 @@ class BrowserContext:
 		except Exception as e:
 			raise Exception(f'Failed to click element: {repr(element_node)}. Error: {str(e)}')
 
-	async def get_tabs_info(self) -> list[TabInfo]:
-		"""Get information about all tabs"""
+	async def get_tabs_info(self, current_title: str | None = None) -> list[TabInfo]:
+		"""
+		Get information about all tabs.
+
+		Titles are fetched concurrently; pass `current_title` when it is already known
+		to skip the round trip for the current page.
+		"""
 		session = await self.get_session()
+		pages = session.context.pages
 
-		tabs_info = []
-		for page_id, page in enumerate(session.context.pages):
-			tab_info = TabInfo(page_id=page_id, url=page.url, title=await page.title())
-			tabs_info.append(tab_info)
+		async def get_title(page: Page) -> str:
+			if current_title is not None and page is session.current_page:
+				return current_title
+			return await page.title()
 
-		return tabs_info
+		titles = await asyncio.gather(*(get_title(page) for page in pages))
+		return [TabInfo(page_id=page_id, url=page.url, title=title) for page_id, (page, title) in enumerate(zip(pages, titles))]
 
 	async def switch_to_tab(self, page_id: int) -> None:
 		"""Switch to a specific tab by its page_id
@@ -1009,8 +1237,9 @@ class BrowserContext:
 		page = await self.get_current_page()
 
 		if url:
-			await page.goto(url)
-			await self._wait_for_page_and_frames_load(timeout_overwrite=1)
+			async with self._navigation_slot(url):
+				await page.goto(url)
+				await self._wait_for_page_and_frames_load(timeout_overwrite=1)
 
 	# endregion
 
@@ -1028,21 +1257,9 @@ class BrowserContext:
 		return selector_map[index]
 
 	async def save_cookies(self):
-		"""Save current cookies to file"""
-		if self.session and self.session.context and self.config.cookies_file:
-			try:
-				cookies = await self.session.context.cookies()
-				logger.info(f'Saving {len(cookies)} cookies to {self.config.cookies_file}')
-
-				# Check if the path is a directory and create it if necessary
-				dirname = os.path.dirname(self.config.cookies_file)
-				if dirname:
-					os.makedirs(dirname, exist_ok=True)
-
-				with open(self.config.cookies_file, 'w') as f:
-					json.dump(cookies, f)
-			except Exception as e:
-				logger.warning(f'Failed to save cookies: {str(e)}')
+		"""Save the current cookies (and local storage, unless only a cookies file is configured) right away"""
+		if self.session and self.session.context and self._storage is not None:
+			await self._storage.flush(self.session.context)
 
 	async def is_file_uploader(self, element_node: DOMElementNode, max_depth: int = 3, current_depth: int = 0) -> bool:
 		"""Check if element or its children are file uploaders"""
@@ -1073,9 +1290,9 @@ class BrowserContext:
 
 	async def get_scroll_info(self, page: Page) -> tuple[int, int]:
 		"""Get scroll position information for the current page."""
-		scroll_y = await page.evaluate('window.scrollY')
-		viewport_height = await page.evaluate('window.innerHeight')
-		total_height = await page.evaluate('document.documentElement.scrollHeight')
+		scroll_y, viewport_height, total_height = await page.evaluate(
+			'[window.scrollY, window.innerHeight, document.documentElement.scrollHeight]'
+		)
 		pixels_above = scroll_y
 		pixels_below = total_height - (scroll_y + viewport_height)
 		return pixels_above, pixels_below
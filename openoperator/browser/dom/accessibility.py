@@ -0,0 +1,189 @@
+"""
+DOM capture from Chromium's accessibility tree.
+
+Accessibility.getFullAXTree returns the page already pruned to rendered, semantically meaningful nodes
+with their computed roles and accessible names, far fewer nodes than the DOM. The interactive ones
+(by role, or focusable) are resolved to their DOM elements in a single function call, which reads the
+tag, attributes, XPath and box the tools need. The element tree is flat: a body with one element per
+interactive node, whose text is the accessible name. Text outside interactive elements is not listed,
+and occlusion is not checked. Only the main frame is captured. Chromium only.
+"""
+
+import asyncio
+import logging
+from importlib import resources
+from typing import TYPE_CHECKING, Any, Optional
+
+from openoperator.browser.dom.service import DomService
+from openoperator.browser.dom.views import DOMElementNode, DOMTextNode
+
+if TYPE_CHECKING:
+	from playwright.async_api import CDPSession
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE_ROLES = frozenset({
+	'button', 'link', 'textbox', 'searchbox', 'checkbox', 'radio', 'combobox', 'listbox', 'option', 'menuitem',
+	'menuitemcheckbox', 'menuitemradio', 'tab', 'switch', 'slider', 'spinbutton', 'treeitem', 'gridcell',
+	'DisclosureTriangle', 'MenuListPopup', 'MenuListOption', 'PopUpButton', 'ToggleButton',
+})
+FRAME_ROLES = frozenset({'Iframe', 'IframePresentational'})
+# Focusable roots of the document are not elements to act on
+DOCUMENT_ROLES = frozenset({'RootWebArea', 'WebArea'}) | FRAME_ROLES
+
+OBJECT_GROUP = 'openoperator-ax'
+
+# Called on the resolved elements; returns what DOMElementNode needs, with XPaths like buildDomTree.js
+DESCRIBE_ELEMENTS_JS = """
+function (...elements) {
+	function xpath(element) {
+		const segments = [];
+		let current = element;
+		// Stops below shadow roots, like getXPathTree
+		while (current && current.nodeType === Node.ELEMENT_NODE && !(current.parentNode instanceof ShadowRoot)) {
+			segments.unshift(segment(current));
+			current = current.parentNode;
+		}
+		return segments.join('/');
+	}
+	function segment(element) {
+		let index = 0;
+		for (let sibling = element.previousSibling; sibling; sibling = sibling.previousSibling) {
+			if (sibling.nodeType === Node.ELEMENT_NODE && sibling.nodeName === element.nodeName) index++;
+		}
+		return element.nodeName.toLowerCase() + (index > 0 ? `[${index + 1}]` : '');
+	}
+	return elements.map((element) => {
+		const attributes = {};
+		for (const name of element.getAttributeNames()) {
+			attributes[name] = element.getAttribute(name);
+		}
+		const rect = element.getBoundingClientRect();
+		return {
+			tagName: element.tagName.toLowerCase(),
+			xpath: xpath(element),
+			attributes,
+			rect: { x: rect.x, y: rect.y, width: rect.width, height: rect.height },
+		};
+	});
+}
+"""
+
+
+def _value(node: dict, key: str) -> Any:
+	return (node.get(key) or {}).get('value')
+
+
+def _is_interactive(node: dict) -> bool:
+	if node.get('ignored') or 'backendDOMNodeId' not in node:
+		return False
+	role = _value(node, 'role')
+	if role in INTERACTIVE_ROLES:
+		return True
+	focusable = any(prop['name'] == 'focusable' and prop['value'].get('value') for prop in node.get('properties', []))
+	return focusable and role not in DOCUMENT_ROLES
+
+
+def interactive_nodes(ax_nodes: list[dict]) -> list[dict]:
+	"""Interactive, not ignored AX nodes in tree (document) order."""
+	by_id = {node['nodeId']: node for node in ax_nodes}
+	roots = [node for node in ax_nodes if not node.get('parentId') or node['parentId'] not in by_id]
+	ordered: list[dict] = []
+	stack = list(reversed(roots))
+	while stack:
+		node = stack.pop()
+		if _is_interactive(node):
+			ordered.append(node)
+		# Frame documents live in other execution contexts than the page's elements
+		if _value(node, 'role') in FRAME_ROLES:
+			continue
+		stack.extend(by_id[child] for child in reversed(node.get('childIds', [])) if child in by_id)
+	return ordered
+
+
+class AccessibilityDomService(DomService):
+	"""DomService building the element list from the accessibility tree over CDP; see the module docstring."""
+
+	async def _build_dom_tree(
+		self,
+		highlight_elements: bool,
+		focus_element: int,
+		viewport_expansion: int,
+	) -> DOMElementNode:
+		session = await self.page.context.new_cdp_session(self.page)
+		try:
+			tree = await session.send('Accessibility.getFullAXTree')
+			ax_nodes = interactive_nodes(tree['nodes'])
+			elements = await self._describe(session, ax_nodes)
+		finally:
+			await session.detach()
+
+		body = DOMElementNode(tag_name='body', xpath='html/body', attributes={}, children=[], is_visible=True, parent=None)
+		boxes = []
+		for ax_node, element in zip(ax_nodes, elements):
+			rect = element and element['rect']
+			# Rendered but empty boxes cannot be clicked, as in isElementVisible
+			if not rect or rect['width'] <= 0 or rect['height'] <= 0:
+				continue
+			index = len(boxes)
+			node = DOMElementNode(
+				tag_name=element['tagName'],
+				xpath=element['xpath'],
+				attributes=element['attributes'],
+				children=[],
+				is_visible=True,
+				is_interactive=True,
+				is_top_element=True,
+				highlight_index=index,
+				viewport_top=round(rect['y']),
+				parent=body,
+			)
+			if name := str(_value(ax_node, 'name') or '').strip():
+				node.children.append(DOMTextNode(text=name, is_visible=True, parent=node))
+			body.children.append(node)
+			boxes.append({'index': index, 'left': rect['x'], 'top': rect['y'], 'width': rect['width'], 'height': rect['height']})
+
+		if highlight_elements and boxes:
+			if focus_element >= 0:
+				boxes = [box for box in boxes if box['index'] == focus_element]
+			js_code = resources.read_text('openoperator.browser.dom', 'buildDomTree.js')
+			scroll = await self.page.evaluate('() => [window.scrollX, window.scrollY]')
+			for box in boxes:
+				box['left'] += scroll[0]
+				box['top'] += scroll[1]
+			await self.page.evaluate(js_code, {'highlightBoxes': boxes})
+		return body
+
+	@staticmethod
+	async def _describe(session: 'CDPSession', ax_nodes: list[dict]) -> list[Optional[dict]]:
+		"""Tag, XPath, attributes and box of the DOM element of each AX node, or None where it is gone."""
+		if not ax_nodes:
+			return []
+		resolved = await asyncio.gather(
+			*(
+				session.send('DOM.resolveNode', {'backendNodeId': node['backendDOMNodeId'], 'objectGroup': OBJECT_GROUP})
+				for node in ax_nodes
+			),
+			return_exceptions=True,
+		)
+		object_ids = [result['object'].get('objectId') if isinstance(result, dict) else None for result in resolved]
+		present = [object_id for object_id in object_ids if object_id]
+		try:
+			if not present:
+				return [None] * len(ax_nodes)
+			result = await session.send(
+				'Runtime.callFunctionOn',
+				{
+					'functionDeclaration': DESCRIBE_ELEMENTS_JS,
+					'objectId': present[0],
+					'arguments': [{'objectId': object_id} for object_id in present],
+					'returnByValue': True,
+				},
+			)
+		finally:
+			await session.send('Runtime.releaseObjectGroup', {'objectGroup': OBJECT_GROUP})
+		if 'exceptionDetails' in result:
+			logger.debug(f'Failed to describe accessibility nodes: {result["exceptionDetails"].get("text")}')
+			return [None] * len(ax_nodes)
+		described = iter(result['result']['value'])
+		return [next(described) if object_id else None for object_id in object_ids]
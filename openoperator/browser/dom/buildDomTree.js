@@ -1,103 +1,105 @@
 (
     args = { doHighlightElements: true, focusHighlightIndex: -1, viewportExpansion: 0 }
 ) => {
-    const { doHighlightElements, focusHighlightIndex, viewportExpansion } = args;
+    const { doHighlightElements, focusHighlightIndex, viewportExpansion, highlightBoxes } = args;
     let highlightIndex = 0; // Reset highlight index
 
     // Quick check to confirm the script receives focusHighlightIndex
     console.log('focusHighlightIndex:', focusHighlightIndex);
 
-    function highlightElement(element, index, parentIframe = null) {
-        // Create or get highlight container
-        let container = document.getElementById('playwright-highlight-container');
-        if (!container) {
-            container = document.createElement('div');
-            container.id = 'playwright-highlight-container';
-            container.style.position = 'absolute';
-            container.style.pointerEvents = 'none';
-            container.style.top = '0';
-            container.style.left = '0';
-            container.style.width = '100%';
-            container.style.height = '100%';
-            container.style.zIndex = '2147483647'; // Maximum z-index value
-            document.body.appendChild(container);        }
-
-        // Generate a color based on the index
-        const colors = [
-            '#FF0000', '#00FF00', '#0000FF', '#FFA500',
-            '#800080', '#008080', '#FF69B4', '#4B0082',
-            '#FF4500', '#2E8B57', '#DC143C', '#4682B4'
-        ];
-        const colorIndex = index % colors.length;
-        const baseColor = colors[colorIndex];
-        const backgroundColor = `${baseColor}1A`; // 10% opacity version of the color
-
-        // Create highlight overlay
-        const overlay = document.createElement('div');
-        overlay.style.position = 'absolute';
-        overlay.style.border = `2px solid ${baseColor}`;
-        overlay.style.backgroundColor = backgroundColor;
-        overlay.style.pointerEvents = 'none';
-        overlay.style.boxSizing = 'border-box';
-
-        // Position overlay based on element, including scroll position
-        const rect = element.getBoundingClientRect();
-        let top = rect.top + window.scrollY;
-        let left = rect.left + window.scrollX;
+    // Elements to highlight, collected during the traversal and painted in one go afterwards, so the
+    // traversal's layout reads never follow DOM writes (which would force a reflow per element)
+    const pendingHighlights = [];
 
-        // Adjust position if element is inside an iframe
-        if (parentIframe) {
-            const iframeRect = parentIframe.getBoundingClientRect();
-            top += iframeRect.top;
-            left += iframeRect.left;
-        }
+    const HIGHLIGHT_COLORS = [
+        '#FF0000', '#00FF00', '#0000FF', '#FFA500',
+        '#800080', '#008080', '#FF69B4', '#4B0082',
+        '#FF4500', '#2E8B57', '#DC143C', '#4682B4'
+    ];
 
-        overlay.style.top = `${top}px`;
-        overlay.style.left = `${left}px`;
-        overlay.style.width = `${rect.width}px`;
-        overlay.style.height = `${rect.height}px`;
-
-        // Create label
-        const label = document.createElement('div');
-        label.className = 'playwright-highlight-label';
-        label.style.position = 'absolute';
-        label.style.background = baseColor;
-        label.style.color = 'white';
-        label.style.padding = '1px 4px';
-        label.style.borderRadius = '4px';
-        label.style.fontSize = `${Math.min(14, Math.max(10, rect.height / 2))}px`; // Responsive font size
-        label.textContent = index;
-
-        // Calculate label position
-        const labelWidth = 20; // Approximate width
-        const labelHeight = 16; // Approximate height
-
-        // Default position (top-right corner inside the box)
-        let labelTop = top + 2;
-        let labelLeft = left + rect.width - labelWidth - 2;
-
-        // Adjust if box is too small
-        if (rect.width < labelWidth + 4 || rect.height < labelHeight + 4) {
-            // Position outside the box if it's too small
-            labelTop = top - labelHeight - 2;
-            labelLeft = left + rect.width - labelWidth;
-        }
+    function highlightElement(element, index, parentIframe = null) {
+        pendingHighlights.push({ element, index, parentIframe });
+    }
+
+    // Paints all pending highlights on a single SVG layer that is kept in the page and reused by later captures
+    function renderHighlights() {
+        if (pendingHighlights.length === 0) return;
 
+        // Read phase: all layout reads happen before the first write
+        const scrollX = window.scrollX;
+        const scrollY = window.scrollY;
+        const iframeOffsets = new Map();
+        const boxes = pendingHighlights.map(({ element, index, parentIframe }) => {
+            const rect = element.getBoundingClientRect();
+            let top = rect.top + scrollY;
+            let left = rect.left + scrollX;
 
-        label.style.top = `${labelTop}px`;
-        label.style.left = `${labelLeft}px`;
+            // Adjust position if element is inside an iframe
+            if (parentIframe) {
+                if (!iframeOffsets.has(parentIframe)) {
+                    iframeOffsets.set(parentIframe, parentIframe.getBoundingClientRect());
+                }
+                const iframeRect = iframeOffsets.get(parentIframe);
+                top += iframeRect.top;
+                left += iframeRect.left;
+            }
+            return { index, top, left, width: rect.width, height: rect.height };
+        });
+        pendingHighlights.length = 0;
+        paintHighlights(boxes);
+    }
 
-        // Add to container
-        container.appendChild(overlay);
-        container.appendChild(label);
+    // Write phase: one markup string, one DOM write. Boxes are in document coordinates
+    function paintHighlights(boxes) {
+        const markup = [];
+        for (const { index, top, left, width, height } of boxes) {
+            const baseColor = HIGHLIGHT_COLORS[index % HIGHLIGHT_COLORS.length];
+            const fontSize = Math.min(14, Math.max(10, height / 2)); // Responsive font size
+            const labelWidth = 8 + String(index).length * fontSize * 0.6;
+            const labelHeight = fontSize + 2;
+
+            // Default position (top-right corner inside the box), outside the box if it's too small
+            let labelTop = top + 2;
+            let labelLeft = left + width - labelWidth - 2;
+            if (width < labelWidth + 4 || height < labelHeight + 4) {
+                labelTop = top - labelHeight - 2;
+                labelLeft = left + width - labelWidth;
+            }
 
-        // Store reference for cleanup
-        element.setAttribute('browser-user-highlight-id', `playwright-highlight-${index}`);
+            markup.push(
+                `<rect x="${left + 1}" y="${top + 1}" width="${Math.max(0, width - 2)}" height="${Math.max(0, height - 2)}" ` +
+                `fill="${baseColor}1A" stroke="${baseColor}" stroke-width="2"/>`,
+                `<rect x="${labelLeft}" y="${labelTop}" width="${labelWidth}" height="${labelHeight}" rx="4" fill="${baseColor}"/>`,
+                `<text x="${labelLeft + labelWidth / 2}" y="${labelTop + labelHeight / 2}" fill="white" font-size="${fontSize}" ` +
+                `font-family="sans-serif" text-anchor="middle" dominant-baseline="central">${index}</text>`
+            );
+        }
 
-        return index + 1;
+        // Attached to the root element rather than the body, so it is outside the traversed tree and
+        // positioned in document coordinates
+        let layer = document.getElementById('playwright-highlight-container');
+        if (!layer) {
+            layer = document.createElementNS('http://www.w3.org/2000/svg', 'svg');
+            layer.id = 'playwright-highlight-container';
+            layer.setAttribute('width', '1');
+            layer.setAttribute('height', '1');
+            layer.style.cssText = 'position: absolute; top: 0; left: 0; overflow: visible; pointer-events: none; z-index: 2147483647;';
+            document.documentElement.appendChild(layer);
+        }
+        layer.innerHTML = markup.join('');
     }
 
 
+    // Ids of the iframes whose documents are walked, recorded on their nodes so tools can target the frame directly
+    const frameIds = new Map();
+
+    function frameIdOf(iframe) {
+        if (!frameIds.has(iframe)) {
+            frameIds.set(iframe, `frame-${frameIds.size}`);
+        }
+        return frameIds.get(iframe);
+    }
+
     // Helper function to generate XPath as a tree
     function getXPathTree(element, stopAtBoundary = true) {
         const segments = [];
@@ -246,8 +248,7 @@
     }
 
     // Helper function to check if element is visible
-    function isElementVisible(element) {
-        const style = window.getComputedStyle(element);
+    function isElementVisible(element, style = window.getComputedStyle(element)) {
         return element.offsetWidth > 0 &&
             element.offsetHeight > 0 &&
             style.visibility !== 'hidden' &&
@@ -359,28 +360,46 @@
     }
 
     // Helper function to check if text node is visible
+    // Sibling text nodes share their parent, so its visibility is checked once per parent,
+    // and a single Range is reused to measure every text node
+    const textRange = document.createRange();
+    const textParentVisibility = new Map();
+
+    function isTextParentVisible(parent) {
+        if (!parent) return false;
+        let visible = textParentVisibility.get(parent);
+        if (visible === undefined) {
+            visible = parent.checkVisibility({
+                checkOpacity: true,
+                checkVisibilityCSS: true
+            });
+            textParentVisibility.set(parent, visible);
+        }
+        return visible;
+    }
+
     function isTextNodeVisible(textNode) {
-        const range = document.createRange();
-        range.selectNodeContents(textNode);
-        const rect = range.getBoundingClientRect();
+        if (!isTextParentVisible(textNode.parentElement)) return false;
+
+        textRange.selectNodeContents(textNode);
+        const rect = textRange.getBoundingClientRect();
 
         return rect.width !== 0 &&
             rect.height !== 0 &&
             rect.top >= 0 &&
-            rect.top <= window.innerHeight &&
-            textNode.parentElement?.checkVisibility({
-                checkOpacity: true,
-                checkVisibilityCSS: true
-            });
+            rect.top <= window.innerHeight;
     }
 
 
     // Function to traverse the DOM and create nested JSON
-    function buildDomTree(node, parentIframe = null) {
+    // hiddenAncestor: an ancestor has display: none or opacity: 0, which no descendant can override,
+    // so text below it is rejected without measuring it
+    function buildDomTree(node, parentIframe = null, hiddenAncestor = false) {
         if (!node) return null;
 
         // Special case for text nodes
         if (node.nodeType === Node.TEXT_NODE) {
+            if (hiddenAncestor) return null;
             const textContent = node.textContent.trim();
             if (textContent && isTextNodeVisible(node)) {
                 return {
@@ -404,6 +423,10 @@
             children: [],
         };
 
+        if (parentIframe) {
+            nodeData.frameId = frameIdOf(parentIframe);
+        }
+
         // Copy all attributes if the node is an element
         if (node.nodeType === Node.ELEMENT_NODE && node.attributes) {
             // Use getAttributeNames() instead of directly iterating attributes
@@ -413,9 +436,13 @@
             }
         }
 
+        let subtreeHidden = hiddenAncestor;
         if (node.nodeType === Node.ELEMENT_NODE) {
+            const style = window.getComputedStyle(node);
+            subtreeHidden = hiddenAncestor || style.display === 'none' || style.opacity === '0';
+
             const isInteractive = isInteractiveElement(node);
-            const isVisible = isElementVisible(node);
+            const isVisible = isElementVisible(node, style);
             const isTop = isTopElement(node);
 
             nodeData.isInteractive = isInteractive;
@@ -425,6 +452,8 @@
             // Highlight if element meets all criteria and highlighting is enabled
             if (isInteractive && isVisible && isTop) {
                 nodeData.highlightIndex = highlightIndex++;
+                // Layout is clean here (highlights are painted after the walk), so this read is cheap
+                nodeData.viewportTop = Math.round(node.getBoundingClientRect().top);
                 if (doHighlightElements) {
                     if(focusHighlightIndex >= 0){
                         if(focusHighlightIndex === nodeData.highlightIndex){
@@ -450,7 +479,7 @@
         // Handle shadow DOM
         if (node.shadowRoot) {
             const shadowChildren = Array.from(node.shadowRoot.childNodes).map(child =>
-                buildDomTree(child, parentIframe)
+                buildDomTree(child, parentIframe, subtreeHidden)
             );
             nodeData.children.push(...shadowChildren);
         }
@@ -460,6 +489,7 @@
             try {
                 const iframeDoc = node.contentDocument || node.contentWindow.document;
                 if (iframeDoc) {
+                    // A frame document is checked on its own, like checkVisibility does
                     const iframeChildren = Array.from(iframeDoc.body.childNodes).map(child =>
                         buildDomTree(child, node)
                     );
@@ -470,7 +500,7 @@
             }
         } else {
             const children = Array.from(node.childNodes).map(child =>
-                buildDomTree(child, parentIframe)
+                buildDomTree(child, parentIframe, subtreeHidden)
             );
             nodeData.children.push(...children);
         }
@@ -479,5 +509,13 @@
     }
 
 
-    return buildDomTree(document.body);
+    // Boxes computed outside the page (DOMSnapshot capture) are painted without walking the DOM
+    if (highlightBoxes) {
+        paintHighlights(highlightBoxes);
+        return null;
+    }
+
+    const tree = buildDomTree(document.body);
+    renderHighlights();
+    return tree;
 }
@@ -0,0 +1,50 @@
+"""
+Vectorized hit testing of captured layout boxes.
+
+Finds for many points at once the box painted on top at each of them, the equivalent of one
+elementFromPoint call per point, with a few NumPy array operations over all boxes in the viewport.
+"""
+
+import numpy as np
+
+# Upper bound on the cells of the points x boxes containment matrix evaluated at once (bytes of memory)
+MAX_MATRIX_CELLS = 4_000_000
+
+
+def in_viewport(points: np.ndarray, viewport: tuple[float, float]) -> np.ndarray:
+	"""Mask of the (m, 2) points that lie within the viewport (width, height)."""
+	width, height = viewport
+	return (points[:, 0] >= 0) & (points[:, 0] < width) & (points[:, 1] >= 0) & (points[:, 1] < height)
+
+
+def hit_test(boxes: np.ndarray, paint_orders: np.ndarray, points: np.ndarray, viewport: tuple[float, float]) -> np.ndarray:
+	"""
+	Index (into `boxes`) of the box painted last at each point, or -1 where no box contains the point.
+
+	`boxes` is an (n, 4) array of x, y, width, height in viewport coordinates and `paint_orders` their
+	(n,) paint order; of boxes painted together the later one wins. `points` is an (m, 2) array of x, y.
+	Empty boxes and boxes outside the viewport are never hit.
+	"""
+	boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+	points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+	hits = np.full(len(points), -1, dtype=np.int64)
+
+	left, top = boxes[:, 0], boxes[:, 1]
+	right, bottom = left + boxes[:, 2], top + boxes[:, 3]
+	width, height = viewport
+	nonempty = (boxes[:, 2] > 0) & (boxes[:, 3] > 0)
+	onscreen = np.flatnonzero(nonempty & (left < width) & (top < height) & (right > 0) & (bottom > 0))
+	if not len(onscreen) or not len(points):
+		return hits
+
+	# After a stable sort by paint order, the last box containing a point is the one painted on top
+	order = onscreen[np.argsort(np.asarray(paint_orders)[onscreen], kind='stable')]
+	left, top, right, bottom = left[order], top[order], right[order], bottom[order]
+	chunk = max(1, MAX_MATRIX_CELLS // len(order))
+	for start in range(0, len(points), chunk):
+		x = points[start : start + chunk, 0, None]
+		y = points[start : start + chunk, 1, None]
+		contains = (left <= x) & (x < right) & (top <= y) & (y < bottom)
+		last = len(order) - 1 - contains[:, ::-1].argmax(axis=1)
+		hits[start : start + chunk] = np.where(contains.any(axis=1), order[last], -1)
+	return hits
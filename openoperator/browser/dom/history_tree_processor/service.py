@@ -32,20 +32,8 @@ class HistoryTreeProcessor:
 		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(
 			dom_history_element
 		)
-
-		def process_node(node: DOMElementNode):
-			if node.highlight_index is not None:
-				hashed_node = HistoryTreeProcessor._hash_dom_element(node)
-				if hashed_node == hashed_dom_history_element:
-					return node
-			for child in node.children:
-				if isinstance(child, DOMElementNode):
-					result = process_node(child)
-					if result is not None:
-						return result
-			return None
-
-		return process_node(tree)
+		# The index is built once per tree, so repeated lookups are dictionary lookups
+		return tree.hash_index.get(hashed_dom_history_element)
 
 	@staticmethod
 	def compare_history_element_and_dom_element(
@@ -54,9 +42,36 @@ class HistoryTreeProcessor:
 		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(
 			dom_history_element
 		)
-		hashed_dom_element = HistoryTreeProcessor._hash_dom_element(dom_element)
 
-		return hashed_dom_history_element == hashed_dom_element
+		return hashed_dom_history_element == dom_element.hash
+
+	@staticmethod
+	def build_hash_index(tree: DOMElementNode) -> dict[HashedDomElement, DOMElementNode]:
+		"""
+		Index the highlighted elements of a tree by their hash in a single top-down pass.
+
+		The branch path hash of a child continues the SHA-256 state of its parent with `/tag`, which gives the
+		same digest as hashing the joined path, without walking to the root for every element. Like a tree walk,
+		the first element in document order wins when several share a hash.
+		"""
+		index: dict[HashedDomElement, DOMElementNode] = {}
+		prefix = HistoryTreeProcessor._get_parent_branch_path(tree)
+		stack = [(tree, hashlib.sha256('/'.join(prefix).encode()), bool(prefix))]
+		while stack:
+			node, branch_hasher, has_path = stack.pop()
+			if node.highlight_index is not None:
+				hashed = HashedDomElement(
+					branch_hasher.hexdigest(), HistoryTreeProcessor._attributes_hash(node.attributes)
+				)
+				# Prime the node's cached `hash`, so comparisons do not walk to the root again
+				node.__dict__['hash'] = hashed
+				index.setdefault(hashed, node)
+			for child in reversed(node.children):
+				if isinstance(child, DOMElementNode):
+					child_hasher = branch_hasher.copy()
+					child_hasher.update((f'/{child.tag_name}' if has_path else child.tag_name).encode())
+					stack.append((child, child_hasher, True))
+		return index
 
 	@staticmethod
 	def _hash_dom_history_element(dom_history_element: DOMHistoryElement) -> HashedDomElement:
@@ -2,10 +2,10 @@ from dataclasses import dataclass
 from typing import Optional
 
 
-@dataclass
+@dataclass(frozen=True)
 class HashedDomElement:
 	"""
-	Hash of the dom element to be used as a unique identifier
+	Hash of the dom element to be used as a unique identifier (hashable, so it can key an index of a tree)
 	"""
 
 	branch_path_hash: str
@@ -0,0 +1,139 @@
+"""
+Query-aware selection of the interactive elements shown to the LLM.
+
+Elements are scored against the task query with BM25 over their text and descriptive attributes, plus a
+prior for the element type and a bonus for being on or near the screen. The best elements are listed
+(in page order) until a token budget is used up; a continuation marker tells the agent how to list the
+rest with the expand_elements tool.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from openoperator.browser.dom.views import DOMElementNode, SelectorMap
+
+# Attributes whose values describe what an element does
+DESCRIPTIVE_ATTRIBUTES = ('id', 'name', 'aria-label', 'title', 'alt', 'placeholder', 'value', 'href', 'type', 'role')
+
+# Inputs are rarely optional steps of a task, links are the most numerous and least specific
+TYPE_PRIOR = {
+	'input': 0.6,
+	'textarea': 0.6,
+	'select': 0.6,
+	'button': 0.5,
+	'summary': 0.3,
+	'a': 0.2,
+}
+DEFAULT_TYPE_PRIOR = 0.3
+TYPE_WEIGHT = 0.5
+PROXIMITY_WEIGHT = 1.0
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+	'a an and are at be by can do does find for from get how i in is it me of on or page please show '
+	'tell that the this to what when where which who with you your'.split()
+)
+
+_TOKEN = re.compile(r'[^\W_]+')
+
+
+def _stem(token: str) -> str:
+	# Plural folding is enough to match 'reports' with 'report'; page texts are too short for real stemming
+	if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+		return token[:-1]
+	return token
+
+
+def tokenize(text: str) -> list[str]:
+	return [_stem(token) for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+	"""Rough LLM token count; about four characters per token for English text and markup."""
+	return len(text) // 4 + 1
+
+
+def element_terms(element: DOMElementNode) -> list[str]:
+	parts = [element.get_all_text_till_next_clickable_element(max_depth=2)]
+	parts.extend(value for key in DESCRIPTIVE_ATTRIBUTES if (value := element.attributes.get(key)))
+	return tokenize(' '.join(parts))
+
+
+def proximity(element: DOMElementNode, viewport_height: int) -> float:
+	"""1 for elements on screen, decaying with the distance (in screen heights) to the visible area."""
+	top = element.viewport_top
+	if top is None or viewport_height <= 0:
+		return 0.5
+	distance = -top if top < 0 else max(0, top - viewport_height)
+	return 1 / (1 + distance / viewport_height)
+
+
+def rank_elements(selector_map: SelectorMap, query: str, viewport_height: int) -> list[int]:
+	"""Element indices, most relevant first; equal scores keep page order."""
+	query_terms = set(tokenize(query))
+	documents = {index: Counter(element_terms(element)) for index, element in selector_map.items()} if query_terms else {}
+	average_length = sum(sum(terms.values()) for terms in documents.values()) / len(documents) if documents else 0.0
+	frequencies = Counter(term for terms in documents.values() for term in query_terms & terms.keys())
+
+	scores: dict[int, float] = {}
+	for index, element in selector_map.items():
+		score = TYPE_WEIGHT * TYPE_PRIOR.get(element.tag_name, DEFAULT_TYPE_PRIOR)
+		score += PROXIMITY_WEIGHT * proximity(element, viewport_height)
+		terms = documents.get(index)
+		if terms:
+			length_norm = 1 - BM25_B + BM25_B * sum(terms.values()) / (average_length or 1)
+			for term in query_terms & terms.keys():
+				idf = math.log(1 + (len(documents) - frequencies[term] + 0.5) / (frequencies[term] + 0.5))
+				score += idf * terms[term] * (BM25_K1 + 1) / (terms[term] + BM25_K1 * length_norm)
+		scores[index] = score
+	return sorted(selector_map, key=lambda index: (-scores[index], index))
+
+
+@dataclass
+class RankedSelection:
+	text: str
+	shown: list[int]
+	remaining: int
+
+
+def select_within_budget(
+	selector_map: SelectorMap,
+	ranking: list[int],
+	token_budget: int,
+	offset: int = 0,
+	keywords: Optional[str] = None,
+) -> RankedSelection:
+	"""
+	The elements ranked from `offset` on that fit into `token_budget` tokens, listed in page order.
+
+	A budget of 0 or less lists everything. At least one element is always listed, so expanding makes progress.
+	`keywords` is set when `ranking` is by the agent's keywords rather than the task query; such listings
+	leave out what was already listed, so they are continued by repeating the keywords instead of by offset.
+	"""
+	chosen: list[int] = []
+	used = 0
+	for index in ranking[offset:]:
+		cost = estimate_tokens(selector_map[index].compact_text) + 1
+		if token_budget > 0 and chosen and used + cost > token_budget:
+			break
+		chosen.append(index)
+		used += cost
+
+	lines = [selector_map[index].compact_text for index in sorted(chosen)]
+	remaining = len(ranking) - offset - len(chosen)
+	if remaining > 0 and keywords:
+		lines.append(
+			f'... {remaining} less relevant elements are not listed. '
+			f'Call expand_elements with the same keywords again to list more.'
+		)
+	elif remaining > 0:
+		lines.append(
+			f'... {remaining} less relevant elements are not listed. '
+			f'Call expand_elements with offset={offset + len(chosen)} to list more, optionally with keywords to rank them by.'
+		)
+	return RankedSelection(text='\n'.join(lines), shown=chosen, remaining=remaining)
@@ -1,8 +1,6 @@
 import logging
 from importlib import resources
-from typing import Optional
-
-from playwright.async_api import Page
+from typing import TYPE_CHECKING, Optional
 
 from openoperator.browser.dom.views import (
 	DOMBaseNode,
@@ -12,11 +10,14 @@ from openoperator.browser.dom.views import (
 	SelectorMap,
 )
 
+if TYPE_CHECKING:
+	from playwright.async_api import Page
+
 logger = logging.getLogger(__name__)
 
 
 class DomService:
-	def __init__(self, page: Page):
+	def __init__(self, page: 'Page'):
 		self.page = page
 		self.xpath_cache = {}
 
@@ -38,6 +39,21 @@ class DomService:
 		focus_element: int,
 		viewport_expansion: int,
 	) -> DOMElementNode:
+		eval_page = await self._evaluate_dom_tree(highlight_elements, focus_element, viewport_expansion)
+		html_to_dict = self._parse_node(eval_page)
+
+		if html_to_dict is None or not isinstance(html_to_dict, DOMElementNode):
+			raise ValueError('Failed to parse HTML to dictionary')
+
+		return html_to_dict
+
+	async def _evaluate_dom_tree(
+		self,
+		highlight_elements: bool,
+		focus_element: int,
+		viewport_expansion: int,
+	) -> dict:
+		"""Run buildDomTree.js in the page and return the raw serialized tree, before parsing."""
 		js_code = resources.read_text('openoperator.browser.dom', 'buildDomTree.js')
 
 		args = {
@@ -46,13 +62,7 @@ class DomService:
 			'viewportExpansion': viewport_expansion,
 		}
 
-		eval_page = await self.page.evaluate(js_code, args)  # This is quite big, so be careful
-		html_to_dict = self._parse_node(eval_page)
-
-		if html_to_dict is None or not isinstance(html_to_dict, DOMElementNode):
-			raise ValueError('Failed to parse HTML to dictionary')
-
-		return html_to_dict
+		return await self.page.evaluate(js_code, args)  # This is quite big, so be careful
 
 	def _create_selector_map(self, element_tree: DOMElementNode) -> SelectorMap:
 		selector_map = {}
@@ -96,6 +106,8 @@ class DomService:
 			is_interactive=node_data.get('isInteractive', False),
 			is_top_element=node_data.get('isTopElement', False),
 			highlight_index=node_data.get('highlightIndex'),
+			viewport_top=node_data.get('viewportTop'),
+			frame_id=node_data.get('frameId'),
 			shadow_root=node_data.get('shadowRoot', False),
 			parent=parent,
 		)
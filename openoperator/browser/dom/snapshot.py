@@ -0,0 +1,412 @@
+"""
+DOM capture from a CDP DOMSnapshot instead of buildDomTree.js.
+
+buildDomTree.js asks the page for computed styles, boxes and hit tests element by element. A single
+DOMSnapshot.captureSnapshot call returns the layout boxes, a few computed styles and the paint order of
+every node, including shadow trees and iframes. Out-of-process (cross-origin) iframes are captured through
+their own CDP session. Visibility, interactivity and topmost-ness are then decided in Python with the rules
+of the JS walker, and the result is the same DOMState. Chromium only.
+
+Differences to the JS walker: the snapshot's isClickable flag also catches listeners added with
+addEventListener, closed shadow roots and cross-origin iframes are included, and is_top_element is only
+computed for visible interactive elements (the only ones it matters for).
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from importlib import resources
+from typing import TYPE_CHECKING, Any, Optional
+
+from openoperator.browser.dom.service import DomService
+from openoperator.browser.dom.views import DOMElementNode, DOMTextNode
+
+if TYPE_CHECKING:
+	from playwright.async_api import CDPSession
+
+logger = logging.getLogger(__name__)
+
+# Computed styles captured per layout node, in this order
+CAPTURED_STYLES = ['visibility', 'opacity', 'pointer-events']
+_VISIBILITY, _OPACITY, _POINTER_EVENTS = range(len(CAPTURED_STYLES))
+
+ELEMENT_NODE = 1
+TEXT_NODE = 3
+
+# The rules of isElementAccepted and isInteractiveElement in buildDomTree.js
+DENIED_ELEMENTS = frozenset({'svg', 'script', 'style', 'link', 'meta'})
+INTERACTIVE_ELEMENTS = frozenset({
+	'a', 'button', 'details', 'embed', 'input', 'label', 'menu', 'menuitem', 'object', 'select', 'textarea', 'summary',
+})
+INTERACTIVE_ROLES = frozenset({
+	'button', 'menu', 'menuitem', 'link', 'checkbox', 'radio', 'slider', 'tab', 'tabpanel', 'textbox', 'combobox',
+	'grid', 'listbox', 'option', 'progressbar', 'scrollbar', 'searchbox', 'switch', 'tree', 'treeitem', 'spinbutton',
+	'tooltip', 'a-button-inner', 'a-dropdown-button', 'click', 'menuitemcheckbox', 'menuitemradio', 'a-button-text',
+	'button-text', 'button-icon', 'button-icon-only', 'button-text-icon-only', 'dropdown',
+})
+DROPDOWN_ACTIONS = frozenset({'a-dropdown-select', 'a-dropdown-button'})
+CLICK_HANDLER_ATTRIBUTES = ('onclick', 'ng-click', '@click', 'v-on:click')
+ARIA_STATE_ATTRIBUTES = ('aria-expanded', 'aria-pressed', 'aria-selected', 'aria-checked')
+
+
+class _Document:
+	"""One DocumentSnapshot with per-node lookups, positioned in the top-level viewport."""
+
+	def __init__(self, snapshot: dict, strings: list[str], document_offset: int):
+		nodes = snapshot['nodes']
+		layout = snapshot['layout']
+		self.strings = strings
+		self.frame_id: str = strings[snapshot['frameId']] if 'frameId' in snapshot else ''
+		self.scroll_x: float = snapshot.get('scrollOffsetX', 0)
+		self.scroll_y: float = snapshot.get('scrollOffsetY', 0)
+		# Position of the document's viewport in the top-level viewport, set when its owner iframe is visited
+		self.origin_x = 0.0
+		self.origin_y = 0.0
+
+		self.parents: list[int] = nodes['parentIndex']
+		self.types: list[int] = nodes['nodeType']
+		self.names: list[int] = nodes['nodeName']
+		self.values: list[int] = nodes['nodeValue']
+		self.backend_ids: list[int] = nodes.get('backendNodeId', [])
+		self.attribute_lists: list[list[int]] = nodes.get('attributes', [])
+		self._attributes: dict[int, dict[str, str]] = {}
+		self.children: list[list[int]] = [[] for _ in self.parents]
+		for index, parent in enumerate(self.parents):
+			if parent >= 0:
+				self.children[parent].append(index)
+
+		self.shadow_roots = set(nodes.get('shadowRootType', {}).get('index', []))
+		self.pseudo_elements = set(nodes.get('pseudoType', {}).get('index', []))
+		self.clickable = set(nodes.get('isClickable', {}).get('index', []))
+		content = nodes.get('contentDocumentIndex', {})
+		self.content_documents = {
+			index: document_offset + value for index, value in zip(content.get('index', []), content.get('value', []))
+		}
+
+		self.layout_nodes: list[int] = layout['nodeIndex']
+		self.layout_of = {node: index for index, node in enumerate(self.layout_nodes)}
+		self.bounds: list[list[float]] = layout['bounds']
+		self.styles: list[list[int]] = layout['styles']
+		self.paint_orders: list[int] = layout.get('paintOrders', [])
+
+	def tag(self, index: int) -> str:
+		return self.strings[self.names[index]].lower()
+
+	def text(self, index: int) -> str:
+		value = self.values[index]
+		return self.strings[value] if value >= 0 else ''
+
+	def attributes(self, index: int) -> dict[str, str]:
+		if index not in self._attributes:
+			flat = self.attribute_lists[index] if index < len(self.attribute_lists) else []
+			self._attributes[index] = {self.strings[flat[i]]: self.strings[flat[i + 1]] for i in range(0, len(flat) - 1, 2)}
+		return self._attributes[index]
+
+	def style(self, layout: int, style: int) -> str:
+		value = self.styles[layout][style]
+		return self.strings[value] if value >= 0 else ''
+
+	def rect(self, layout: int) -> tuple[float, float, float, float]:
+		"""Border box of a layout node in top-level viewport coordinates: x, y, width, height."""
+		x, y, width, height = self.bounds[layout]
+		return x - self.scroll_x + self.origin_x, y - self.scroll_y + self.origin_y, width, height
+
+	def body(self) -> Optional[int]:
+		return next(
+			(index for index, type_ in enumerate(self.types) if type_ == ELEMENT_NODE and self.tag(index) == 'body'),
+			None,
+		)
+
+
+class _TreeBuilder:
+	"""Turns the captured documents into DOMElementNodes, numbering highlighted elements like buildDomTree.js."""
+
+	def __init__(self, documents: list[_Document], viewport: tuple[float, float], focus_element: int, viewport_expansion: int):
+		self.documents = documents
+		self.viewport_width, self.viewport_height = viewport
+		self.focus_element = focus_element
+		self.viewport_expansion = viewport_expansion
+		self.highlight_index = 0
+		# Highlighted elements as (index, x, y, width, height) in top-level viewport coordinates
+		self.boxes: list[tuple[int, float, float, float, float]] = []
+		# Main-document nodes that are on top, computed for all elements at once on first use
+		self._top: Optional[set[int]] = None
+
+	def build(self) -> DOMElementNode:
+		main = self.documents[0]
+		body = main.body()
+		if body is None:
+			raise ValueError('Snapshot has no body element')
+		node = self._element(main, body, None, 'html/body', hidden=False)
+		if node is None:
+			raise ValueError('Failed to build the DOM tree from the snapshot')
+		return node
+
+	def _children(
+		self,
+		document: _Document,
+		indices: list[int],
+		parent: DOMElementNode,
+		xpath: Optional[str],
+		hidden: bool,
+	) -> None:
+		"""`xpath` is the parent's XPath, or None for a shadow root, whose children get an empty XPath like in getXPathTree."""
+		seen: Counter[int] = Counter()
+		for index in indices:
+			type_ = document.types[index]
+			if index in document.shadow_roots:
+				parent.shadow_root = True
+				self._children(document, document.children[index], parent, None, hidden)
+			elif type_ == TEXT_NODE:
+				if (text_node := self._text(document, index, parent, hidden)) is not None:
+					parent.children.append(text_node)
+			elif type_ == ELEMENT_NODE and index not in document.pseudo_elements:
+				# XPath positions count the preceding siblings with the same name, like getXPathTree
+				name = document.names[index]
+				seen[name] += 1
+				segment = document.tag(index) if seen[name] == 1 else f'{document.tag(index)}[{seen[name]}]'
+				child_xpath = '' if xpath is None else f'{xpath}/{segment}' if xpath else segment
+				child = self._element(document, index, parent, child_xpath, hidden)
+				if child is not None:
+					parent.children.append(child)
+
+	def _element(
+		self,
+		document: _Document,
+		index: int,
+		parent: Optional[DOMElementNode],
+		xpath: str,
+		hidden: bool,
+	) -> Optional[DOMElementNode]:
+		tag = document.tag(index)
+		if tag in DENIED_ELEMENTS:
+			return None
+		attributes = document.attributes(index)
+		layout = document.layout_of.get(index)
+
+		visible = False
+		if layout is not None:
+			_, _, width, height = document.rect(layout)
+			visible = width > 0 and height > 0 and document.style(layout, _VISIBILITY) != 'hidden'
+			hidden = hidden or document.style(layout, _OPACITY) == '0'
+		interactive = self._is_interactive(document, index, tag, attributes)
+		top = visible and interactive and self._is_top(document, index, layout)
+
+		node = DOMElementNode(
+			tag_name=tag,
+			xpath=xpath,
+			attributes=attributes,
+			children=[],
+			is_visible=visible,
+			is_interactive=interactive,
+			is_top_element=top,
+			frame_id=document.frame_id if document is not self.documents[0] else None,
+			parent=parent,
+		)
+		if top:
+			node.highlight_index = self.highlight_index
+			self.highlight_index += 1
+			x, y, width, height = document.rect(layout)
+			node.viewport_top = round(y)
+			if self.focus_element < 0 or self.focus_element == node.highlight_index:
+				self.boxes.append((node.highlight_index, x, y, width, height))
+
+		if index in document.content_documents:
+			# Frame documents are checked on their own, and listed from their body like buildDomTree.js does
+			frame = self.documents[document.content_documents[index]]
+			body = frame.body()
+			if layout is not None and body is not None:
+				frame.origin_x, frame.origin_y, _, _ = document.rect(layout)
+				self._children(frame, frame.children[body], node, 'html/body', hidden=False)
+		else:
+			self._children(document, document.children[index], node, xpath, hidden)
+		return node
+
+	def _text(self, document: _Document, index: int, parent: DOMElementNode, hidden: bool) -> Optional[DOMTextNode]:
+		if hidden:
+			return None
+		text = document.text(index).strip()
+		parent_index = document.parents[index]
+		if not text or document.types[parent_index] != ELEMENT_NODE:
+			return None
+		parent_layout = document.layout_of.get(parent_index)
+		layout = document.layout_of.get(index)
+		if parent_layout is None or layout is None or document.style(parent_layout, _VISIBILITY) == 'hidden':
+			return None
+		_, y, width, height = document.rect(layout)
+		if width == 0 or height == 0 or not 0 <= y <= self.viewport_height:
+			return None
+		return DOMTextNode(text=text, is_visible=True, parent=parent)
+
+	@staticmethod
+	def _is_interactive(document: _Document, index: int, tag: str, attributes: dict[str, str]) -> bool:
+		tab_index = attributes.get('tabindex')
+		if (
+			tag in INTERACTIVE_ELEMENTS
+			or attributes.get('role') in INTERACTIVE_ROLES
+			or attributes.get('aria-role') in INTERACTIVE_ROLES
+			or (tab_index is not None and tab_index != '-1')
+			or attributes.get('data-action') in DROPDOWN_ACTIONS
+		):
+			return True
+		# Images are draggable by default (HTMLElement.draggable)
+		draggable = attributes.get('draggable')
+		return (
+			index in document.clickable
+			or any(name in attributes for name in CLICK_HANDLER_ATTRIBUTES)
+			or any(name in attributes for name in ARIA_STATE_ATTRIBUTES)
+			or draggable == 'true'
+			or (tag == 'img' and draggable != 'false')
+		)
+
+	def _is_top(self, document: _Document, index: int, layout: Optional[int]) -> bool:
+		"""Whether the element (or one of its descendants) is hit at its center, like elementFromPoint."""
+		if layout is None:
+			return False
+		# Elements in iframes are considered top, as are all elements when the whole page is requested
+		if document is not self.documents[0] or self.viewport_expansion == -1:
+			return True
+		if self._top is None:
+			self._top = self._top_elements()
+		return index in self._top
+
+	def _top_elements(self) -> set[int]:
+		"""
+		Visible interactive elements of the top-level document that are on top at their center, or whose center
+		is outside the viewport. All centers are hit tested in one vectorized pass (see geometry.hit_test).
+		"""
+		# NumPy is only needed by this backend, and only once a page is captured
+		import numpy as np
+
+		from openoperator.browser.dom.geometry import hit_test, in_viewport
+
+		document = self.documents[0]
+		if not document.layout_nodes:
+			return set()
+		layout_nodes = np.asarray(document.layout_nodes)
+		bounds = np.asarray(document.bounds, dtype=np.float64).reshape(-1, 4) - (document.scroll_x, document.scroll_y, 0, 0)
+		styles = np.asarray(document.styles, dtype=np.int64).reshape(-1, len(CAPTURED_STYLES))
+		rendered = styles[:, _VISIBILITY] != _string_index(document.strings, 'hidden')
+		hit_testable = rendered & (styles[:, _POINTER_EVENTS] != _string_index(document.strings, 'none'))
+		paint_orders = np.asarray(document.paint_orders) if document.paint_orders else np.arange(len(layout_nodes))
+
+		# Candidates are filtered by geometry first, so attributes are only parsed for visible elements
+		types = np.asarray(document.types)[layout_nodes]
+		visible = (types == ELEMENT_NODE) & (bounds[:, 2] > 0) & (bounds[:, 3] > 0) & rendered
+		candidates = [
+			layout
+			for layout in np.flatnonzero(visible).tolist()
+			if (node := document.layout_nodes[layout]) not in document.pseudo_elements
+			and self._is_interactive(document, node, document.tag(node), document.attributes(node))
+		]
+		if not candidates:
+			return set()
+		centers = bounds[candidates, :2] + bounds[candidates, 2:] / 2
+		inside = in_viewport(centers, (self.viewport_width, self.viewport_height))
+
+		top = {document.layout_nodes[layout] for layout, onscreen in zip(candidates, inside.tolist()) if not onscreen}
+		onscreen = np.asarray(candidates)[inside]
+		testable = np.flatnonzero(hit_testable)
+		hits = hit_test(bounds[testable], paint_orders[testable], centers[inside], (self.viewport_width, self.viewport_height))
+		for layout, hit in zip(onscreen.tolist(), hits.tolist()):
+			node = document.layout_nodes[layout]
+			# The element is on top if the hit node is the element itself or one of its descendants
+			current = document.layout_nodes[testable[hit]] if hit >= 0 else -1
+			while current >= 0 and current != node:
+				current = document.parents[current]
+			if current == node:
+				top.add(node)
+		return top
+
+
+def _string_index(strings: list[str], value: str) -> int:
+	try:
+		return strings.index(value)
+	except ValueError:
+		return -2
+
+
+class SnapshotDomService(DomService):
+	"""DomService capturing the page with DOMSnapshot.captureSnapshot over CDP; see the module docstring."""
+
+	async def _build_dom_tree(
+		self,
+		highlight_elements: bool,
+		focus_element: int,
+		viewport_expansion: int,
+	) -> DOMElementNode:
+		session = await self.page.context.new_cdp_session(self.page)
+		try:
+			snapshot, metrics = await asyncio.gather(self._capture(session), session.send('Page.getLayoutMetrics'))
+			documents = self._documents(snapshot)
+			await self._add_out_of_process_frames(session, documents)
+		finally:
+			await session.detach()
+
+		viewport = metrics['cssLayoutViewport']
+		builder = _TreeBuilder(documents, (viewport['clientWidth'], viewport['clientHeight']), focus_element, viewport_expansion)
+		tree = builder.build()
+
+		if highlight_elements and builder.boxes:
+			main = documents[0]
+			boxes = [
+				{'index': index, 'left': x + main.scroll_x, 'top': y + main.scroll_y, 'width': width, 'height': height}
+				for index, x, y, width, height in builder.boxes
+			]
+			js_code = resources.read_text('openoperator.browser.dom', 'buildDomTree.js')
+			await self.page.evaluate(js_code, {'highlightBoxes': boxes})
+		return tree
+
+	@staticmethod
+	async def _capture(session: 'CDPSession') -> dict[str, Any]:
+		return await session.send('DOMSnapshot.captureSnapshot', {'computedStyles': CAPTURED_STYLES, 'includePaintOrder': True})
+
+	@staticmethod
+	def _documents(snapshot: dict[str, Any], document_offset: int = 0) -> list[_Document]:
+		return [_Document(document, snapshot['strings'], document_offset) for document in snapshot['documents']]
+
+	async def _add_out_of_process_frames(self, session: 'CDPSession', documents: list[_Document]) -> None:
+		"""Capture out-of-process iframes through their own sessions and attach them to their owner iframes."""
+		frames = self.page.frames[1:]
+		if not frames:
+			return
+		captured = {document.frame_id for document in documents}
+		snapshots = await asyncio.gather(*(self._capture_frame(frame) for frame in frames))
+		owners: Optional[dict[int, tuple[_Document, int]]] = None
+		for snapshot in snapshots:
+			if snapshot is None:
+				continue
+			frame_documents = self._documents(snapshot, document_offset=len(documents))
+			if frame_documents[0].frame_id in captured:
+				continue
+			try:
+				owner = await session.send('DOM.getFrameOwner', {'frameId': frame_documents[0].frame_id})
+			except Exception as e:
+				# Frames nested in another out-of-process frame are not owned by a node of the page's process
+				logger.debug(f'Owner of frame {frame_documents[0].frame_id} not found: {e}')
+				continue
+			if owners is None:
+				owners = {
+					backend_id: (document, index)
+					for document in documents
+					for index, backend_id in enumerate(document.backend_ids)
+				}
+			if owner['backendNodeId'] in owners:
+				document, index = owners[owner['backendNodeId']]
+				document.content_documents[index] = len(documents)
+				documents.extend(frame_documents)
+				captured.update(document.frame_id for document in frame_documents)
+
+	async def _capture_frame(self, frame) -> Optional[dict[str, Any]]:
+		try:
+			# Only out-of-process frames have a session of their own; the others are in the page's snapshot
+			session = await self.page.context.new_cdp_session(frame)
+		except Exception:
+			return None
+		try:
+			return await self._capture(session)
+		except Exception as e:
+			logger.debug(f'Failed to capture frame {frame.url}: {e}')
+			return None
+		finally:
+			await session.detach()
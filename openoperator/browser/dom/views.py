@@ -1,11 +1,13 @@
 from dataclasses import dataclass
-from functools import cached_property
+from functools import cached_property, lru_cache
 from typing import TYPE_CHECKING, Dict, List, Optional
 
 from openoperator.browser.dom.history_tree_processor.view import HashedDomElement
 
 # Avoid circular import issues
 if TYPE_CHECKING:
+	from playwright.async_api import Frame
+
 	from .views import DOMElementNode
 
 
@@ -45,6 +47,10 @@ class DOMElementNode(DOMBaseNode):
 	is_top_element: bool = False
 	shadow_root: bool = False
 	highlight_index: Optional[int] = None
+	# Top edge relative to the viewport at capture time (highlighted elements only), for ranking by proximity
+	viewport_top: Optional[int] = None
+	# Frame holding the element, unique within one snapshot; None for the main frame
+	frame_id: Optional[str] = None
 
 	def __repr__(self) -> str:
 		tag_str = f'<{self.tag_name}'
@@ -78,6 +84,20 @@ class DOMElementNode(DOMBaseNode):
 
 		return HistoryTreeProcessor._hash_dom_element(self)
 
+	@cached_property
+	def compact_text(self) -> str:
+		"""Compact one-line form of a highlighted element (see ElementTreeSerializer.compact_element)."""
+		return ElementTreeSerializer.compact_element(self.highlight_index, self)
+
+	@cached_property
+	def hash_index(self) -> Dict[HashedDomElement, 'DOMElementNode']:
+		"""Highlighted elements of this subtree by hash, built once (see HistoryTreeProcessor.build_hash_index)."""
+		from openoperator.browser.dom.history_tree_processor.service import (
+			HistoryTreeProcessor,
+		)
+
+		return HistoryTreeProcessor.build_hash_index(self)
+
 	def get_all_text_till_next_clickable_element(self, max_depth: int = -1) -> str:
 		text_parts = []
 
@@ -156,11 +176,67 @@ class DOMElementNode(DOMBaseNode):
 		return None
 
 
+# Attributes that help to tell interactive elements apart; styling and framework attributes are left out
+COMPACT_ATTRIBUTES = (
+	'id',
+	'name',
+	'type',
+	'role',
+	'aria-label',
+	'title',
+	'alt',
+	'placeholder',
+	'value',
+	'href',
+	'for',
+	'checked',
+	'selected',
+	'disabled',
+	'aria-expanded',
+	'aria-checked',
+	'aria-selected',
+)
+MAX_ATTRIBUTE_LENGTH = 60
+MAX_TEXT_LENGTH = 60
+
+
+def _truncate(value: str, limit: int) -> str:
+	value = ' '.join(value.split())
+	return value if len(value) <= limit else value[: limit - 1] + '…'
+
+
+@lru_cache(maxsize=4096)
+def _attribute_fragment(key: str, value: str) -> str:
+	# Attribute values repeat across elements and steps (type="button", role="link"); they are formatted once and shared
+	return f' {key}="{_truncate(value, MAX_ATTRIBUTE_LENGTH)}"' if value else f' {key}'
+
+
 class ElementTreeSerializer:
 	@staticmethod
 	def serialize_clickable_elements(element_tree: DOMElementNode) -> str:
 		return element_tree.clickable_elements_to_string()
 
+	@staticmethod
+	def compact_element(
+		index: int,
+		element: DOMElementNode,
+		include_attributes: tuple[str, ...] = COMPACT_ATTRIBUTES,
+	) -> str:
+		"""One line per element: [index]<tag allowlisted attributes>short text</tag>, with long values truncated."""
+		attributes = ''.join(
+			_attribute_fragment(key, value) for key in include_attributes if (value := element.attributes.get(key)) is not None
+		)
+		text = _truncate(element.get_all_text_till_next_clickable_element(max_depth=2), MAX_TEXT_LENGTH)
+		return f'[{index}]<{element.tag_name}{attributes}>{text}</{element.tag_name}>'
+
+	@staticmethod
+	def serialize_selector_map(selector_map: 'SelectorMap', include_attributes: tuple[str, ...] = COMPACT_ATTRIBUTES) -> str:
+		if include_attributes == COMPACT_ATTRIBUTES:
+			return '\n'.join(element.compact_text for element in selector_map.values())
+		return '\n'.join(
+			ElementTreeSerializer.compact_element(index, element, include_attributes) for index, element in selector_map.items()
+		)
+
 	@staticmethod
 	def dom_element_node_to_json(element_tree: DOMElementNode) -> dict:
 		def node_to_dict(node: DOMBaseNode) -> dict:
@@ -186,3 +262,58 @@ SelectorMap = dict[int, DOMElementNode]
 class DOMState:
 	element_tree: DOMElementNode
 	selector_map: SelectorMap
+
+	@cached_property
+	def selector_map_text(self) -> str:
+		"""Compact text of the interactive elements for the prompt, serialized once per snapshot."""
+		return ElementTreeSerializer.serialize_selector_map(self.selector_map)
+
+	@cached_property
+	def frames(self) -> dict[str, 'Frame']:
+		"""Playwright frames by frame_id, filled by BrowserContext.get_element_frame as they are resolved."""
+		return {}
+
+	@cached_property
+	def _rankings(self) -> dict[tuple[str, int], list[int]]:
+		return {}
+
+	@cached_property
+	def listed(self) -> set[int]:
+		"""Indices of the elements already shown to the agent for this snapshot."""
+		return set()
+
+	def ranked_selector_map_text(
+		self,
+		query: str,
+		token_budget: int,
+		viewport_height: int,
+		offset: int = 0,
+		keywords: Optional[str] = None,
+	) -> str:
+		"""
+		The elements most relevant to `query` that fit into `token_budget` tokens, with a continuation marker
+		when some are left out (see openoperator.browser.dom.ranking). Rankings are computed once per snapshot.
+
+		With `keywords`, the elements not listed yet are ranked by them instead, starting with the best match;
+		`offset` counts positions in the task query's ranking and does not apply to them.
+		"""
+		from openoperator.browser.dom.ranking import rank_elements, select_within_budget
+
+		if keywords is None and token_budget <= 0:
+			self.listed.update(self.selector_map)
+			return self.selector_map_text
+
+		key = (keywords or query, viewport_height)
+		if key not in self._rankings:
+			self._rankings[key] = rank_elements(self.selector_map, key[0], viewport_height)
+		if keywords is None:
+			selection = select_within_budget(self.selector_map, self._rankings[key], token_budget, offset)
+		else:
+			ranking = [index for index in self._rankings[key] if index not in self.listed]
+			selection = select_within_budget(self.selector_map, ranking, token_budget, keywords=keywords)
+		self.listed.update(selection.shown)
+		return selection.text
+
+	@property
+	def hash_index(self) -> Dict[HashedDomElement, DOMElementNode]:
+		return self.element_tree.hash_index
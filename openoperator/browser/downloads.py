@@ -3,10 +3,6 @@ from langchain_core.messages import HumanMessage, SystemMessage
 import os
 import tarfile
 from typing import List
-from PIL import Image
-import io
-import base64
-import fitz
 
 class DownloadsRegistry:
     def __init__(self):
@@ -87,6 +83,13 @@ class DownloadedItem:
             tar.extractall(path=extract_path)
 
     def _pdf_to_message(self) -> HumanMessage | SystemMessage:
+        # PyMuPDF and Pillow are slow to import and only needed once a PDF shows up
+        import base64
+        import io
+
+        import fitz
+        from PIL import Image
+
         try:
             pdf_document = fitz.open(self.fullpath) # type: ignore
 
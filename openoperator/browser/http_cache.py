@@ -0,0 +1,274 @@
+"""
+Shared, disk-backed HTTP cache for static resources.
+
+Every BrowserContext starts with an empty browser cache (and request routing disables the browser cache
+altogether), so each run downloads the same stylesheets, scripts, fonts and images again. SharedHttpCache
+is installed as a context route and serves those resource types from a directory shared by all contexts of
+the process, following the response's cache headers: fresh entries are served locally, stale entries with
+validators are revalidated with a conditional request, and uncacheable responses are passed through.
+"""
+
+import asyncio
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from openoperator.telemetry.service import metrics
+
+if TYPE_CHECKING:
+	from playwright.async_api import APIResponse, Route
+
+logger = logging.getLogger(__name__)
+
+HTTP_CACHE_DIR_ENV = 'OPENOPERATOR_HTTP_CACHE_DIR'
+HTTP_CACHE_MAX_MB_ENV = 'OPENOPERATOR_HTTP_CACHE_MAX_MB'
+
+CACHED_RESOURCE_TYPES = frozenset({'stylesheet', 'script', 'font', 'image'})
+# The stored body is already decoded, and its length is known when it is served
+DROPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'})
+
+
+def _count(result: str) -> None:
+	metrics.increment(
+		'openoperator_http_cache_requests_total',
+		labels={'result': result},
+		description='Static resource requests by cache result',
+	)
+
+
+@dataclass(frozen=True)
+class HttpCacheConfig:
+	"""
+	Shared HTTP cache settings.
+
+	Default values:
+		directory: '.cache/http'
+			Directory holding the cached responses
+
+		max_bytes: 512 MiB
+			Size of the cached bodies above which the least recently used entries are evicted
+	"""
+
+	directory: str = os.path.join('.cache', 'http')
+	max_bytes: int = 512 * 1024 * 1024
+
+
+def _parse_cache_control(value: str) -> dict[str, str]:
+	directives = {}
+	for directive in value.split(','):
+		name, _, argument = directive.strip().partition('=')
+		if name:
+			directives[name.lower()] = argument.strip('"')
+	return directives
+
+
+def _parse_date(value: str | None) -> float | None:
+	if not value:
+		return None
+	try:
+		return email.utils.parsedate_to_datetime(value).timestamp()
+	except (TypeError, ValueError):
+		return None
+
+
+def freshness_lifetime(headers: dict[str, str], now: float) -> float | None:
+	"""Seconds a response may be served without revalidation, or None when it must not be stored."""
+	directives = _parse_cache_control(headers.get('cache-control', ''))
+	if 'no-store' in directives or 'private' in directives or 'set-cookie' in headers:
+		return None
+	if headers.get('vary', '').strip().lower() not in ('', 'accept-encoding'):
+		return None
+	if 'no-cache' in directives:
+		return 0.0
+	for name in ('s-maxage', 'max-age'):
+		if directives.get(name, '').isdigit():
+			return float(directives[name])
+	date = _parse_date(headers.get('date')) or now
+	expires = _parse_date(headers.get('expires'))
+	if expires is not None:
+		return max(0.0, expires - date)
+	# Heuristic freshness (RFC 9111, 4.2.2): a tenth of the time since the last modification
+	last_modified = _parse_date(headers.get('last-modified'))
+	if last_modified is not None:
+		return max(0.0, (date - last_modified) / 10)
+	return 0.0 if 'etag' in headers else None
+
+
+@dataclass
+class CacheEntry:
+	url: str
+	status: int
+	headers: dict[str, str]
+	stored: float
+	lifetime: float
+	size: int
+
+	@property
+	def fresh(self) -> bool:
+		return time.time() - self.stored < self.lifetime
+
+	@property
+	def validators(self) -> dict[str, str]:
+		conditional = {}
+		if 'etag' in self.headers:
+			conditional['If-None-Match'] = self.headers['etag']
+		if 'last-modified' in self.headers:
+			conditional['If-Modified-Since'] = self.headers['last-modified']
+		return conditional
+
+
+class SharedHttpCache:
+	"""HTTP cache for static resources, safe to share between contexts, event loops and threads."""
+
+	def __init__(self, config: HttpCacheConfig = HttpCacheConfig()):
+		self.config = config
+		os.makedirs(config.directory, exist_ok=True)
+		self._lock = threading.Lock()
+		# key -> (body size, last access) of every stored entry, for eviction
+		self._index: dict[str, tuple[int, float]] = {}
+		for name in os.listdir(config.directory):
+			if name.endswith('.body'):
+				stat = os.stat(os.path.join(config.directory, name))
+				self._index[name[: -len('.body')]] = (stat.st_size, stat.st_mtime)
+
+	async def attach(self, context) -> None:
+		"""Route the static resources of a Playwright browser context through the cache."""
+		await context.route('**/*', self.handle_route)
+
+	async def handle_route(self, route: 'Route') -> None:
+		request = route.request
+		if request.method != 'GET' or request.resource_type not in CACHED_RESOURCE_TYPES or 'authorization' in request.headers:
+			await route.fallback()
+			return
+
+		key = hashlib.sha256(request.url.encode()).hexdigest()
+		entry = await asyncio.to_thread(self._load_entry, key)
+		if entry is not None and entry.fresh:
+			_count('hit')
+			await self._fulfill_from_cache(route, key, entry)
+			return
+
+		headers = {**request.headers, **entry.validators} if entry is not None else None
+		try:
+			response = await route.fetch(headers=headers)
+		except Exception as e:
+			logger.debug(f'Fetching {request.url} failed: {e}')
+			await route.abort()
+			return
+
+		if entry is not None and response.status == 304:
+			_count('revalidated')
+			updated = {name: value for name, value in response.headers.items() if name not in DROPPED_HEADERS}
+			refreshed = {**entry.headers, **updated}
+			lifetime = freshness_lifetime(refreshed, time.time())
+			if lifetime is not None:
+				entry.headers, entry.stored, entry.lifetime = refreshed, time.time(), lifetime
+				await asyncio.to_thread(self._write_metadata, key, entry)
+			await self._fulfill_from_cache(route, key, entry)
+			return
+
+		_count('miss')
+		await self._store(key, request.url, response)
+		await route.fulfill(response=response)
+
+	async def _fulfill_from_cache(self, route: 'Route', key: str, entry: CacheEntry) -> None:
+		body = await asyncio.to_thread(self._read_body, key)
+		if body is None:
+			await route.fallback()
+			return
+		await route.fulfill(status=entry.status, headers=entry.headers, body=body)
+
+	async def _store(self, key: str, url: str, response: 'APIResponse') -> None:
+		if response.status != 200:
+			return
+		headers = {name.lower(): value for name, value in response.headers.items()}
+		lifetime = freshness_lifetime(headers, time.time())
+		if lifetime is None:
+			return
+		body = await response.body()
+		if len(body) > self.config.max_bytes // 10:
+			return
+		headers = {name: value for name, value in headers.items() if name not in DROPPED_HEADERS}
+		entry = CacheEntry(
+			url=url, status=response.status, headers=headers, stored=time.time(), lifetime=lifetime, size=len(body)
+		)
+		await asyncio.to_thread(self._write_entry, key, entry, body)
+
+	def _path(self, key: str, suffix: str) -> str:
+		return os.path.join(self.config.directory, f'{key}.{suffix}')
+
+	def _load_entry(self, key: str) -> CacheEntry | None:
+		try:
+			with open(self._path(key, 'json')) as f:
+				return CacheEntry(**json.load(f))
+		except (OSError, ValueError, TypeError):
+			return None
+
+	def _read_body(self, key: str) -> bytes | None:
+		try:
+			with open(self._path(key, 'body'), 'rb') as f:
+				body = f.read()
+		except OSError:
+			return None
+		with self._lock:
+			self._index[key] = (len(body), time.time())
+		return body
+
+	def _replace(self, path: str, data: bytes) -> None:
+		# Readers in other contexts only ever see complete files
+		temporary = f'{path}.{threading.get_ident()}.tmp'
+		with open(temporary, 'wb') as f:
+			f.write(data)
+		os.replace(temporary, path)
+
+	def _write_metadata(self, key: str, entry: CacheEntry) -> None:
+		self._replace(self._path(key, 'json'), json.dumps(asdict(entry)).encode())
+
+	def _write_entry(self, key: str, entry: CacheEntry, body: bytes) -> None:
+		try:
+			self._replace(self._path(key, 'body'), body)
+			self._write_metadata(key, entry)
+		except OSError as e:
+			logger.debug(f'Failed to cache {entry.url}: {e}')
+			return
+		with self._lock:
+			self._index[key] = (entry.size, time.time())
+			self._evict()
+
+	def _evict(self) -> None:
+		total = sum(size for size, _ in self._index.values())
+		if total <= self.config.max_bytes:
+			return
+		for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+			for suffix in ('json', 'body'):
+				try:
+					os.remove(self._path(key, suffix))
+				except OSError:
+					pass
+			del self._index[key]
+			total -= size
+			if total <= self.config.max_bytes:
+				break
+
+
+@lru_cache(maxsize=None)
+def shared_http_cache(config: HttpCacheConfig) -> SharedHttpCache:
+	"""The process-wide cache for a configuration, so all browsers of a worker share one index."""
+	return SharedHttpCache(config)
+
+
+def http_cache_from_env() -> HttpCacheConfig | None:
+	"""Cache settings from OPENOPERATOR_HTTP_CACHE_DIR and OPENOPERATOR_HTTP_CACHE_MAX_MB, or None when unset."""
+	directory = os.getenv(HTTP_CACHE_DIR_ENV, '').strip()
+	if not directory:
+		return None
+	max_mb = os.getenv(HTTP_CACHE_MAX_MB_ENV, '').strip()
+	max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else HttpCacheConfig.max_bytes
+	return HttpCacheConfig(directory=directory, max_bytes=max_bytes)
@@ -0,0 +1,148 @@
+"""
+Per-domain politeness scheduling for navigations.
+
+A DomainScheduler is shared by all contexts of a Browser. For every domain it bounds the number of
+navigations in flight and their rate (token bucket). When a domain is saturated, waiting
+navigations are served round-robin across jobs, so one run cannot starve the others on the same site.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
+from openoperator.telemetry.service import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SchedulerConfig:
+	"""
+	Limits applied per domain.
+
+	Default values:
+		max_pages_per_domain: 2
+			Navigations to the same domain that may be in flight at once
+
+		requests_per_second: 1.0
+			Sustained navigation rate per domain. 0 disables rate limiting
+
+		burst: 2
+			Navigations that may start back to back before the rate applies
+	"""
+
+	max_pages_per_domain: int = 2
+	requests_per_second: float = 1.0
+	burst: int = 2
+
+
+class TokenBucket:
+	def __init__(self, rate: float, capacity: int):
+		self.rate = rate
+		self.capacity = capacity
+		self.tokens = float(capacity)
+		self.updated = time.monotonic()
+
+	def reserve(self) -> float:
+		"""Take a token, returning how long to wait until it is actually available."""
+		if self.rate <= 0:
+			return 0.0
+		now = time.monotonic()
+		self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+		self.updated = now
+		self.tokens -= 1
+		return max(0.0, -self.tokens / self.rate)
+
+
+@dataclass
+class DomainState:
+	bucket: TokenBucket
+	in_flight: int = 0
+	# job id -> futures of that job waiting for a slot, in arrival order; jobs are served round-robin
+	waiters: 'OrderedDict[str, deque[asyncio.Future]]' = field(default_factory=OrderedDict)
+
+
+def domain_of(url: str) -> str | None:
+	parts = urlsplit(url)
+	if parts.scheme not in ('http', 'https'):
+		return None
+	return (parts.hostname or '').lower() or None
+
+
+class DomainScheduler:
+	"""Hands out navigation slots per domain. Must be used from a single event loop."""
+
+	def __init__(self, config: SchedulerConfig = SchedulerConfig()):
+		self.config = config
+		self._domains: dict[str, DomainState] = {}
+
+	def _state(self, domain: str) -> DomainState:
+		state = self._domains.get(domain)
+		if state is None:
+			bucket = TokenBucket(self.config.requests_per_second, max(1, self.config.burst))
+			state = self._domains[domain] = DomainState(bucket=bucket)
+		return state
+
+	@asynccontextmanager
+	async def slot(self, url: str, job_id: str = 'default') -> AsyncIterator[None]:
+		"""Hold a navigation slot for the domain of `url` for the duration of the block."""
+		domain = domain_of(url)
+		if domain is None:
+			yield
+			return
+
+		with span('scheduler_wait', 'browser'):
+			await self._acquire(domain, job_id)
+			try:
+				delay = self._state(domain).bucket.reserve()
+				if delay > 0:
+					logger.debug(f'Rate limiting navigation to {domain} for {delay:.2f}s')
+					await asyncio.sleep(delay)
+			except BaseException:
+				self._release(domain)
+				raise
+		try:
+			yield
+		finally:
+			self._release(domain)
+
+	async def _acquire(self, domain: str, job_id: str) -> None:
+		state = self._state(domain)
+		if state.in_flight < self.config.max_pages_per_domain and not state.waiters:
+			state.in_flight += 1
+			return
+
+		future = asyncio.get_running_loop().create_future()
+		state.waiters.setdefault(job_id, deque()).append(future)
+		try:
+			# The releasing navigation hands its slot over, so in_flight is already accounted for
+			await future
+		except asyncio.CancelledError:
+			if future.done() and not future.cancelled():
+				self._release(domain)
+			else:
+				queue = state.waiters.get(job_id)
+				if queue is not None and future in queue:
+					queue.remove(future)
+					if not queue:
+						del state.waiters[job_id]
+			raise
+
+	def _release(self, domain: str) -> None:
+		state = self._domains[domain]
+		while state.waiters:
+			job_id, queue = next(iter(state.waiters.items()))
+			future = queue.popleft()
+			# Round-robin: the job goes to the back of the line if it still has waiting navigations
+			del state.waiters[job_id]
+			if queue:
+				state.waiters[job_id] = queue
+			if not future.done():
+				future.set_result(None)
+				return
+		state.in_flight -= 1
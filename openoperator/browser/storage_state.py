@@ -0,0 +1,149 @@
+"""
+Persistence of browser storage state (cookies and local storage) across contexts and runs.
+
+A StorageStatePersister belongs to one BrowserContext: the state is loaded once when the context is
+created, and saves are debounced while the agent works, skipped when nothing changed, and written
+atomically off the event loop. A StorageStateStore keys state files by identity, so a pool of contexts
+can each reuse the session of a different logged-in account.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import uuid
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+	from playwright.async_api import BrowserContext as PlaywrightBrowserContext
+
+logger = logging.getLogger(__name__)
+
+StorageState = dict[str, Any]
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+	dirname = os.path.dirname(path)
+	if dirname:
+		os.makedirs(dirname, exist_ok=True)
+	# Readers, and contexts saving the same identity concurrently, only ever see complete files
+	temporary = f'{path}.{uuid.uuid4().hex}.tmp'
+	try:
+		with open(temporary, 'wb') as f:
+			f.write(data)
+		os.replace(temporary, path)
+	finally:
+		if os.path.exists(temporary):
+			os.remove(temporary)
+
+
+class StorageStateStore:
+	"""Directory of storage state files, one per identity."""
+
+	def __init__(self, directory: str):
+		self.directory = directory
+
+	def path(self, identity: str) -> str:
+		# Identities are often e-mail addresses; keep file names portable
+		name = re.sub(r'[^A-Za-z0-9._@-]', '_', identity)
+		return os.path.join(self.directory, f'{name}.json')
+
+	def identities(self) -> list[str]:
+		if not os.path.isdir(self.directory):
+			return []
+		return sorted(name[: -len('.json')] for name in os.listdir(self.directory) if name.endswith('.json'))
+
+	def load(self, identity: str) -> StorageState | None:
+		return _read_state(self.path(identity), cookies_only=False)
+
+	def delete(self, identity: str) -> None:
+		try:
+			os.remove(self.path(identity))
+		except FileNotFoundError:
+			pass
+
+
+def _read_state(path: str, cookies_only: bool) -> StorageState | None:
+	try:
+		with open(path) as f:
+			data = json.load(f)
+	except FileNotFoundError:
+		return None
+	except (OSError, ValueError) as e:
+		logger.warning(f'Ignoring unreadable storage state {path}: {e}')
+		return None
+	# Cookie files hold a plain list of cookies
+	if cookies_only or isinstance(data, list):
+		return {'cookies': data if isinstance(data, list) else data.get('cookies', []), 'origins': []}
+	return data
+
+
+class StorageStatePersister:
+	"""
+	Loads and saves the storage state of one browser context.
+
+	With `cookies_only` the file holds a plain list of cookies (the `cookies_file` format), otherwise a
+	Playwright storage state with cookies and local storage per origin.
+	"""
+
+	def __init__(self, path: str, cookies_only: bool = False, save_delay: float = 2.0):
+		self.path = path
+		self.cookies_only = cookies_only
+		self.save_delay = save_delay
+		self._fingerprint: str | None = None
+		self._pending: asyncio.Task | None = None
+
+	async def load(self) -> StorageState | None:
+		"""The saved state, to pass as `storage_state` when creating the context."""
+		state = await asyncio.to_thread(_read_state, self.path, self.cookies_only)
+		if state is not None:
+			logger.info(f'Loaded {len(state.get("cookies", []))} cookies from {self.path}')
+			self._fingerprint = self._hash(self._serialize(state))
+		return state
+
+	def schedule_save(self, context: 'PlaywrightBrowserContext') -> None:
+		"""Save within `save_delay` seconds; requests made while a save is pending are folded into it."""
+		if self._pending is None or self._pending.done():
+			self._pending = asyncio.create_task(self._save_later(context))
+
+	async def _save_later(self, context: 'PlaywrightBrowserContext') -> None:
+		await asyncio.sleep(self.save_delay)
+		await self.save(context)
+
+	async def flush(self, context: 'PlaywrightBrowserContext') -> None:
+		"""Cancel a pending save and save right away, e.g. before the context closes."""
+		if self._pending is not None and not self._pending.done():
+			self._pending.cancel()
+			try:
+				await self._pending
+			except asyncio.CancelledError:
+				pass
+		self._pending = None
+		await self.save(context)
+
+	async def save(self, context: 'PlaywrightBrowserContext') -> None:
+		try:
+			if self.cookies_only:
+				state: Any = await context.cookies()
+			else:
+				state = await context.storage_state()
+			data = await asyncio.to_thread(self._serialize, state)
+			fingerprint = self._hash(data)
+			if fingerprint == self._fingerprint:
+				return
+			await asyncio.to_thread(_write_atomic, self.path, data)
+			self._fingerprint = fingerprint
+			logger.debug(f'Saved storage state to {self.path}')
+		except Exception as e:
+			logger.warning(f'Failed to save storage state to {self.path}: {e}')
+
+	def _serialize(self, state: Any) -> bytes:
+		if self.cookies_only and isinstance(state, dict):
+			state = state.get('cookies', [])
+		return json.dumps(state, sort_keys=True).encode()
+
+	@staticmethod
+	def _hash(data: bytes) -> str:
+		return hashlib.sha256(data).hexdigest()
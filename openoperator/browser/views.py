@@ -16,6 +16,16 @@ class TabInfo(BaseModel):
 	title: str
 
 
+@dataclass
+class PageProbe:
+	"""Page metadata collected in a single round trip before each state capture"""
+
+	url: str
+	title: str
+	pixels_above: int
+	pixels_below: int
+
+
 @dataclass
 class BrowserState(DOMState):
 	url: str
@@ -9,12 +9,10 @@ import logging
 
 from dotenv import load_dotenv
 
-from openoperator.agent.graph import graph
-
 load_dotenv()
 
 logger = logging.getLogger(__name__)
-app = graph.compile()
+app = None
 config = {"configurable": {"temperature": 0.5}, "recursion_limit": 25}
 
 
@@ -25,7 +23,16 @@ if missing_vars:
     logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
     sys.exit(1)
 
+def get_app():
+    """Compile the agent graph on first use; importing the graph is the slow part of startup."""
+    global app
+    if app is None:
+        from openoperator.agent.graph import graph
+        app = graph.compile()
+    return app
+
 async def main(url: str, query: str):
+    app = get_app()
     try:
         result = await app.ainvoke({"url": url, "query": query}, config=config) # type: ignore
     except Exception as e:
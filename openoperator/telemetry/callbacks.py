@@ -0,0 +1,112 @@
+import threading
+import time
+from typing import Any, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from openoperator.telemetry.service import RunTimings, capture, current_run, record_span
+from openoperator.telemetry.views import BrowserActionEvent
+
+
+class TimingCallbackHandler(BaseCallbackHandler):
+	"""
+	Records a span for every graph node, tool call and LLM call of a run.
+
+	Browser tools additionally emit a BrowserActionEvent. Pass an explicit RunTimings to collect
+	into, otherwise the run active when the handler is created is used.
+	"""
+
+	run_inline: bool = True
+
+	def __init__(self, run: Optional[RunTimings] = None):
+		self.run = run or current_run()
+		self._lock = threading.Lock()
+		self._open: dict[UUID, tuple[str, str, float, dict[str, Any]]] = {}
+
+	def _start(self, run_id: UUID, name: str, kind: str, extra: Optional[dict[str, Any]] = None) -> None:
+		with self._lock:
+			self._open[run_id] = (name, kind, time.perf_counter(), extra or {})
+
+	def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+		with self._lock:
+			opened = self._open.pop(run_id, None)
+		if opened is None:
+			return
+		name, kind, start, extra = opened
+		record_span(name, kind, start, time.perf_counter() - start, run=self.run)
+		if kind == 'tool' and extra.get('browser_action'):
+			capture(
+				BrowserActionEvent(
+					action_name=name,
+					action_params=extra.get('params', {}),
+					success=error is None,
+					error=str(error) if error is not None else None,
+				),
+				run=self.run,
+			)
+
+	# graph nodes
+	def on_chain_start(
+		self,
+		serialized: Optional[dict[str, Any]],
+		inputs: Any,
+		*,
+		run_id: UUID,
+		metadata: Optional[dict[str, Any]] = None,
+		**kwargs: Any,
+	) -> None:
+		node = (metadata or {}).get('langgraph_node')
+		# Only the node runnable itself carries the node's name; nested chains inherit the metadata
+		if node is not None and kwargs.get('name') == node:
+			self._start(run_id, node, 'node')
+
+	def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+		self._end(run_id)
+
+	def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+		self._end(run_id, error)
+
+	# tools
+	def on_tool_start(
+		self,
+		serialized: Optional[dict[str, Any]],
+		input_str: str,
+		*,
+		run_id: UUID,
+		tags: Optional[list[str]] = None,
+		inputs: Optional[dict[str, Any]] = None,
+		**kwargs: Any,
+	) -> None:
+		name = (serialized or {}).get('name') or kwargs.get('name') or 'tool'
+		params = {
+			key: value
+			for key, value in (inputs or {}).items()
+			if key != 'state' and isinstance(value, (str, int, float, bool, type(None)))
+		}
+		self._start(run_id, name, 'tool', {'browser_action': 'browser_context' in (tags or []), 'params': params})
+
+	def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+		self._end(run_id)
+
+	def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+		self._end(run_id, error)
+
+	# LLM calls
+	def on_chat_model_start(self, serialized: Optional[dict[str, Any]], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+		self._start(run_id, self._llm_name(serialized, kwargs), 'llm')
+
+	def on_llm_start(self, serialized: Optional[dict[str, Any]], prompts: list[str], *, run_id: UUID, **kwargs: Any) -> None:
+		self._start(run_id, self._llm_name(serialized, kwargs), 'llm')
+
+	def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+		self._end(run_id)
+
+	def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+		self._end(run_id, error)
+
+	@staticmethod
+	def _llm_name(serialized: Optional[dict[str, Any]], kwargs: dict[str, Any]) -> str:
+		serialized = serialized or {}
+		identifier = serialized.get('id') or []
+		return kwargs.get('name') or serialized.get('name') or (identifier[-1] if identifier else 'llm')
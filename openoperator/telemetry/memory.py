@@ -0,0 +1,55 @@
+"""
+Opt-in memory profiling.
+
+tracemalloc hooks every allocation, so it only runs when OPENOPERATOR_MEMORY_PROFILING is set.
+The value is either a truthy flag or the number of stack frames to keep per allocation.
+"""
+
+import logging
+import os
+import tracemalloc
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+MEMORY_PROFILING_ENV = 'OPENOPERATOR_MEMORY_PROFILING'
+
+
+def start_memory_profiling_from_env() -> bool:
+	"""Start tracemalloc if the environment asks for it. Returns whether profiling is active."""
+	value = os.getenv(MEMORY_PROFILING_ENV, '').strip().lower()
+	if value in ('', '0', 'false', 'no', 'off'):
+		return tracemalloc.is_tracing()
+
+	frames = int(value) if value.isdigit() else 1
+	if not tracemalloc.is_tracing():
+		tracemalloc.start(frames)
+		logger.info(f'Memory profiling enabled ({frames} frame(s) per allocation)')
+	return True
+
+
+def memory_snapshot(limit: int = 20, group_by: str = 'lineno') -> dict[str, Any]:
+	"""Return the top allocation sites of the current process."""
+	if not tracemalloc.is_tracing():
+		raise RuntimeError(f'Memory profiling is disabled, set {MEMORY_PROFILING_ENV}=1 to enable it')
+
+	snapshot = tracemalloc.take_snapshot().filter_traces(
+		(
+			tracemalloc.Filter(False, tracemalloc.__file__),
+			tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+			tracemalloc.Filter(False, '<unknown>'),
+		)
+	)
+	current, peak = tracemalloc.get_traced_memory()
+	return {
+		'current_bytes': current,
+		'peak_bytes': peak,
+		'top': [
+			{
+				'location': str(stat.traceback[0]) if len(stat.traceback) == 1 else stat.traceback.format(),
+				'size_bytes': stat.size,
+				'count': stat.count,
+			}
+			for stat in snapshot.statistics(group_by)[:limit]
+		],
+	}
@@ -0,0 +1,233 @@
+"""
+Timing and resource instrumentation.
+
+Spans and values are recorded into process-wide histograms (exportable in the Prometheus text
+format) and into the timing report of the run that is currently active, if any.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+from openoperator.telemetry.views import BaseTelemetryEvent
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000)
+
+
+def _escape_label(value: str) -> str:
+	return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+@dataclass
+class Histogram:
+	buckets: tuple[float, ...]
+	counts: list[int] = field(default_factory=list)
+	sum: float = 0.0
+	count: int = 0
+
+	def __post_init__(self):
+		# One extra slot for the implicit +Inf bucket
+		self.counts = [0] * (len(self.buckets) + 1)
+
+	def observe(self, value: float) -> None:
+		self.counts[bisect_left(self.buckets, value)] += 1
+		self.sum += value
+		self.count += 1
+
+
+class MetricsRegistry:
+	"""Thread-safe store of histograms and counters, keyed by metric name and labels."""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._histograms: dict[tuple[str, tuple[tuple[str, str], ...]], Histogram] = {}
+		self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+		self._help: dict[str, str] = {}
+
+	def observe(
+		self,
+		name: str,
+		value: float,
+		labels: Optional[dict[str, str]] = None,
+		buckets: tuple[float, ...] = DURATION_BUCKETS,
+		description: str = '',
+	) -> None:
+		key = (name, tuple(sorted((labels or {}).items())))
+		with self._lock:
+			histogram = self._histograms.get(key)
+			if histogram is None:
+				histogram = self._histograms[key] = Histogram(buckets)
+				self._help.setdefault(name, description)
+			histogram.observe(value)
+
+	def increment(self, name: str, labels: Optional[dict[str, str]] = None, amount: float = 1, description: str = '') -> None:
+		key = (name, tuple(sorted((labels or {}).items())))
+		with self._lock:
+			self._counters[key] = self._counters.get(key, 0) + amount
+			self._help.setdefault(name, description)
+
+	def reset(self) -> None:
+		with self._lock:
+			self._histograms.clear()
+			self._counters.clear()
+
+	def render_prometheus(self) -> str:
+		"""Render all metrics in the Prometheus text exposition format."""
+
+		def format_labels(labels: tuple[tuple[str, str], ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+			pairs = labels + extra
+			if not pairs:
+				return ''
+			return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in pairs) + '}'
+
+		lines: list[str] = []
+		with self._lock:
+			described: set[str] = set()
+			for (name, labels), histogram in sorted(self._histograms.items()):
+				if name not in described:
+					described.add(name)
+					lines.append(f'# HELP {name} {self._help.get(name, "")}')
+					lines.append(f'# TYPE {name} histogram')
+				cumulative = 0
+				for bound, count in zip(histogram.buckets, histogram.counts):
+					cumulative += count
+					lines.append(f'{name}_bucket{format_labels(labels, (("le", repr(float(bound))),))} {cumulative}')
+				lines.append(f'{name}_bucket{format_labels(labels, (("le", "+Inf"),))} {histogram.count}')
+				lines.append(f'{name}_sum{format_labels(labels)} {histogram.sum}')
+				lines.append(f'{name}_count{format_labels(labels)} {histogram.count}')
+			for (name, labels), value in sorted(self._counters.items()):
+				if name not in described:
+					described.add(name)
+					lines.append(f'# HELP {name} {self._help.get(name, "")}')
+					lines.append(f'# TYPE {name} counter')
+				lines.append(f'{name}{format_labels(labels)} {value}')
+		return '\n'.join(lines) + '\n'
+
+
+@dataclass
+class SpanRecord:
+	name: str
+	kind: str
+	start: float
+	seconds: float
+
+
+class RunTimings:
+	"""Collects the spans, values and events of a single agent run."""
+
+	def __init__(self):
+		self.started_at = time.perf_counter()
+		self.spans: list[SpanRecord] = []
+		self.values: dict[str, list[float]] = {}
+		self.events: list[BaseTelemetryEvent] = []
+		self._lock = threading.Lock()
+
+	def add_span(self, name: str, kind: str, start: float, seconds: float) -> None:
+		with self._lock:
+			self.spans.append(SpanRecord(name, kind, start - self.started_at, seconds))
+
+	def add_value(self, name: str, value: float) -> None:
+		with self._lock:
+			self.values.setdefault(name, []).append(value)
+
+	def add_event(self, event: BaseTelemetryEvent) -> None:
+		with self._lock:
+			self.events.append(event)
+
+	def report(self) -> dict[str, Any]:
+		"""Per-run timing report: aggregates per span plus the ordered list of spans."""
+		with self._lock:
+			summary: dict[str, dict[str, float]] = {}
+			for span in self.spans:
+				entry = summary.setdefault(f'{span.kind}:{span.name}', {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+				entry['count'] += 1
+				entry['total_seconds'] = round(entry['total_seconds'] + span.seconds, 6)
+				entry['max_seconds'] = round(max(entry['max_seconds'], span.seconds), 6)
+			return {
+				'total_seconds': round(time.perf_counter() - self.started_at, 6),
+				'summary': summary,
+				'spans': [
+					{'name': span.name, 'kind': span.kind, 'start': round(span.start, 6), 'seconds': round(span.seconds, 6)}
+					for span in self.spans
+				],
+				'values': {
+					name: {'count': len(values), 'total': sum(values), 'max': max(values)} for name, values in self.values.items()
+				},
+				'events': [{'name': event.name, **event.properties} for event in self.events],
+			}
+
+
+metrics = MetricsRegistry()
+
+_current_run: ContextVar[Optional[RunTimings]] = ContextVar('openoperator_current_run', default=None)
+
+
+def current_run() -> Optional[RunTimings]:
+	return _current_run.get()
+
+
+@contextmanager
+def start_run() -> Iterator[RunTimings]:
+	"""
+	Make a fresh RunTimings the active run for the current context.
+
+	Tasks and executor threads started inside the block inherit it through contextvars.
+	"""
+	run = RunTimings()
+	token = _current_run.set(run)
+	try:
+		yield run
+	finally:
+		_current_run.reset(token)
+
+
+def record_span(name: str, kind: str, start: float, seconds: float, run: Optional[RunTimings] = None) -> None:
+	metrics.observe(
+		'openoperator_span_duration_seconds',
+		seconds,
+		labels={'name': name, 'kind': kind},
+		description='Duration of instrumented operations',
+	)
+	run = run or current_run()
+	if run is not None:
+		run.add_span(name, kind, start, seconds)
+
+
+@contextmanager
+def span(name: str, kind: str = 'function') -> Iterator[None]:
+	"""Time the enclosed block. Works around `await` expressions as well."""
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		record_span(name, kind, start, time.perf_counter() - start)
+
+
+def record_value(name: str, value: float, buckets: tuple[float, ...] = SIZE_BUCKETS) -> None:
+	"""Record a non-duration sample such as a payload size in bytes."""
+	metrics.observe(f'openoperator_{name}', value, buckets=buckets, description=f'Observed {name.replace("_", " ")}')
+	run = current_run()
+	if run is not None:
+		run.add_value(name, value)
+
+
+def capture(event: BaseTelemetryEvent, run: Optional[RunTimings] = None) -> None:
+	"""Emit a telemetry event: counted in the registry and attached to the active run."""
+	success = getattr(event, 'success', None)
+	metrics.increment(
+		'openoperator_events_total',
+		labels={'event': event.name, 'success': str(success).lower()},
+		description='Emitted telemetry events',
+	)
+	run = run or current_run()
+	if run is not None:
+		run.add_event(event)
+	logger.debug(f'Telemetry event {event.name}: {event.properties}')
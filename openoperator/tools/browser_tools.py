@@ -25,8 +25,11 @@ async def format_output(context: BrowserContext,
 						) -> Tuple[List[dict], Dict[str, List[dict]]]:
 	
 	state: BrowserState = await context.get_state()
-	selector_map = [f"""Element index: {index}, Element metadata: {element}""" for index, element in state.selector_map.items()]
-	selector_map = "\n".join(selector_map)
+	selector_map = state.ranked_selector_map_text(
+		context.task_query,
+		context.config.prompt_token_budget,
+		context.config.browser_window_size['height'],
+	)
 	main_output = [
 			{
 				"type": "text", "text": f"{action_status}"
@@ -35,7 +38,10 @@ async def format_output(context: BrowserContext,
 	screenshot_output = [
 			{
 				"type": "text",
-				"text": "I attached the current browser viewport. Also, for your convinience I add the textual representation of all interactive elements too: " + selector_map
+				"text": (
+					"I attached the current browser viewport. Also, for your convinience I add the textual representation "
+					"of all interactive elements too, one per line as [element index]<tag attributes>text</tag>:\n"
+				) + selector_map
 			},
 			{
 				"type": "image_url",
@@ -87,9 +93,7 @@ class SearchGoogle(BaseTool):
 		run_manager: Optional[CallbackManagerForToolRun] = None
 	) -> Tuple[List[dict], Dict[str, List[dict]]]:
 		browser: BrowserContext = state["browser_context"]
-		page = await browser.get_current_page()
-		await page.goto(f'https://www.google.com/search?q={query}&udm=14')
-		await page.wait_for_load_state()
+		await browser.navigate_to(f'https://www.google.com/search?q={query}&udm=14')
 		content, artifacts = await format_output(browser, f'Searched for "{query}" in Google has been successfully performed.', browser_state_description, relevant_data)
 		return content, artifacts
 
@@ -120,9 +124,7 @@ class GoToUrl(BaseTool):
 		run_manager: Optional[CallbackManagerForToolRun] = None
 	) -> Tuple[List[dict], Dict[str, List[dict]]]:
 		browser: BrowserContext = state["browser_context"]
-		page = await browser.get_current_page()
-		await page.goto(url)
-		await page.wait_for_load_state()
+		await browser.navigate_to(url)
 		content, artifacts = await format_output(browser, f'🔗  Navigated to {url}', browser_state_description, relevant_data)
 		return content, artifacts
 
@@ -355,6 +357,60 @@ class ExtractContent(BaseTool):
 		content, artifacts = await format_output(browser, f'Extracted page as {output_format}\n: {content}\n', browser_state_description, relevant_data)
 		return content, artifacts
 
+class ExpandElementsInput(BrowserToolInput):
+	offset: int = Field(
+		default=0,
+		description="Number of elements to skip, as given by the note at the end of the element list. Not used with keywords"
+	)
+	keywords: Optional[str] = Field(
+		default=None,
+		description="Keywords to rank the elements not listed yet by instead of the task query"
+	)
+	state: Annotated[dict, InjectedState]
+
+class ExpandElements(BaseTool):
+	name: str = "expand_elements"
+	description: str = (
+		"This tool lists more interactive elements of the current page when the element list was cut short. "
+		"It does not change the page."
+	)
+	args_schema: Type[BaseModel] = ExpandElementsInput
+	return_direct: bool = False
+	tags: list[str] = ["browser_context"]
+	response_format: str = "content_and_artifact"
+
+	def _run(self, *args, relevant_data: str, reasoning: str, **kwargs):
+		raise NotImplementedError("Tool does not support sync")
+
+	async def _arun(
+		self,
+		state: dict,
+		relevant_data: str,
+		reasoning: str,
+		browser_state_description: str,
+		offset: int = 0,
+		keywords: Optional[str] = None,
+		run_manager: Optional[CallbackManagerForToolRun] = None
+	) -> Tuple[List[dict], None]:
+		browser: BrowserContext = state["browser_context"]
+		# The page did not change, so the elements are listed from the last captured state
+		if browser.session is None:
+			browser_state = await browser.get_state()
+		else:
+			browser_state = browser.session.cached_state
+		query = keywords or browser.task_query
+		elements = browser_state.ranked_selector_map_text(
+			browser.task_query,
+			browser.config.prompt_token_budget,
+			browser.config.browser_window_size['height'],
+			offset=max(0, offset),
+			keywords=keywords if keywords and keywords != browser.task_query else None,
+		)
+		content = [{"type": "text", "text": f"More interactive elements, ranked by \"{query}\":\n{elements}"}]
+		logger.info(f'Listed elements from offset {offset}')
+		# The screen did not change, so there is no new screenshot to show
+		return content, None
+
 class ScrollDownInput(BrowserToolInput):
 	state: Annotated[dict, InjectedState]
 	amount: Optional[int] = Field(default=None, description="Amount of pixels to scroll down. If not specified, scrolls down one page")
@@ -533,62 +589,49 @@ class GetDropdownOptions(BaseTool):
 		run_manager: Optional[CallbackManagerForToolRun] = None
 	) -> Tuple[List[dict], Dict[str, List[dict]]]:
 		browser = state["browser_context"]
-		page = await browser.get_current_page()
 		selector_map = await browser.get_selector_map()
 		dom_element = selector_map[index]
 
 		try:
-			# Frame-aware approach since we know it works
-			all_options = []
-			frame_index = 0
-
-			for frame in page.frames:
-				try:
-					options = await frame.evaluate(
-						"""
-						(xpath) => {
-							const select = document.evaluate(xpath, document, null,
-								XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-							if (!select) return null;
-
-							return {
-								options: Array.from(select.options).map(opt => ({
-									text: opt.text, //do not trim, because we are doing exact match in select_dropdown_option
-									value: opt.value,
-									index: opt.index
-								})),
-								id: select.id,
-								name: select.name
-							};
-						}
-						""",
-						dom_element.xpath,
-					)
-
-					if options:
-						logger.debug(f'Found dropdown in frame {frame_index}')
-						logger.debug(f'Dropdown ID: {options["id"]}, Name: {options["name"]}')
-
-						formatted_options = []
-						for opt in options['options']:
-							# encoding ensures AI uses the exact string in select_dropdown_option
-							encoded_text = json.dumps(opt['text'])
-							formatted_options.append(f'{opt["index"]}: text={encoded_text}')
-
-						all_options.extend(formatted_options)
-
-				except Exception as frame_e:
-					logger.debug(f'Frame {frame_index} evaluation failed: {str(frame_e)}')
-
-				frame_index += 1
-
-			if all_options:
-				msg = '\n'.join(all_options)
+			# The capture recorded the dropdown's frame, so the options are read from it in one call
+			frame = await browser.get_element_frame(dom_element)
+			options = await frame.evaluate(
+				"""
+				(xpath) => {
+					const select = document.evaluate(xpath, document, null,
+						XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+					if (!select) return null;
+
+					return {
+						options: Array.from(select.options).map(opt => ({
+							text: opt.text, //do not trim, because we are doing exact match in select_dropdown_option
+							value: opt.value,
+							index: opt.index
+						})),
+						id: select.id,
+						name: select.name
+					};
+				}
+				""",
+				dom_element.xpath,
+			)
+
+			if options:
+				logger.debug(f'Dropdown ID: {options["id"]}, Name: {options["name"]}')
+				formatted_options = []
+				for opt in options['options']:
+					# encoding ensures AI uses the exact string in select_dropdown_option
+					encoded_text = json.dumps(opt['text'])
+					formatted_options.append(f'{opt["index"]}: text={encoded_text}')
+
+				msg = '\n'.join(formatted_options)
 				msg += '\nUse the exact text string in select_dropdown_option'
 				content, artifacts = await format_output(browser, msg, browser_state_description, relevant_data)
 				return content, artifacts
 			else:
-				content, artifacts = await format_output(browser, 'No options found in any frame for dropdown', browser_state_description, relevant_data)
+				content, artifacts = await format_output(
+					browser, 'No options found for dropdown', browser_state_description, relevant_data
+				)
 				return content, artifacts
 
 		except Exception as e:
@@ -622,7 +665,6 @@ class SelectDropdownOption(BaseTool):
 		run_manager: Optional[CallbackManagerForToolRun] = None
 	) -> Tuple[List[dict], Dict[str, List[dict]]]:
 		browser = state["browser_context"]
-		page = await browser.get_current_page()
 		selector_map = await browser.get_selector_map()
 		dom_element = selector_map[index]
 
@@ -637,62 +679,55 @@ class SelectDropdownOption(BaseTool):
 		logger.debug(f'Element tag: {dom_element.tag_name}')
 
 		try:
-			frame_index = 0
-			for frame in page.frames:
-				try:
-					logger.debug(f'Trying frame {frame_index} URL: {frame.url}')
-
-					# First verify we can find the dropdown in this frame
-					find_dropdown_js = """
-						(xpath) => {
-							try {
-								const select = document.evaluate(xpath, document, null,
-									XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-								if (!select) return null;
-								if (select.tagName.toLowerCase() !== 'select') {
-									return {
-										error: `Found element but it's a ${select.tagName}, not a SELECT`,
-										found: false
-									};
-								}
-								return {
-									id: select.id,
-									name: select.name,
-									found: true,
-									tagName: select.tagName,
-									optionCount: select.options.length,
-									currentValue: select.value,
-									availableOptions: Array.from(select.options).map(o => o.text.trim())
-								};
-							} catch (e) {
-								return {error: e.toString(), found: false};
-							}
+			frame = await browser.get_element_frame(dom_element)
+			logger.debug(f'Dropdown frame URL: {frame.url}')
+
+			# First verify we can find the dropdown in its frame
+			find_dropdown_js = """
+				(xpath) => {
+					try {
+						const select = document.evaluate(xpath, document, null,
+							XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+						if (!select) return null;
+						if (select.tagName.toLowerCase() !== 'select') {
+							return {
+								error: `Found element but it's a ${select.tagName}, not a SELECT`,
+								found: false
+							};
 						}
-					"""
-
-					dropdown_info = await frame.evaluate(find_dropdown_js, dom_element.xpath)
-
-					if dropdown_info:
-						if not dropdown_info.get('found'):
-							logger.error(f'Frame {frame_index} error: {dropdown_info.get("error")}')
-							continue
-
-						logger.debug(f'Found dropdown in frame {frame_index}: {dropdown_info}')
-
-						selected_option_values = await frame.locator('//' + dom_element.xpath).nth(0).select_option(label=text, timeout=1000)
-						msg = f'Selected option {text} with value {selected_option_values}'
-						logger.info(msg + f' in frame {frame_index}')
-						t, images = await format_output(browser, msg, browser_state_description, relevant_data)
-						return t, images
-
-				except Exception as frame_e:
-					logger.error(f'Frame {frame_index} attempt failed: {str(frame_e)}')
-					logger.error(f'Frame type: {type(frame)}')
-					logger.error(f'Frame URL: {frame.url}')
-
-				frame_index += 1
-
-			content, artifacts = await format_output(browser, f"Could not select option '{text}' in any frame", browser_state_description, relevant_data)
+						return {
+							id: select.id,
+							name: select.name,
+							found: true,
+							tagName: select.tagName,
+							optionCount: select.options.length,
+							currentValue: select.value,
+							availableOptions: Array.from(select.options).map(o => o.text.trim())
+						};
+					} catch (e) {
+						return {error: e.toString(), found: false};
+					}
+				}
+			"""
+
+			dropdown_info = await frame.evaluate(find_dropdown_js, dom_element.xpath)
+
+			if dropdown_info and dropdown_info.get('found'):
+				logger.debug(f'Found dropdown: {dropdown_info}')
+
+				selected_option_values = (
+					await frame.locator('//' + dom_element.xpath).nth(0).select_option(label=text, timeout=1000)
+				)
+				msg = f'Selected option {text} with value {selected_option_values}'
+				logger.info(msg)
+				t, images = await format_output(browser, msg, browser_state_description, relevant_data)
+				return t, images
+
+			if dropdown_info:
+				logger.error(f'Dropdown error: {dropdown_info.get("error")}')
+			content, artifacts = await format_output(
+				browser, f"Could not select option '{text}': dropdown not found", browser_state_description, relevant_data
+			)
 			return content, artifacts
 
 		except Exception as e:
@@ -1,9 +1,10 @@
-import requests
 import os
 from typing import Optional, Type
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from openoperator.agent.response_cache import ResponseCache, cache_key, get_default_cache
+
 class PollinationsTextInput(BaseModel):
     prompt: str = Field(description="Text prompt for AI generation")
     model: str = Field(default="openai", description="Text model to use")
@@ -15,10 +16,13 @@ class PollinationsTextTool(BaseTool):
     Generate text responses using Pollinations AI models. Can be used for 
     reasoning, planning, or generating responses when primary LLM is unavailable.
     """
+    response_cache: Optional[ResponseCache] = Field(default_factory=get_default_cache, exclude=True)
     args_schema: Type[BaseModel] = PollinationsTextInput
     
     def _run(self, prompt: str, model: str = "openai", system_prompt: str = "You are a helpful assistant.") -> str:
         """Execute text generation using Pollinations API"""
+        import requests
+
         try:
             # Get authentication from environment
             api_key = os.getenv('POLLINATIONS_API_KEY')
@@ -44,8 +48,13 @@ class PollinationsTextTool(BaseTool):
             if api_key:
                 headers["Authorization"] = f"Bearer {api_key}"
             
+            endpoint = "https://text.pollinations.ai/openai"
+            key = cache_key(endpoint, payload) if self.response_cache is not None else None
+            if key is not None and (cached := self.response_cache.get(key)) is not None:
+                return cached["choices"][0]["message"]["content"]
+            
             response = requests.post(
-                "https://text.pollinations.ai/openai",
+                endpoint,
                 headers=headers,
                 json=payload,
                 timeout=30
@@ -53,7 +62,10 @@ class PollinationsTextTool(BaseTool):
             response.raise_for_status()
             
             result = response.json()
-            return result["choices"][0]["message"]["content"]
+            content = result["choices"][0]["message"]["content"]
+            if key is not None:
+                self.response_cache.set(key, result)
+            return content
             
         except Exception as e:
             return f"Text generation failed: {str(e)}"
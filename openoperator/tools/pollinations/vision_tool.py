@@ -1,4 +1,3 @@
-import requests
 import base64
 import json
 import os
@@ -6,6 +5,8 @@ from typing import Optional, Type
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from openoperator.agent.response_cache import ResponseCache, cache_key, get_default_cache
+
 class PollinationsVisionInput(BaseModel):
     image_path: str = Field(description="Path to the screenshot or image file")
     query: str = Field(description="Question about the image content")
@@ -17,10 +18,13 @@ class PollinationsVisionTool(BaseTool):
     Analyze screenshots and images to understand web page content, UI elements, 
     forms, buttons, text, and layout. Perfect for web automation tasks.
     """
+    response_cache: Optional[ResponseCache] = Field(default_factory=get_default_cache, exclude=True)
     args_schema: Type[BaseModel] = PollinationsVisionInput
     
     def _run(self, image_path: str, query: str, model: str = "openai") -> str:
         """Execute vision analysis using Pollinations API"""
+        import requests
+
         try:
             # Get authentication from environment
             api_key = os.getenv('POLLINATIONS_API_KEY')
@@ -63,8 +67,14 @@ class PollinationsVisionTool(BaseTool):
             if api_key:
                 headers["Authorization"] = f"Bearer {api_key}"
             
+            # The image is part of the payload as a data: URL; the cache key hashes it
+            endpoint = "https://text.pollinations.ai/openai"
+            key = cache_key(endpoint, payload) if self.response_cache is not None else None
+            if key is not None and (cached := self.response_cache.get(key)) is not None:
+                return cached["choices"][0]["message"]["content"]
+            
             response = requests.post(
-                "https://text.pollinations.ai/openai",
+                endpoint,
                 headers=headers,
                 json=payload,
                 timeout=60  # Increased timeout for vision processing
@@ -74,6 +84,8 @@ class PollinationsVisionTool(BaseTool):
             result = response.json()
             
             if "choices" in result and len(result["choices"]) > 0:
+                if key is not None:
+                    self.response_cache.set(key, result)
                 return result["choices"][0]["message"]["content"]
             else:
                 return f"Unexpected response format: {result}"
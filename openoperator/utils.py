@@ -3,6 +3,8 @@ import time
 from functools import wraps
 from typing import Any, Callable, Coroutine, ParamSpec, TypeVar
 
+from openoperator.telemetry.service import record_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,15 +13,23 @@ R = TypeVar('R')
 P = ParamSpec('P')
 
 
-def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]], Callable[P, R]]:
+def _span_name(additional_text: str, func: Callable) -> str:
+	return additional_text.strip().lstrip('-') or func.__name__
+
+
+def time_execution_sync(additional_text: str = '', kind: str = 'function') -> Callable[[Callable[P, R]], Callable[P, R]]:
 	def decorator(func: Callable[P, R]) -> Callable[P, R]:
+		name = _span_name(additional_text, func)
+
 		@wraps(func)
 		def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-			start_time = time.time()
-			result = func(*args, **kwargs)
-			execution_time = time.time() - start_time
-			logger.debug(f'{additional_text} Execution time: {execution_time:.2f} seconds')
-			return result
+			start_time = time.perf_counter()
+			try:
+				return func(*args, **kwargs)
+			finally:
+				execution_time = time.perf_counter() - start_time
+				record_span(name, kind, start_time, execution_time)
+				logger.debug(f'{additional_text} Execution time: {execution_time:.2f} seconds')
 
 		return wrapper
 
@@ -28,15 +38,20 @@ def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]],
 
 def time_execution_async(
 	additional_text: str = '',
+	kind: str = 'function',
 ) -> Callable[[Callable[P, Coroutine[Any, Any, R]]], Callable[P, Coroutine[Any, Any, R]]]:
 	def decorator(func: Callable[P, Coroutine[Any, Any, R]]) -> Callable[P, Coroutine[Any, Any, R]]:
+		name = _span_name(additional_text, func)
+
 		@wraps(func)
 		async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-			start_time = time.time()
-			result = await func(*args, **kwargs)
-			execution_time = time.time() - start_time
-			logger.debug(f'{additional_text} Execution time: {execution_time:.2f} seconds')
-			return result
+			start_time = time.perf_counter()
+			try:
+				return await func(*args, **kwargs)
+			finally:
+				execution_time = time.perf_counter() - start_time
+				record_span(name, kind, start_time, execution_time)
+				logger.debug(f'{additional_text} Execution time: {execution_time:.2f} seconds')
 
 		return wrapper
 